@@ -8,6 +8,21 @@ __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from . import config, lib
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from . import config, lib
+
+# Submodules are imported on first access: config pulls in pydantic, which
+# costs more than the rest of CLI startup combined.
+_LAZY_SUBMODULES = ("config", "lib")
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["__version__", "__author__", "__email__", "config", "lib"]
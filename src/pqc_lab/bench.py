@@ -0,0 +1,957 @@
+"""Benchmark engine for PQC Readiness Lab.
+
+Times keypair/encaps/decaps (KEM) or keypair/sign/verify (DSA) for a single
+algorithm and summarises each operation as throughput, latency percentiles
+and a latency histogram. Classical algorithms from :mod:`pqc_lab.classical`
+run through the same harness for comparison. ML-DSA can also be swept
+across message sizes to compare signing whole messages with signing a
+pre-hash of them.
+"""
+
+import csv
+import io
+import json
+import math
+import multiprocessing
+import multiprocessing.synchronize
+import os
+import platform
+import sys
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from . import classical, config, hybrid, lib, signing
+
+# Operations timed for each algorithm family, in execution order
+KEM_OPERATIONS = ("keypair", "encaps", "decaps")
+SIG_OPERATIONS = ("keypair", "sign", "verify")
+
+HISTOGRAM_BINS = 10
+
+
+class HistogramBin(BaseModel):
+    """A latency histogram bucket covering ``[lower_ns, upper_ns)``."""
+
+    lower_ns: int
+    upper_ns: int
+    count: int
+
+
+class OperationStats(BaseModel):
+    """Timing summary for one operation."""
+
+    operation: str
+    iterations: int
+    total_ns: int
+    ops_per_sec: float
+    min_ns: int
+    median_ns: float
+    p90_ns: float
+    p99_ns: float
+    max_ns: int
+    histogram: list[HistogramBin] = Field(default_factory=list)
+
+
+class BenchmarkResult(BaseModel):
+    """Result of benchmarking one algorithm."""
+
+    algorithm: str
+    iterations: int
+    warmup_iterations: int
+    timestamp: str
+    platform: str = Field(default_factory=platform.platform)
+    liboqs_version: str = "unknown"
+    sizes: dict[str, int] = Field(default_factory=dict)
+    operations: list[OperationStats] = Field(default_factory=list)
+
+
+def percentile(sorted_samples: list[int], pct: float) -> float:
+    """Linearly interpolated percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    rank = (len(sorted_samples) - 1) * pct / 100
+    low = math.floor(rank)
+    high = min(low + 1, len(sorted_samples) - 1)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (
+        rank - low
+    )
+
+
+def histogram(
+    sorted_samples: list[int], bins: int = HISTOGRAM_BINS
+) -> list[HistogramBin]:
+    """Bucket sorted samples into log-spaced bins between min and max.
+
+    Latencies have long tails, so log spacing keeps detail near the median
+    while still covering outliers.
+    """
+    if not sorted_samples:
+        return []
+    low, high = max(sorted_samples[0], 1), max(sorted_samples[-1], 1)
+    if low == high:
+        return [
+            HistogramBin(lower_ns=low, upper_ns=high + 1, count=len(sorted_samples))
+        ]
+
+    ratio = (high / low) ** (1 / bins)
+    edges = [round(low * ratio**i) for i in range(bins)] + [high + 1]
+    counts = [0] * bins
+    for sample in sorted_samples:
+        index = min(int(math.log(max(sample, 1) / low, ratio)), bins - 1)
+        counts[max(index, 0)] += 1
+    return [
+        HistogramBin(lower_ns=edges[i], upper_ns=edges[i + 1], count=counts[i])
+        for i in range(bins)
+    ]
+
+
+def summarize(operation: str, samples_ns: list[int]) -> OperationStats:
+    """Summarise raw per-call timings for one operation."""
+    ordered = sorted(samples_ns)
+    total = sum(ordered)
+    return OperationStats(
+        operation=operation,
+        iterations=len(ordered),
+        total_ns=total,
+        ops_per_sec=len(ordered) * 1e9 / total if total else 0.0,
+        min_ns=ordered[0] if ordered else 0,
+        median_ns=percentile(ordered, 50),
+        p90_ns=percentile(ordered, 90),
+        p99_ns=percentile(ordered, 99),
+        max_ns=ordered[-1] if ordered else 0,
+        histogram=histogram(ordered),
+    )
+
+
+def _kem_steps(algorithm: str) -> tuple[list[Callable[[], object]], dict[str, int]]:
+    """Build the timed KEM operations, each feeding the next."""
+    kem = hybrid.new_kem(algorithm)
+    state: dict[str, bytes] = {}
+
+    def keypair() -> None:
+        state["pk"], state["sk"] = kem.keypair()
+
+    def encaps() -> None:
+        state["ct"], state["ss"] = kem.encaps(state["pk"])
+
+    def decaps() -> None:
+        kem.decaps(state["ct"], state["sk"])
+
+    sizes = {
+        "public_key": kem.length_public_key,
+        "secret_key": kem.length_secret_key,
+        "ciphertext": kem.length_ciphertext,
+        "shared_secret": kem.length_shared_secret,
+    }
+    return [keypair, encaps, decaps], sizes
+
+
+def _sig_steps(
+    algorithm: str, message_size: int
+) -> tuple[list[Callable[[], object]], dict[str, int]]:
+    """Build the timed signature operations, each feeding the next."""
+    sig = lib.Signature(algorithm)
+    message = os.urandom(message_size)
+    state: dict[str, bytes] = {}
+
+    def keypair() -> None:
+        state["pk"], state["sk"] = sig.keypair()
+
+    def sign() -> None:
+        state["sig"] = sig.sign(message, state["sk"])
+
+    def verify() -> None:
+        if not sig.verify(message, state["sig"], state["pk"]):
+            raise lib.LibOQSError(f"{sig.name} verification failed")
+
+    sizes = {
+        "public_key": sig.length_public_key,
+        "secret_key": sig.length_secret_key,
+        "signature": sig.length_signature,
+        "message": message_size,
+    }
+    return [keypair, sign, verify], sizes
+
+
+def is_kem(algorithm: str) -> bool:
+    """Check whether an algorithm name refers to a KEM."""
+    alg = classical.get(algorithm)
+    if alg is not None:
+        return alg.kind == "KEM"
+    return "ML-KEM" in lib.resolve_algorithm(algorithm)
+
+
+def needs_liboqs(algorithm: str) -> bool:
+    """Whether benchmarking ``algorithm`` needs liboqs (it is not classical)."""
+    return classical.get(algorithm) is None
+
+
+def algorithm_name(algorithm: str) -> str:
+    """Canonical name of a PQC or classical algorithm, e.g. ``ML-KEM-768``."""
+    alg = classical.get(algorithm)
+    return alg.name if alg is not None else lib.resolve_algorithm(algorithm)
+
+
+def _build_steps(
+    algorithm: str, message_size: int
+) -> tuple[tuple[str, ...], list[Callable[[], object]], dict[str, int]]:
+    """Operation names, timed steps and object sizes for ``algorithm``."""
+    names = KEM_OPERATIONS if is_kem(algorithm) else SIG_OPERATIONS
+    alg = classical.get(algorithm)
+    if alg is not None:
+        return names, *alg.build(message_size)
+    if is_kem(algorithm):
+        return names, *_kem_steps(algorithm)
+    return names, *_sig_steps(algorithm, message_size)
+
+
+def _time_steps(
+    steps: list[Callable[[], object]], iterations: int, warmup: int
+) -> list[list[int]]:
+    """Run ``steps`` in order and collect per-call timings for each step."""
+    for _ in range(warmup):
+        for step in steps:
+            step()
+
+    samples: list[list[int]] = [[] for _ in steps]
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        for step, timings in zip(steps, samples):
+            start = clock()
+            step()
+            timings.append(clock() - start)
+    return samples
+
+
+def _resolve_counts(iterations: int | None, warmup: int | None) -> tuple[int, int]:
+    """Fill in iteration and warmup counts from the benchmark configuration."""
+    bench_config = config.get_benchmark_config()
+    if iterations is None:
+        iterations = bench_config.default_iterations
+    if warmup is None:
+        warmup = bench_config.warmup_iterations
+    return iterations, warmup
+
+
+class SampleRun(BaseModel):
+    """Raw per-call timings of one benchmark run, as stored in baselines."""
+
+    algorithm: str
+    iterations: int
+    warmup_iterations: int
+    timestamp: str
+    platform: str = Field(default_factory=platform.platform)
+    liboqs_version: str = "unknown"
+    sizes: dict[str, int] = Field(default_factory=dict)
+    samples_ns: dict[str, list[int]] = Field(default_factory=dict)
+
+    def summary(self) -> BenchmarkResult:
+        """Summarise the timings as a :class:`BenchmarkResult`."""
+        return BenchmarkResult(
+            **self.model_dump(exclude={"samples_ns"}),
+            operations=[summarize(op, t) for op, t in self.samples_ns.items()],
+        )
+
+
+def sample_benchmark(
+    algorithm: str,
+    iterations: int | None = None,
+    warmup: int | None = None,
+    message_size: int = 32,
+) -> SampleRun:
+    """Time every operation of ``algorithm``, keeping each call's duration.
+
+    Iteration and warmup counts default to the benchmark configuration.
+    """
+    iterations, warmup = _resolve_counts(iterations, warmup)
+    names, steps, sizes = _build_steps(algorithm, message_size)
+    samples = _time_steps(steps, iterations, warmup)
+
+    return SampleRun(
+        algorithm=algorithm_name(algorithm),
+        iterations=iterations,
+        warmup_iterations=warmup,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        liboqs_version=lib.get_version(),
+        sizes=sizes,
+        samples_ns=dict(zip(names, samples)),
+    )
+
+
+def run_benchmark(
+    algorithm: str,
+    iterations: int | None = None,
+    warmup: int | None = None,
+    message_size: int = 32,
+) -> BenchmarkResult:
+    """Benchmark every operation of ``algorithm``.
+
+    Iteration and warmup counts default to the benchmark configuration.
+    """
+    return sample_benchmark(algorithm, iterations, warmup, message_size).summary()
+
+
+# Multi-core scaling
+SCALING_MODES = ("processes", "threads")
+
+
+def gil_enabled() -> bool:
+    """Whether the GIL is active (it can be off on free-threaded builds)."""
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_enabled() if is_enabled is not None else True
+
+
+class ScalingPoint(BaseModel):
+    """Aggregate and per-worker results for one worker count.
+
+    A cycle is one pass over every operation (e.g. keypair, encaps and
+    decaps), i.e. roughly one handshake's worth of work.
+    """
+
+    workers: int
+    wall_ns: int
+    cycles_per_sec: float
+    speedup: float = 1.0
+    efficiency: float = 1.0
+    operations: list[OperationStats] = Field(default_factory=list)
+    per_worker: list[list[OperationStats]] = Field(default_factory=list)
+
+
+class ScalingResult(BaseModel):
+    """Result of benchmarking one algorithm on 1..N worker processes or threads."""
+
+    algorithm: str
+    iterations: int
+    warmup_iterations: int
+    timestamp: str
+    mode: str = "processes"
+    gil_enabled: bool = Field(default_factory=gil_enabled)
+    cpu_count: int | None = Field(default_factory=os.cpu_count)
+    platform: str = Field(default_factory=platform.platform)
+    liboqs_version: str = "unknown"
+    points: list[ScalingPoint] = Field(default_factory=list)
+
+
+_start_barrier: "multiprocessing.synchronize.Barrier | None" = None
+
+
+def _init_worker(
+    liboqs_path: Path | None,
+    barrier: "multiprocessing.synchronize.Barrier",
+    require_liboqs: bool = True,
+) -> None:
+    """Load liboqs in a freshly spawned worker process."""
+    global _start_barrier
+    config.config.liboqs_path = liboqs_path
+    _start_barrier = barrier
+    if require_liboqs and lib.get_liboqs() is None:
+        raise lib.LibOQSError("liboqs library not available in worker")
+
+
+def _worker_run(
+    algorithm: str,
+    iterations: int,
+    warmup: int,
+    message_size: int,
+    barrier: threading.Barrier | None = None,
+) -> tuple[list[list[int]], int, int]:
+    """Time ``algorithm`` in a worker, starting together with its peers.
+
+    Returns the samples and the monotonic start/end of the timed section.
+    """
+    _, steps, _ = _build_steps(algorithm, message_size)
+    _time_steps(steps, 0, warmup)
+    start_barrier = barrier or _start_barrier
+    if start_barrier is not None:
+        start_barrier.wait()
+    started = time.monotonic_ns()
+    samples = _time_steps(steps, iterations, 0)
+    return samples, started, time.monotonic_ns()
+
+
+def _run_workers(
+    algorithm: str, workers: int, iterations: int, warmup: int, message_size: int
+) -> list[tuple[list[list[int]], int, int]]:
+    """Run one benchmark task on each of ``workers`` spawned processes."""
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(workers)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(config.config.liboqs_path, barrier, needs_liboqs(algorithm)),
+        ) as pool:
+            futures = [
+                pool.submit(_worker_run, algorithm, iterations, warmup, message_size)
+                for _ in range(workers)
+            ]
+            return [f.result() for f in futures]
+    except BrokenProcessPool as e:
+        raise lib.LibOQSError(f"Benchmark worker failed: {e}") from e
+
+
+def _run_threads(
+    algorithm: str, workers: int, iterations: int, warmup: int, message_size: int
+) -> list[tuple[list[list[int]], int, int]]:
+    """Run one benchmark task on each of ``workers`` threads of this process."""
+    barrier = threading.Barrier(workers)
+
+    def run() -> tuple[list[list[int]], int, int]:
+        try:
+            return _worker_run(algorithm, iterations, warmup, message_size, barrier)
+        except BaseException:
+            # Release peers waiting at the barrier for a worker that died
+            barrier.abort()
+            raise
+
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="pqc-bench"
+    ) as pool:
+        futures = [pool.submit(run) for _ in range(workers)]
+    errors = [f.exception() for f in futures]
+    for error in errors:
+        if error is not None and not isinstance(error, threading.BrokenBarrierError):
+            raise error
+    return [f.result() for f in futures]
+
+
+def run_scaling_benchmark(
+    algorithm: str,
+    max_workers: int,
+    iterations: int | None = None,
+    warmup: int | None = None,
+    message_size: int = 32,
+    mode: str = "processes",
+) -> ScalingResult:
+    """Benchmark ``algorithm`` on 1..``max_workers`` concurrent workers.
+
+    In ``processes`` mode each worker is a spawned process that loads
+    liboqs itself; in ``threads`` mode the workers are threads sharing this
+    process's library handle, which scales as far as ctypes releasing the
+    GIL around liboqs calls allows (or fully on free-threaded builds). Each
+    worker runs ``iterations`` cycles; speedup and efficiency are relative
+    to the single-worker throughput.
+    """
+    if mode not in SCALING_MODES:
+        raise ValueError(f"Unknown scaling mode: {mode}")
+    iterations, warmup = _resolve_counts(iterations, warmup)
+    names = KEM_OPERATIONS if is_kem(algorithm) else SIG_OPERATIONS
+    run_workers = _run_threads if mode == "threads" else _run_workers
+    points: list[ScalingPoint] = []
+
+    for workers in range(1, max_workers + 1):
+        runs = run_workers(algorithm, workers, iterations, warmup, message_size)
+        wall_ns = max(end for _, _, end in runs) - min(start for _, start, _ in runs)
+        point = ScalingPoint(
+            workers=workers,
+            wall_ns=wall_ns,
+            cycles_per_sec=workers * iterations * 1e9 / wall_ns if wall_ns else 0.0,
+            operations=[
+                summarize(name, [t for samples, _, _ in runs for t in samples[i]])
+                for i, name in enumerate(names)
+            ],
+            per_worker=[
+                [summarize(name, samples[i]) for i, name in enumerate(names)]
+                for samples, _, _ in runs
+            ],
+        )
+        baseline = points[0].cycles_per_sec if points else point.cycles_per_sec
+        if baseline:
+            point.speedup = point.cycles_per_sec / baseline
+            point.efficiency = point.speedup / workers
+        points.append(point)
+
+    return ScalingResult(
+        algorithm=algorithm_name(algorithm),
+        iterations=iterations,
+        warmup_iterations=warmup,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        mode=mode,
+        liboqs_version=lib.get_version(),
+        points=points,
+    )
+
+
+# Message-size sweep (ML-DSA)
+SWEEP_MODES = ("direct", "prehash")
+# Bytes signed per size and mode before iterations are cut back (min 3)
+SWEEP_BYTE_BUDGET = 256 * 1024 * 1024
+
+
+class SweepPoint(BaseModel):
+    """Sign/verify timings for one message size and signing mode.
+
+    In ``prehash`` mode both operations include hashing the message, and
+    ``hash_median_ns`` is the hash alone.
+    """
+
+    size: int
+    mode: str
+    iterations: int
+    sign: OperationStats
+    verify: OperationStats
+    sign_mb_per_sec: float
+    verify_mb_per_sec: float
+    hash_median_ns: float = 0.0
+
+
+class SweepResult(BaseModel):
+    """Sign/verify throughput of one ML-DSA algorithm across message sizes.
+
+    ``sign_crossover``/``verify_crossover`` are the smallest swept sizes from
+    which the pre-hash mode is faster at every larger size, and
+    ``hash_dominant_size`` the smallest from which hashing is most of the
+    pre-hash signing time; ``None`` where the sweep never got there.
+    """
+
+    algorithm: str
+    prehash: str
+    timestamp: str
+    platform: str = Field(default_factory=platform.platform)
+    liboqs_version: str = "unknown"
+    points: list[SweepPoint] = Field(default_factory=list)
+    sign_crossover: int | None = None
+    verify_crossover: int | None = None
+    hash_dominant_size: int | None = None
+
+
+def sweep_sizes(min_size: int, max_size: int, factor: int = 4) -> list[int]:
+    """Geometric message sizes from ``min_size`` to ``max_size`` inclusive."""
+    if min_size < 1 or max_size < min_size or factor < 2:
+        raise ValueError("Need 1 <= min_size <= max_size and factor >= 2")
+    sizes = []
+    size = min_size
+    while size < max_size:
+        sizes.append(size)
+        size *= factor
+    return sizes + [max_size]
+
+
+def _sweep_message(size: int) -> bytes:
+    """A ``size``-byte message without drawing that much randomness."""
+    block = os.urandom(min(size, 1024 * 1024))
+    return block * (size // len(block)) + block[: size % len(block)]
+
+
+def _mb_per_sec(size: int, median_ns: float) -> float:
+    """Throughput in decimal megabytes per second."""
+    return size * 1e3 / median_ns if median_ns else 0.0
+
+
+def _crossover(
+    direct: list[float], prehashed: list[float], sizes: list[int]
+) -> int | None:
+    """Smallest size from which ``prehashed`` beats ``direct`` at every size."""
+    crossover = None
+    for size, d, p in zip(reversed(sizes), reversed(direct), reversed(prehashed)):
+        if p >= d:
+            break
+        crossover = size
+    return crossover
+
+
+def _sweep_steps(
+    sig: lib.Signature,
+    public_key: bytes,
+    secret_key: bytes,
+    message: bytes,
+    prehash: str,
+) -> dict[str, list[Callable[[], object]]]:
+    """Timed steps per mode: sign and verify, plus the bare pre-hash."""
+    state: dict[str, bytes] = {}
+
+    def digest_message() -> bytes:
+        hasher = signing.new_hasher(prehash)
+        hasher.update(message)
+        digest = signing.finish_digest(hasher, prehash)
+        return signing.prehash_message(prehash, len(message), digest)
+
+    def sign_direct() -> None:
+        state["sig"] = sig.sign(message, secret_key)
+
+    def verify_direct() -> None:
+        if not sig.verify(message, state["sig"], public_key):
+            raise lib.LibOQSError(f"{sig.name} verification failed")
+
+    def sign_prehashed() -> None:
+        state["sig"] = sig.sign(digest_message(), secret_key)
+
+    def verify_prehashed() -> None:
+        if not sig.verify(digest_message(), state["sig"], public_key):
+            raise lib.LibOQSError(f"{sig.name} verification failed")
+
+    return {
+        "direct": [sign_direct, verify_direct],
+        "prehash": [sign_prehashed, verify_prehashed, digest_message],
+    }
+
+
+def run_size_sweep(
+    algorithm: str,
+    sizes: list[int],
+    iterations: int | None = None,
+    warmup: int | None = None,
+    prehash: str = signing.DEFAULT_PREHASH,
+) -> SweepResult:
+    """Time ML-DSA sign/verify of each message size, direct and pre-hashed.
+
+    Iterations per size are cut back so each mode signs at most
+    :data:`SWEEP_BYTE_BUDGET` bytes (but at least three messages).
+    """
+    if is_kem(algorithm):
+        raise lib.LibOQSError("Message-size sweeps need a signature algorithm")
+    iterations, warmup = _resolve_counts(iterations, warmup)
+    sig = lib.Signature(algorithm)
+    public_key, secret_key = sig.keypair()
+
+    points: list[SweepPoint] = []
+    for size in sizes:
+        count = max(3, min(iterations, SWEEP_BYTE_BUDGET // size))
+        warm = max(1, min(warmup, SWEEP_BYTE_BUDGET // size))
+        modes = _sweep_steps(sig, public_key, secret_key, _sweep_message(size), prehash)
+        for mode, steps in modes.items():
+            samples = _time_steps(steps, count, warm)
+            sign_stats = summarize("sign", samples[0])
+            verify_stats = summarize("verify", samples[1])
+            points.append(
+                SweepPoint(
+                    size=size,
+                    mode=mode,
+                    iterations=count,
+                    sign=sign_stats,
+                    verify=verify_stats,
+                    sign_mb_per_sec=_mb_per_sec(size, sign_stats.median_ns),
+                    verify_mb_per_sec=_mb_per_sec(size, verify_stats.median_ns),
+                    hash_median_ns=(
+                        percentile(sorted(samples[2]), 50) if len(samples) > 2 else 0.0
+                    ),
+                )
+            )
+
+    direct = [p for p in points if p.mode == "direct"]
+    prehashed = [p for p in points if p.mode == "prehash"]
+    return SweepResult(
+        algorithm=sig.name,
+        prehash=prehash,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        liboqs_version=lib.get_version(),
+        points=points,
+        sign_crossover=_crossover(
+            [p.sign.median_ns for p in direct],
+            [p.sign.median_ns for p in prehashed],
+            sizes,
+        ),
+        verify_crossover=_crossover(
+            [p.verify.median_ns for p in direct],
+            [p.verify.median_ns for p in prehashed],
+            sizes,
+        ),
+        hash_dominant_size=next(
+            (p.size for p in prehashed if p.hash_median_ns * 2 >= p.sign.median_ns),
+            None,
+        ),
+    )
+
+
+# Output formatting
+CSV_FIELDS = [
+    "algorithm",
+    "operation",
+    "iterations",
+    "ops_per_sec",
+    "min_ns",
+    "median_ns",
+    "p90_ns",
+    "p99_ns",
+    "max_ns",
+]
+
+
+def _format_text(result: BenchmarkResult) -> str:
+    """Render one result as a table plus per-operation histograms."""
+    lines = [
+        (
+            f"{result.algorithm}: {result.iterations} iterations "
+            f"({result.warmup_iterations} warmup)"
+        ),
+        "Sizes: " + ", ".join(f"{k}={v} B" for k, v in result.sizes.items()),
+        "",
+        (
+            f"{'operation':<10} {'ops/sec':>12} {'min':>10} {'median':>10} "
+            f"{'p90':>10} {'p99':>10} {'max':>10}  (µs)"
+        ),
+    ]
+    for op in result.operations:
+        lines.append(
+            f"{op.operation:<10} {op.ops_per_sec:>12.1f} {op.min_ns / 1e3:>10.1f} "
+            f"{op.median_ns / 1e3:>10.1f} {op.p90_ns / 1e3:>10.1f} "
+            f"{op.p99_ns / 1e3:>10.1f} {op.max_ns / 1e3:>10.1f}"
+        )
+    for op in result.operations:
+        lines += ["", f"{op.operation} latency histogram (µs):"]
+        peak = max((b.count for b in op.histogram), default=0) or 1
+        for b in op.histogram:
+            bar = "#" * round(40 * b.count / peak)
+            lines.append(
+                f"  {b.lower_ns / 1e3:>10.1f} - {b.upper_ns / 1e3:>10.1f} "
+                f"{b.count:>7} {bar}"
+            )
+    return "\n".join(lines)
+
+
+def _format_csv(results: list[BenchmarkResult]) -> str:
+    """Render results as one CSV row per algorithm and operation."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for result in results:
+        for op in result.operations:
+            row = op.model_dump(include=set(CSV_FIELDS))
+            writer.writerow({"algorithm": result.algorithm, **row})
+    return buffer.getvalue()
+
+
+def format_results(results: list[BenchmarkResult], output_format: str) -> str:
+    """Render benchmark results as ``json``, ``text`` or ``csv``."""
+    if output_format == "json":
+        return json.dumps([r.model_dump() for r in results], indent=2)
+    if output_format == "csv":
+        return _format_csv(results)
+    if output_format == "text":
+        return "\n\n".join(_format_text(r) for r in results)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+def default_output_path(output_format: str, prefix: str = "bench") -> Path:
+    """Default results file, ``<artifacts>/<prefix>_<date>.<format>``."""
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return config.get_artifacts_dir() / f"{prefix}_{stamp}.{output_format}"
+
+
+SCALING_CSV_FIELDS = ["algorithm", "workers", "worker", *CSV_FIELDS[1:]]
+
+
+def _format_scaling_text(result: ScalingResult) -> str:
+    """Render the scaling curve plus per-worker median/p99 latencies."""
+    gil = "GIL enabled" if result.gil_enabled else "GIL disabled"
+    lines = [
+        (
+            f"{result.algorithm}: {result.iterations} cycles per worker "
+            f"({result.warmup_iterations} warmup), {result.cpu_count} CPUs, "
+            f"{result.mode} ({gil})"
+        ),
+        "",
+        f"{'workers':>7} {'cycles/sec':>12} {'speedup':>8} {'efficiency':>10}",
+    ]
+    for point in result.points:
+        lines.append(
+            f"{point.workers:>7} {point.cycles_per_sec:>12.1f} "
+            f"{point.speedup:>8.2f} {point.efficiency:>10.1%}"
+        )
+    for point in result.points:
+        lines += ["", f"{point.workers} worker(s), median / p99 latency (µs):"]
+        for index, worker_ops in enumerate(point.per_worker):
+            cells = ", ".join(
+                f"{op.operation} {op.median_ns / 1e3:.1f} / {op.p99_ns / 1e3:.1f}"
+                for op in worker_ops
+            )
+            lines.append(f"  worker {index}: {cells}")
+    return "\n".join(lines)
+
+
+def _format_scaling_csv(result: ScalingResult) -> str:
+    """Render one CSV row per worker count, worker and operation.
+
+    Rows with an empty ``worker`` column hold the aggregate over all workers.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=SCALING_CSV_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for point in result.points:
+        groups = [("", point.operations)] + list(enumerate(point.per_worker))
+        for worker, operations in groups:
+            for op in operations:
+                row = op.model_dump(include=set(CSV_FIELDS))
+                writer.writerow(
+                    {
+                        "algorithm": result.algorithm,
+                        "workers": point.workers,
+                        "worker": worker,
+                        **row,
+                    }
+                )
+    return buffer.getvalue()
+
+
+def format_scaling(result: ScalingResult, output_format: str) -> str:
+    """Render a scaling result as ``json``, ``text`` or ``csv``."""
+    if output_format == "json":
+        return json.dumps(result.model_dump(), indent=2)
+    if output_format == "csv":
+        return _format_scaling_csv(result)
+    if output_format == "text":
+        return _format_scaling_text(result)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+SWEEP_CSV_FIELDS = [
+    "algorithm",
+    "size",
+    "mode",
+    "iterations",
+    "sign_median_ns",
+    "sign_p99_ns",
+    "sign_mb_per_sec",
+    "verify_median_ns",
+    "verify_p99_ns",
+    "verify_mb_per_sec",
+    "hash_median_ns",
+]
+
+
+def _format_size(size: int | None) -> str:
+    """Human-readable binary size, e.g. ``64 KiB``."""
+    if size is None:
+        return "not reached"
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024 or size % 1024:
+            return f"{size} {unit}"
+        size //= 1024
+    return f"{size} GiB"
+
+
+def _format_sweep_text(result: SweepResult) -> str:
+    """Render per-size latency and throughput plus the crossover points."""
+    lines = [
+        f"{result.algorithm}: direct vs {result.prehash} pre-hash signing",
+        "",
+        (
+            f"{'size':>10} {'mode':<8} {'iters':>6} {'sign µs':>11} {'MB/s':>9} "
+            f"{'verify µs':>11} {'MB/s':>9} {'hash%':>6}"
+        ),
+    ]
+    for p in result.points:
+        share = (
+            f"{p.hash_median_ns / p.sign.median_ns:>6.0%}"
+            if p.mode == "prehash" and p.sign.median_ns
+            else f"{'':>6}"
+        )
+        lines.append(
+            f"{_format_size(p.size):>10} {p.mode:<8} {p.iterations:>6} "
+            f"{p.sign.median_ns / 1e3:>11.1f} {p.sign_mb_per_sec:>9.1f} "
+            f"{p.verify.median_ns / 1e3:>11.1f} {p.verify_mb_per_sec:>9.1f} {share}"
+        )
+    lines += [
+        "",
+        f"Pre-hash signing faster from: {_format_size(result.sign_crossover)}",
+        f"Pre-hash verification faster from: {_format_size(result.verify_crossover)}",
+        (
+            f"Hashing dominates pre-hash signing from: "
+            f"{_format_size(result.hash_dominant_size)}"
+        ),
+    ]
+    return "\n".join(lines)
+
+
+def _format_sweep_csv(result: SweepResult) -> str:
+    """Render one CSV row per message size and mode."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=SWEEP_CSV_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for p in result.points:
+        writer.writerow(
+            {
+                "algorithm": result.algorithm,
+                "size": p.size,
+                "mode": p.mode,
+                "iterations": p.iterations,
+                "sign_median_ns": p.sign.median_ns,
+                "sign_p99_ns": p.sign.p99_ns,
+                "sign_mb_per_sec": p.sign_mb_per_sec,
+                "verify_median_ns": p.verify.median_ns,
+                "verify_p99_ns": p.verify.p99_ns,
+                "verify_mb_per_sec": p.verify_mb_per_sec,
+                "hash_median_ns": p.hash_median_ns,
+            }
+        )
+    return buffer.getvalue()
+
+
+def format_sweep(result: SweepResult, output_format: str) -> str:
+    """Render a sweep result as ``json``, ``text`` or ``csv``."""
+    if output_format == "json":
+        return json.dumps(result.model_dump(), indent=2)
+    if output_format == "csv":
+        return _format_sweep_csv(result)
+    if output_format == "text":
+        return _format_sweep_text(result)
+    raise ValueError(f"Unknown output format: {output_format}")
+
+
+# Classical vs PQC comparison
+CLASSICAL_KEMS = ("x25519", "p256", "rsa2048", "rsa3072")
+CLASSICAL_SIGS = ("ed25519", "ecdsa-p256", "rsa2048-pss", "rsa3072-pss")
+
+
+def _format_suite_family(results: list[BenchmarkResult], reference: str) -> list[str]:
+    """One family's latency table and size table, relative to ``reference``."""
+    ref = next((r for r in results if r.algorithm == reference), None)
+    ref_ops = {op.operation: op for op in ref.operations} if ref else {}
+    lines = [
+        (
+            f"{'algorithm':<14} {'operation':<9} {'ops/sec':>11} {'median':>10} "
+            f"{'p90':>10} {'p99':>10} {'vs ' + reference:>16}  (µs)"
+        ),
+    ]
+    for result in results:
+        for op in result.operations:
+            base = ref_ops.get(op.operation)
+            relative = (
+                f"{op.ops_per_sec / base.ops_per_sec:>15.3g}x"
+                if base and base.ops_per_sec
+                else f"{'':>16}"
+            )
+            lines.append(
+                f"{result.algorithm:<14} {op.operation:<9} {op.ops_per_sec:>11.1f} "
+                f"{op.median_ns / 1e3:>10.1f} {op.p90_ns / 1e3:>10.1f} "
+                f"{op.p99_ns / 1e3:>10.1f} {relative}"
+            )
+    keys = [k for k in results[0].sizes if k != "message"]
+    lines += ["", f"{'algorithm':<14} " + " ".join(f"{k:>13}" for k in keys) + "  (B)"]
+    for result in results:
+        cells = " ".join(f"{result.sizes.get(k, 0):>13}" for k in keys)
+        lines.append(f"{result.algorithm:<14} {cells}")
+    return lines
+
+
+def format_suite(
+    results: list[BenchmarkResult],
+    output_format: str,
+    references: tuple[str, ...] = (),
+) -> str:
+    """Render a classical vs PQC suite; text groups KEMs and signatures.
+
+    In text output each family's ops/sec is also given relative to the
+    first of ``references`` (canonical names) found in that family.
+    """
+    if output_format != "text":
+        return format_results(results, output_format)
+    sections = []
+    for title, kem in (("Key establishment", True), ("Signatures", False)):
+        family = [r for r in results if is_kem(r.algorithm) == kem]
+        if not family:
+            continue
+        names = [r.algorithm for r in family]
+        reference = next((n for n in references if n in names), names[0])
+        sections.append(
+            "\n".join([f"{title}:", *_format_suite_family(family, reference)])
+        )
+    return "\n\n".join(sections)
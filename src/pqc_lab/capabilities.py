@@ -0,0 +1,222 @@
+"""liboqs capability discovery for PQC Readiness Lab.
+
+Enumerates the KEM and signature algorithms enabled in the loaded liboqs
+through ``OQS_*_alg_count``/``OQS_*_alg_identifier`` and reads each one's
+NIST level, security property and exact object sizes from its ``OQS_KEM`` /
+``OQS_SIG`` struct. Probing instantiates every enabled algorithm, so the
+result is cached in the artifacts directory, keyed by the library file, its
+mtime and the liboqs version, and reused until any of those change.
+"""
+
+import ctypes
+import logging
+import os
+import threading
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+
+from . import config, lib
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 1
+
+
+class AlgorithmDetails(BaseModel):
+    """Properties and object sizes of one liboqs algorithm."""
+
+    name: str
+    type: str
+    alg_version: str = ""
+    claimed_nist_level: int
+    is_ind_cca: bool | None = None
+    is_euf_cma: bool | None = None
+    length_public_key: int
+    length_secret_key: int
+    length_ciphertext: int | None = None
+    length_shared_secret: int | None = None
+    length_signature: int | None = None
+
+
+class Capabilities(BaseModel):
+    """Every enabled algorithm of one liboqs build."""
+
+    version: int = _VERSION
+    library_path: str
+    library_mtime_ns: int
+    liboqs_version: str
+    kems: dict[str, AlgorithmDetails] = Field(default_factory=dict)
+    sigs: dict[str, AlgorithmDetails] = Field(default_factory=dict)
+
+    def matches(self, other: "Capabilities") -> bool:
+        """Whether both describe the same library build."""
+        return (
+            self.version,
+            self.library_path,
+            self.library_mtime_ns,
+            self.liboqs_version,
+        ) == (
+            other.version,
+            other.library_path,
+            other.library_mtime_ns,
+            other.liboqs_version,
+        )
+
+
+def _enabled(oqs: ctypes.CDLL, family: str) -> list[str]:
+    """Names of the enabled ``family`` (``KEM`` or ``SIG``) algorithms.
+
+    The functions' prototypes are declared once when :mod:`lib` loads liboqs;
+    a build without them lists nothing.
+    """
+    try:
+        count = getattr(oqs, f"OQS_{family}_alg_count")
+        identifier = getattr(oqs, f"OQS_{family}_alg_identifier")
+        is_enabled = getattr(oqs, f"OQS_{family}_alg_is_enabled")
+    except AttributeError:
+        return []
+
+    names = []
+    for index in range(count()):
+        name = identifier(index)
+        if name and is_enabled(name):
+            names.append(name.decode())
+    return names
+
+
+def _text(value: bytes | None) -> str:
+    return value.decode(errors="replace") if value else ""
+
+
+def _probe_kem(oqs: ctypes.CDLL, name: str) -> AlgorithmDetails | None:
+    """Read one KEM's struct, or ``None`` if it cannot be instantiated."""
+    handle = oqs.OQS_KEM_new(name.encode())
+    if not handle:
+        return None
+    try:
+        info = lib._OQSKEM.from_address(handle)
+        return AlgorithmDetails(
+            name=name,
+            type="KEM",
+            alg_version=_text(info.alg_version),
+            claimed_nist_level=info.claimed_nist_level,
+            is_ind_cca=info.ind_cca,
+            length_public_key=info.length_public_key,
+            length_secret_key=info.length_secret_key,
+            length_ciphertext=info.length_ciphertext,
+            length_shared_secret=info.length_shared_secret,
+        )
+    finally:
+        oqs.OQS_KEM_free(handle)
+
+
+def _probe_sig(oqs: ctypes.CDLL, name: str) -> AlgorithmDetails | None:
+    """Read one signature scheme's struct, or ``None`` if unavailable."""
+    handle = oqs.OQS_SIG_new(name.encode())
+    if not handle:
+        return None
+    try:
+        info = lib._OQSSIG.from_address(handle)
+        return AlgorithmDetails(
+            name=name,
+            type="DSA",
+            alg_version=_text(info.alg_version),
+            claimed_nist_level=info.claimed_nist_level,
+            is_euf_cma=info.euf_cma,
+            length_public_key=info.length_public_key,
+            length_secret_key=info.length_secret_key,
+            length_signature=info.length_signature,
+        )
+    finally:
+        oqs.OQS_SIG_free(handle)
+
+
+def _library_identity() -> tuple[str, int, str] | None:
+    """``(path, mtime_ns, version)`` of the loaded liboqs, the cache key."""
+    path = lib.get_library_path()
+    if path is None:
+        return None
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        # Found by soname through the system search; the version must do
+        mtime = 0
+    return path, mtime, lib.get_version()
+
+
+def probe() -> Capabilities | None:
+    """Introspect the loaded liboqs; ``None`` when it is unavailable."""
+    oqs = lib.get_liboqs()
+    identity = _library_identity()
+    if oqs is None or identity is None:
+        return None
+
+    path, mtime, version = identity
+    caps = Capabilities(
+        library_path=path, library_mtime_ns=mtime, liboqs_version=version
+    )
+    for name in _enabled(oqs, "KEM"):
+        if (details := _probe_kem(oqs, name)) is not None:
+            caps.kems[name] = details
+    for name in _enabled(oqs, "SIG"):
+        if (details := _probe_sig(oqs, name)) is not None:
+            caps.sigs[name] = details
+    return caps
+
+
+def cache_path() -> Path:
+    """Capability cache file in the artifacts directory."""
+    return config.get_artifacts_dir() / config.get_cache_config().capabilities_filename
+
+
+def _read_cache(path: Path) -> Capabilities | None:
+    try:
+        return Capabilities.model_validate_json(path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValidationError) as e:
+        logger.debug(f"Ignoring unreadable capability cache {path}: {e}")
+        return None
+
+
+def _write_cache(path: Path, caps: Capabilities) -> None:
+    """Write the cache atomically; failure is logged, never raised."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(caps.model_dump_json(indent=2))
+        tmp.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not save capability cache {path}: {e}")
+
+
+_capabilities: Capabilities | None = None
+_capabilities_lock = threading.Lock()
+
+
+def get_capabilities(path: Path | None = None) -> Capabilities | None:
+    """Capabilities of the loaded liboqs, from memory, disk or a fresh probe."""
+    global _capabilities
+    identity = _library_identity()
+    if identity is None:
+        return None
+    library_path, mtime, version = identity
+    wanted = Capabilities(
+        library_path=library_path, library_mtime_ns=mtime, liboqs_version=version
+    )
+
+    with _capabilities_lock:
+        if _capabilities is not None and _capabilities.matches(wanted):
+            return _capabilities
+        path = path or cache_path()
+        cached = _read_cache(path)
+        if cached is not None and cached.matches(wanted):
+            _capabilities = cached
+            return cached
+
+        probed = probe()
+        if probed is not None:
+            _write_cache(path, probed)
+        _capabilities = probed
+        return probed
@@ -0,0 +1,258 @@
+"""Classical counterparts of the PQC algorithms, for benchmark comparisons.
+
+Each algorithm is exposed through the same keypair/encaps/decaps or
+keypair/sign/verify steps as the liboqs benchmarks, so results share one
+harness and output format. Key agreement is framed as a KEM the way DHKEM
+does it: ``encaps`` generates an ephemeral key and derives the shared secret
+against the recipient's public key (the ephemeral public key is the
+"ciphertext"), and ``decaps`` repeats the exchange on the recipient side.
+RSA is measured both as OAEP transport of a 32-byte secret and as RSA-PSS
+signatures.
+
+As with liboqs, public keys, ciphertexts and signatures cross every step as
+bytes, while private keys stay loaded key objects as they would in a server.
+Reported key sizes are the raw encodings, or DER (PKCS#1 public, PKCS#8
+private) for RSA.
+"""
+
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding, rsa, x25519
+
+from . import lib
+
+Steps = tuple[list[Callable[[], object]], dict[str, int]]
+
+_DER = serialization.Encoding.DER
+_OAEP = padding.OAEP(
+    mgf=padding.MGF1(hashes.SHA256()), algorithm=hashes.SHA256(), label=None
+)
+_PSS = padding.PSS(mgf=padding.MGF1(hashes.SHA256()), salt_length=32)
+_ECDSA = ec.ECDSA(hashes.SHA256())
+_SECRET_SIZE = 32
+# Longest DER encoding of an ECDSA P-256 signature
+_ECDSA_P256_MAX_SIGNATURE = 72
+
+_Key = TypeVar("_Key")
+
+
+class _State(Generic[_Key]):
+    """The current private key and the bytes passed between steps."""
+
+    def __init__(self) -> None:
+        self.key: _Key | None = None
+        self.wire: dict[str, bytes] = {}
+
+    @property
+    def private(self) -> _Key:
+        assert self.key is not None, "keypair step has not run"
+        return self.key
+
+
+@dataclass(frozen=True)
+class ClassicalAlgorithm:
+    """A classical algorithm and the builder of its benchmark steps."""
+
+    name: str
+    kind: str
+    build: Callable[[int], Steps]
+
+
+def _x25519_steps(message_size: int) -> Steps:
+    """X25519 as a DHKEM-style KEM."""
+    state: _State[x25519.X25519PrivateKey] = _State()
+    public_key = x25519.X25519PublicKey.from_public_bytes
+
+    def keypair() -> None:
+        state.key = x25519.X25519PrivateKey.generate()
+        state.wire["pk"] = state.key.public_key().public_bytes_raw()
+
+    def encaps() -> None:
+        ephemeral = x25519.X25519PrivateKey.generate()
+        state.wire["ss"] = ephemeral.exchange(public_key(state.wire["pk"]))
+        state.wire["ct"] = ephemeral.public_key().public_bytes_raw()
+
+    def decaps() -> None:
+        state.private.exchange(public_key(state.wire["ct"]))
+
+    sizes = {"public_key": 32, "secret_key": 32, "ciphertext": 32, "shared_secret": 32}
+    return [keypair, encaps, decaps], sizes
+
+
+def _point(key: ec.EllipticCurvePrivateKey) -> bytes:
+    return key.public_key().public_bytes(
+        serialization.Encoding.X962, serialization.PublicFormat.UncompressedPoint
+    )
+
+
+def _p256_public(data: bytes) -> ec.EllipticCurvePublicKey:
+    return ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256R1(), data)
+
+
+def _ecdh_p256_steps(message_size: int) -> Steps:
+    """ECDH over P-256 as a DHKEM-style KEM, with uncompressed points."""
+    state: _State[ec.EllipticCurvePrivateKey] = _State()
+
+    def keypair() -> None:
+        state.key = ec.generate_private_key(ec.SECP256R1())
+        state.wire["pk"] = _point(state.key)
+
+    def encaps() -> None:
+        ephemeral = ec.generate_private_key(ec.SECP256R1())
+        peer = _p256_public(state.wire["pk"])
+        state.wire["ss"] = ephemeral.exchange(ec.ECDH(), peer)
+        state.wire["ct"] = _point(ephemeral)
+
+    def decaps() -> None:
+        state.private.exchange(ec.ECDH(), _p256_public(state.wire["ct"]))
+
+    sizes = {"public_key": 65, "secret_key": 32, "ciphertext": 65, "shared_secret": 32}
+    return [keypair, encaps, decaps], sizes
+
+
+def _rsa_public_bytes(key: rsa.RSAPrivateKey) -> bytes:
+    return key.public_key().public_bytes(_DER, serialization.PublicFormat.PKCS1)
+
+
+def _rsa_public(data: bytes) -> rsa.RSAPublicKey:
+    key = serialization.load_der_public_key(data)
+    assert isinstance(key, rsa.RSAPublicKey)
+    return key
+
+
+def _rsa_sizes(bits: int) -> dict[str, int]:
+    """DER public and private key sizes of a fresh ``bits``-bit key."""
+    key = rsa.generate_private_key(65537, bits)
+    private = key.private_bytes(
+        _DER, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    return {"public_key": len(_rsa_public_bytes(key)), "secret_key": len(private)}
+
+
+def _rsa_oaep_steps(bits: int) -> Callable[[int], Steps]:
+    """RSA-OAEP (SHA-256) key transport of a random 32-byte secret."""
+
+    def build(message_size: int) -> Steps:
+        state: _State[rsa.RSAPrivateKey] = _State()
+
+        def keypair() -> None:
+            state.key = rsa.generate_private_key(65537, bits)
+            state.wire["pk"] = _rsa_public_bytes(state.key)
+
+        def encaps() -> None:
+            state.wire["ss"] = os.urandom(_SECRET_SIZE)
+            public = _rsa_public(state.wire["pk"])
+            state.wire["ct"] = public.encrypt(state.wire["ss"], _OAEP)
+
+        def decaps() -> None:
+            state.private.decrypt(state.wire["ct"], _OAEP)
+
+        sizes = {
+            **_rsa_sizes(bits),
+            "ciphertext": bits // 8,
+            "shared_secret": _SECRET_SIZE,
+        }
+        return [keypair, encaps, decaps], sizes
+
+    return build
+
+
+def _verify(name: str, check: Callable[[], None]) -> None:
+    """Run a ``cryptography`` verification, failing like the liboqs steps."""
+    try:
+        check()
+    except InvalidSignature as e:
+        raise lib.LibOQSError(f"{name} verification failed") from e
+
+
+def _ed25519_steps(message_size: int) -> Steps:
+    """Ed25519 signatures."""
+    state: _State[ed25519.Ed25519PrivateKey] = _State()
+    message = os.urandom(message_size)
+
+    def keypair() -> None:
+        state.key = ed25519.Ed25519PrivateKey.generate()
+        state.wire["pk"] = state.key.public_key().public_bytes_raw()
+
+    def sign() -> None:
+        state.wire["sig"] = state.private.sign(message)
+
+    def verify() -> None:
+        public = ed25519.Ed25519PublicKey.from_public_bytes(state.wire["pk"])
+        _verify("Ed25519", lambda: public.verify(state.wire["sig"], message))
+
+    sizes = {"public_key": 32, "secret_key": 32, "signature": 64}
+    return [keypair, sign, verify], {**sizes, "message": message_size}
+
+
+def _ecdsa_p256_steps(message_size: int) -> Steps:
+    """ECDSA over P-256 with SHA-256, DER signatures."""
+    state: _State[ec.EllipticCurvePrivateKey] = _State()
+    message = os.urandom(message_size)
+
+    def keypair() -> None:
+        state.key = ec.generate_private_key(ec.SECP256R1())
+        state.wire["pk"] = _point(state.key)
+
+    def sign() -> None:
+        state.wire["sig"] = state.private.sign(message, _ECDSA)
+
+    def verify() -> None:
+        public = _p256_public(state.wire["pk"])
+        _verify("ECDSA-P256", lambda: public.verify(state.wire["sig"], message, _ECDSA))
+
+    sizes = {"public_key": 65, "secret_key": 32, "signature": _ECDSA_P256_MAX_SIGNATURE}
+    return [keypair, sign, verify], {**sizes, "message": message_size}
+
+
+def _rsa_pss_steps(bits: int) -> Callable[[int], Steps]:
+    """RSA-PSS signatures with SHA-256 and a 32-byte salt."""
+
+    def build(message_size: int) -> Steps:
+        state: _State[rsa.RSAPrivateKey] = _State()
+        message = os.urandom(message_size)
+        sha256 = hashes.SHA256()
+
+        def keypair() -> None:
+            state.key = rsa.generate_private_key(65537, bits)
+            state.wire["pk"] = _rsa_public_bytes(state.key)
+
+        def sign() -> None:
+            state.wire["sig"] = state.private.sign(message, _PSS, sha256)
+
+        def verify() -> None:
+            public = _rsa_public(state.wire["pk"])
+            _verify(
+                f"RSA-{bits}-PSS",
+                lambda: public.verify(state.wire["sig"], message, _PSS, sha256),
+            )
+
+        sizes = {**_rsa_sizes(bits), "signature": bits // 8}
+        return [keypair, sign, verify], {**sizes, "message": message_size}
+
+    return build
+
+
+# CLI name -> algorithm
+ALGORITHMS: dict[str, ClassicalAlgorithm] = {
+    "x25519": ClassicalAlgorithm("X25519", "KEM", _x25519_steps),
+    "p256": ClassicalAlgorithm("ECDH-P256", "KEM", _ecdh_p256_steps),
+    "rsa2048": ClassicalAlgorithm("RSA-2048-OAEP", "KEM", _rsa_oaep_steps(2048)),
+    "rsa3072": ClassicalAlgorithm("RSA-3072-OAEP", "KEM", _rsa_oaep_steps(3072)),
+    "ed25519": ClassicalAlgorithm("Ed25519", "DSA", _ed25519_steps),
+    "ecdsa-p256": ClassicalAlgorithm("ECDSA-P256", "DSA", _ecdsa_p256_steps),
+    "rsa2048-pss": ClassicalAlgorithm("RSA-2048-PSS", "DSA", _rsa_pss_steps(2048)),
+    "rsa3072-pss": ClassicalAlgorithm("RSA-3072-PSS", "DSA", _rsa_pss_steps(3072)),
+}
+_BY_NAME = {alg.name.lower(): alg for alg in ALGORITHMS.values()}
+
+
+def get(algorithm: str) -> ClassicalAlgorithm | None:
+    """Look up a classical algorithm by CLI or display name."""
+    key = algorithm.lower()
+    return ALGORITHMS.get(key) or _BY_NAME.get(key)
@@ -0,0 +1 @@
+"""CLI commands, each module imported only when one of its commands runs."""
@@ -0,0 +1,428 @@
+"""``pqc-lab bench``: time PQC operations and compare against baselines."""
+
+from pathlib import Path
+from types import MappingProxyType
+
+import click
+
+from .. import bench as benchmark
+from .. import config, lib, regression, signing
+
+PQC_KEMS = ["mlkem512", "mlkem768", "mlkem1024", "x25519-mlkem768"]
+PQC_SIGS = ["mldsa44", "mldsa65", "mldsa87"]
+ALGORITHMS = [
+    *PQC_KEMS,
+    *PQC_SIGS,
+    *benchmark.CLASSICAL_KEMS,
+    *benchmark.CLASSICAL_SIGS,
+]
+
+
+@click.group(invoke_without_command=True)
+@click.option(
+    "--alg",
+    "algorithm",
+    type=click.Choice(ALGORITHMS),
+    default="mlkem768",
+    help="Algorithm to benchmark",
+)
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    help="Number of iterations (default from configuration)",
+)
+@click.option(
+    "--warmup",
+    type=click.IntRange(min=0),
+    help="Warmup iterations (default from configuration)",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Measure scaling on 1..N worker processes",
+)
+@click.option(
+    "--threads",
+    is_flag=True,
+    help="With --workers, run the workers as threads of this process",
+)
+@click.option("--output", type=click.Path(), help="Output file for results")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "text", "csv"]),
+    help="Output format (default from configuration)",
+)
+@click.option(
+    "--save-baseline",
+    "baseline_name",
+    help="Also store the raw timings in this named baseline (see 'bench compare')",
+)
+@click.pass_context
+def bench(
+    ctx: click.Context,
+    algorithm: str,
+    count: int | None,
+    warmup: int | None,
+    workers: int | None,
+    threads: bool,
+    output: str | None,
+    output_format: str | None,
+    baseline_name: str | None,
+) -> None:
+    """Run benchmarks for PQC algorithms."""
+    if ctx.invoked_subcommand is not None:
+        return
+    bench_config = config.get_benchmark_config()
+    output_format = output_format or bench_config.output_format
+
+    if benchmark.needs_liboqs(algorithm) and not lib.is_available():
+        raise click.ClickException("liboqs library not available")
+    if workers and baseline_name:
+        raise click.UsageError("--save-baseline cannot be combined with --workers")
+    if threads and not workers:
+        raise click.UsageError("--threads requires --workers")
+
+    try:
+        if workers:
+            mode = "threads" if threads else "processes"
+            scaling = benchmark.run_scaling_benchmark(
+                algorithm, workers, count, warmup, mode=mode
+            )
+            rendered = benchmark.format_scaling(scaling, output_format)
+        else:
+            run = benchmark.sample_benchmark(algorithm, count, warmup)
+            rendered = benchmark.format_results([run.summary()], output_format)
+    except lib.LibOQSError as e:
+        raise click.ClickException(str(e)) from e
+
+    click.echo(rendered)
+
+    if baseline_name:
+        try:
+            path = regression.save_run(baseline_name, run)
+        except (regression.BaselineError, OSError) as e:
+            raise click.ClickException(str(e)) from e
+        click.echo(f"Baseline {baseline_name!r} updated: {path}", err=True)
+
+    if output or bench_config.save_results:
+        output_path = (
+            Path(output) if output else benchmark.default_output_path(output_format)
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(rendered + "\n")
+        click.echo(f"Results saved to {output_path}", err=True)
+
+
+@bench.command()
+@click.argument("baseline_name", metavar="BASELINE")
+@click.option(
+    "--alg",
+    "algorithms",
+    type=click.Choice(ALGORITHMS),
+    multiple=True,
+    help="Algorithm to compare (repeatable; default every one in the baseline)",
+)
+@click.option(
+    "--against",
+    "candidate_name",
+    help="Compare with this saved baseline instead of running a new benchmark",
+)
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    help="Iterations for the new run (default: the baseline's)",
+)
+@click.option(
+    "--warmup",
+    type=click.IntRange(min=0),
+    help="Warmup iterations (default: the baseline's)",
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    help="Median slowdown in percent that counts as a regression",
+)
+@click.option(
+    "--confidence",
+    type=click.FloatRange(min=0.5, max=1, max_open=True),
+    help="Confidence level of the test and intervals (e.g. 0.95)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "json"]),
+    default="text",
+    help="Output format",
+)
+@click.option(
+    "--save-baseline",
+    "save_name",
+    help="Also store the new run in this named baseline",
+)
+def compare(
+    baseline_name: str,
+    algorithms: tuple[str, ...],
+    candidate_name: str | None,
+    count: int | None,
+    warmup: int | None,
+    threshold: float | None,
+    confidence: float | None,
+    output_format: str,
+    save_name: str | None,
+) -> None:
+    """Compare a new run (or another baseline) against a saved baseline.
+
+    Exits with status 1 when any operation is significantly slower than the
+    baseline by more than the threshold.
+    """
+    bench_config = config.get_benchmark_config()
+    if threshold is None:
+        threshold = bench_config.regression_threshold
+    confidence = confidence or bench_config.confidence
+
+    try:
+        baseline = regression.load_baseline(baseline_name)
+        candidate = regression.load_baseline(candidate_name) if candidate_name else None
+    except regression.BaselineError as e:
+        raise click.ClickException(str(e)) from e
+
+    wanted = [benchmark.algorithm_name(a) for a in algorithms] or list(baseline.runs)
+    missing = [a for a in wanted if a not in baseline.runs]
+    if missing:
+        raise click.ClickException(
+            f"Baseline {baseline_name!r} has no runs for: {', '.join(missing)}"
+        )
+    needs_liboqs = any(benchmark.needs_liboqs(a) for a in wanted)
+    if candidate is None and needs_liboqs and not lib.is_available():
+        raise click.ClickException("liboqs library not available")
+
+    comparisons = []
+    for algorithm in wanted:
+        reference = baseline.runs[algorithm]
+        if candidate is not None:
+            if algorithm not in candidate.runs:
+                raise click.ClickException(
+                    f"Baseline {candidate_name!r} has no run for {algorithm}"
+                )
+            run = candidate.runs[algorithm]
+        else:
+            try:
+                run = benchmark.sample_benchmark(
+                    algorithm,
+                    count or reference.iterations,
+                    reference.warmup_iterations if warmup is None else warmup,
+                    reference.sizes.get("message", 32),
+                )
+            except lib.LibOQSError as e:
+                raise click.ClickException(str(e)) from e
+            if save_name:
+                try:
+                    regression.save_run(save_name, run)
+                except (regression.BaselineError, OSError) as e:
+                    raise click.ClickException(str(e)) from e
+        comparisons += regression.compare_runs(reference, run, threshold, confidence)
+
+    click.echo(regression.format_comparisons(comparisons, output_format, confidence))
+    regressed = [c for c in comparisons if c.regression]
+    if regressed:
+        raise click.ClickException(
+            f"{len(regressed)} operation(s) slower than baseline "
+            f"{baseline_name!r} by more than {threshold:g}%"
+        )
+
+
+# Size suffix -> multiplier (binary units)
+_SIZE_UNITS = MappingProxyType({"": 1, "K": 1024, "M": 1024**2, "G": 1024**3})
+
+
+class ByteSize(click.ParamType):
+    """A byte count with an optional K/M/G (binary) suffix, e.g. ``64M``."""
+
+    name = "size"
+
+    def convert(
+        self, value: object, param: click.Parameter | None, ctx: click.Context | None
+    ) -> int:
+        if isinstance(value, int):
+            return value
+        text = str(value).strip().upper().removesuffix("B").removesuffix("I")
+        unit = text[-1:] if text[-1:] in "KMG" else ""
+        try:
+            size = int(text[: len(text) - len(unit)]) * _SIZE_UNITS[unit]
+        except ValueError:
+            self.fail(f"{value!r} is not a size like 32, 4K, 64M or 1G", param, ctx)
+        if size < 1:
+            self.fail("Size must be at least 1 byte", param, ctx)
+        return size
+
+
+@bench.command()
+@click.option(
+    "--alg",
+    "algorithm",
+    type=click.Choice(["mldsa44", "mldsa65", "mldsa87"]),
+    default="mldsa65",
+    help="Signature algorithm to sweep",
+)
+@click.option("--min-size", type=ByteSize(), default="32", help="Smallest message")
+@click.option(
+    "--max-size", type=ByteSize(), default="64M", help="Largest message (e.g. 1G)"
+)
+@click.option(
+    "--factor",
+    type=click.IntRange(min=2),
+    default=4,
+    help="Ratio between consecutive sizes",
+)
+@click.option(
+    "--prehash",
+    type=click.Choice(list(signing.PREHASH_ALGORITHMS)),
+    default=signing.DEFAULT_PREHASH,
+    help="Pre-hash function compared against direct signing",
+)
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    help="Iterations per size, reduced for large messages (default from configuration)",
+)
+@click.option(
+    "--warmup",
+    type=click.IntRange(min=0),
+    help="Warmup iterations (default from configuration)",
+)
+@click.option("--output", type=click.Path(), help="Output file for results")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "text", "csv"]),
+    help="Output format (default from configuration)",
+)
+def sweep(
+    algorithm: str,
+    min_size: int,
+    max_size: int,
+    factor: int,
+    prehash: str,
+    count: int | None,
+    warmup: int | None,
+    output: str | None,
+    output_format: str | None,
+) -> None:
+    """Sweep ML-DSA sign/verify over message sizes, direct vs pre-hashed."""
+    bench_config = config.get_benchmark_config()
+    output_format = output_format or bench_config.output_format
+
+    if not lib.is_available():
+        raise click.ClickException("liboqs library not available")
+    try:
+        sizes = benchmark.sweep_sizes(min_size, max_size, factor)
+    except ValueError as e:
+        raise click.UsageError(str(e)) from e
+
+    try:
+        result = benchmark.run_size_sweep(algorithm, sizes, count, warmup, prehash)
+    except (lib.LibOQSError, MemoryError) as e:
+        raise click.ClickException(str(e) or "Out of memory") from e
+    rendered = benchmark.format_sweep(result, output_format)
+    click.echo(rendered)
+
+    if output or bench_config.save_results:
+        output_path = (
+            Path(output)
+            if output
+            else benchmark.default_output_path(output_format, "sweep")
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(rendered + "\n")
+        click.echo(f"Results saved to {output_path}", err=True)
+
+
+@bench.command()
+@click.option(
+    "--kem",
+    type=click.Choice(PQC_KEMS),
+    default="mlkem768",
+    help="ML-KEM parameter set compared with X25519, ECDH P-256 and RSA-OAEP",
+)
+@click.option(
+    "--dsa",
+    type=click.Choice(PQC_SIGS),
+    default="mldsa65",
+    help="ML-DSA parameter set compared with Ed25519, ECDSA P-256 and RSA-PSS",
+)
+@click.option(
+    "--family",
+    type=click.Choice(["all", "kem", "sig"]),
+    default="all",
+    help="Limit the suite to key establishment or signatures",
+)
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    help="Number of iterations (default from configuration)",
+)
+@click.option(
+    "--warmup",
+    type=click.IntRange(min=0),
+    help="Warmup iterations (default from configuration)",
+)
+@click.option(
+    "--message-size",
+    type=click.IntRange(min=0),
+    default=32,
+    help="Bytes signed by the signature algorithms",
+)
+@click.option("--output", type=click.Path(), help="Output file for results")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "text", "csv"]),
+    help="Output format (default from configuration)",
+)
+def classical(
+    kem: str,
+    dsa: str,
+    family: str,
+    count: int | None,
+    warmup: int | None,
+    message_size: int,
+    output: str | None,
+    output_format: str | None,
+) -> None:
+    """Benchmark classical algorithms alongside ML-KEM and ML-DSA."""
+    bench_config = config.get_benchmark_config()
+    output_format = output_format or bench_config.output_format
+
+    suite: list[str] = []
+    if family in ("all", "kem"):
+        suite += [kem, *benchmark.CLASSICAL_KEMS]
+    if family in ("all", "sig"):
+        suite += [dsa, *benchmark.CLASSICAL_SIGS]
+    if not lib.is_available():
+        click.echo("liboqs not available: running classical algorithms only", err=True)
+        suite = [a for a in suite if not benchmark.needs_liboqs(a)]
+
+    results = []
+    for algorithm in suite:
+        click.echo(f"Benchmarking {benchmark.algorithm_name(algorithm)}...", err=True)
+        try:
+            results.append(
+                benchmark.run_benchmark(algorithm, count, warmup, message_size)
+            )
+        except lib.LibOQSError as e:
+            raise click.ClickException(str(e)) from e
+
+    references = (benchmark.algorithm_name(kem), benchmark.algorithm_name(dsa))
+    rendered = benchmark.format_suite(results, output_format, references)
+    click.echo(rendered)
+
+    if output or bench_config.save_results:
+        output_path = (
+            Path(output)
+            if output
+            else benchmark.default_output_path(output_format, "classical")
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(rendered + "\n")
+        click.echo(f"Results saved to {output_path}", err=True)
@@ -0,0 +1,422 @@
+"""``pqc-lab sign``, ``verify`` and ``proof``: file and directory signatures."""
+
+from pathlib import Path
+
+import click
+
+from .. import daemon_client, prehash
+
+# keys, lib and signing (which load pydantic and liboqs), manifest and merkle
+# (and the process pools they use) are imported inside the code paths that
+# need them, so --socket calls to the serve daemon start lean.
+
+
+def _single_input(input_file: str | None, input_dir: str | None) -> str:
+    """Require exactly one of ``--in`` and ``--dir``."""
+    if bool(input_file) == bool(input_dir):
+        raise click.UsageError("Specify exactly one of --in or --dir")
+    return input_file or ""
+
+
+def _absolute(path: str) -> str:
+    """``path`` as the daemon must see it, whatever its working directory."""
+    return str(Path(path).absolute())
+
+
+def _daemon_request(socket_path: str, kind: int, fields: list[str]) -> str:
+    """Run one request on the ``serve`` daemon, failing like a local call."""
+    try:
+        status, message = daemon_client.request(socket_path, kind, fields)
+    except daemon_client.DaemonError as e:
+        raise click.ClickException(str(e)) from e
+    if status != daemon_client.OK:
+        raise click.ClickException(message)
+    return message
+
+
+def _default_manifest_path(signature_file: str) -> str:
+    """Manifest stored next to the signature, e.g. ``out.sig`` -> ``out.manifest``."""
+    return str(Path(signature_file).with_suffix(".manifest"))
+
+
+@click.command()
+@click.option(
+    "--alg",
+    "algorithm",
+    type=click.Choice(["mldsa44", "mldsa65", "mldsa87"]),
+    default="mldsa65",
+    help="Signature algorithm to use",
+)
+@click.option(
+    "--pub", "public_key", type=click.Path(), required=True, help="Public key file"
+)
+@click.option(
+    "--priv", "private_key", type=click.Path(), required=True, help="Private key file"
+)
+@click.option(
+    "--in",
+    "input_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="File to sign",
+)
+@click.option(
+    "--dir",
+    "input_dir",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory tree to sign via a manifest",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(),
+    help="Manifest file for --dir (default: signature path with .manifest)",
+)
+@click.option(
+    "--merkle",
+    is_flag=True,
+    help="Sign --dir as an incremental Merkle tree instead of a manifest",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Hashing processes for --dir (default: CPU count)",
+)
+@click.option(
+    "--sig",
+    "signature_file",
+    type=click.Path(),
+    required=True,
+    help="Output signature file",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Send the request to a 'pqc-lab serve' daemon on this socket",
+)
+@click.option(
+    "--prehash",
+    type=click.Choice(list(prehash.PREHASH_ALGORITHMS)),
+    default=prehash.DEFAULT_PREHASH,
+    help="Hash streamed over the input before signing",
+)
+@click.option(
+    "--chunk-size",
+    type=click.IntRange(min=4096, max=prehash.MAX_CHUNK_SIZE),
+    default=prehash.DEFAULT_CHUNK_SIZE,
+    help="Read size in bytes when streaming the input",
+)
+def sign(
+    algorithm: str,
+    public_key: str,
+    private_key: str,
+    input_file: str | None,
+    input_dir: str | None,
+    manifest: str | None,
+    merkle: bool,
+    workers: int | None,
+    signature_file: str,
+    socket_path: str | None,
+    prehash: str,
+    chunk_size: int,
+) -> None:
+    """Sign a file, or a directory tree via a manifest, using PQC signatures."""
+    input_file = _single_input(input_file, input_dir)
+    if socket_path:
+        if input_dir:
+            raise click.UsageError("--socket signs single files (--in) only")
+        click.echo(f"Signing {input_file} with {algorithm} via {socket_path}...")
+        paths = (private_key, public_key, input_file, signature_file)
+        _daemon_request(
+            socket_path,
+            daemon_client.SIGN,
+            [algorithm, *map(_absolute, paths), prehash, str(chunk_size)],
+        )
+        click.echo(f"Signature saved to {signature_file}")
+        return
+    if merkle:
+        if not input_dir:
+            raise click.UsageError("--merkle requires --dir")
+        _sign_merkle(
+            algorithm,
+            public_key,
+            private_key,
+            input_dir,
+            signature_file,
+            prehash,
+            chunk_size,
+            workers,
+        )
+        return
+    if input_dir:
+        from .. import manifest as manifests
+
+        input_file = manifest or _default_manifest_path(signature_file)
+        click.echo(f"Hashing {input_dir} into {input_file}...")
+        try:
+            tree = manifests.build_manifest(input_dir, prehash, chunk_size, workers)
+        except (OSError, ValueError) as e:
+            raise click.ClickException(str(e)) from e
+        Path(input_file).parent.mkdir(parents=True, exist_ok=True)
+        Path(input_file).write_text(tree.dumps())
+        click.echo(f"Manifest lists {len(tree.entries)} files")
+    click.echo(f"Signing {input_file} with {algorithm}...")
+
+    from .. import keys, lib, signing
+
+    try:
+        secret = keys.read_key(private_key, algorithm, keys.PRIVATE)
+        public = keys.read_key(public_key, algorithm, keys.PUBLIC)
+        result = signing.sign_file(
+            algorithm, secret, input_file, prehash, chunk_size, public_key=public
+        )
+    except (OSError, keys.KeyFileError, lib.LibOQSError) as e:
+        raise click.ClickException(str(e)) from e
+
+    sig_path = Path(signature_file)
+    sig_path.parent.mkdir(parents=True, exist_ok=True)
+    sig_path.write_text(result.dumps())
+    click.echo(f"Signature saved to {signature_file}")
+
+
+@click.command()
+@click.option(
+    "--alg",
+    "algorithm",
+    type=click.Choice(["mldsa44", "mldsa65", "mldsa87"]),
+    default="mldsa65",
+    help="Signature algorithm to use",
+)
+@click.option(
+    "--pub",
+    "public_key",
+    type=click.Path(exists=True),
+    required=True,
+    help="Public key file",
+)
+@click.option(
+    "--in",
+    "input_file",
+    type=click.Path(exists=True, dir_okay=False),
+    help="File to verify",
+)
+@click.option(
+    "--dir",
+    "input_dir",
+    type=click.Path(exists=True, file_okay=False),
+    help="Directory tree to verify against its signed manifest",
+)
+@click.option(
+    "--manifest",
+    type=click.Path(),
+    help="Manifest file for --dir (default: signature path with .manifest)",
+)
+@click.option(
+    "--merkle",
+    is_flag=True,
+    help="Check against a signed Merkle root (--dir, or --in with --proof)",
+)
+@click.option(
+    "--proof",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Merkle inclusion proof for --in",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Hashing processes for --dir (default: CPU count)",
+)
+@click.option(
+    "--sig",
+    "signature_file",
+    type=click.Path(exists=True),
+    required=True,
+    help="Signature file",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Send the request to a 'pqc-lab serve' daemon on this socket",
+)
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Ignore the verification cache and always rehash and verify",
+)
+def verify(
+    algorithm: str,
+    public_key: str,
+    input_file: str | None,
+    input_dir: str | None,
+    manifest: str | None,
+    merkle: bool,
+    proof: str | None,
+    workers: int | None,
+    signature_file: str,
+    socket_path: str | None,
+    no_cache: bool,
+) -> None:
+    """Verify a file, or a directory tree's manifest, using PQC signatures."""
+    input_file = _single_input(input_file, input_dir)
+    if socket_path:
+        if input_dir or merkle:
+            raise click.UsageError("--socket verifies single files (--in) only")
+        click.echo(f"Verifying {input_file} with {algorithm} via {socket_path}...")
+        files = map(_absolute, (public_key, input_file, signature_file))
+        fields = [algorithm, *files, "no-cache" if no_cache else "cache"]
+        click.echo(_daemon_request(socket_path, daemon_client.VERIFY, fields))
+        return
+    if merkle:
+        if input_file and not proof:
+            raise click.UsageError("--merkle with --in requires --proof")
+        _verify_merkle(
+            algorithm, public_key, input_file, input_dir, proof, signature_file, workers
+        )
+        return
+    if input_dir:
+        input_file = manifest or _default_manifest_path(signature_file)
+    click.echo(f"Verifying {input_file} with {algorithm}...")
+
+    from .. import keys, lib, signing, verify_cache
+
+    try:
+        public = keys.read_key(public_key, algorithm, keys.PUBLIC)
+        detached = signing.SignatureFile.loads(Path(signature_file).read_text())
+        if detached.algorithm != lib.resolve_algorithm(algorithm):
+            raise click.ClickException(
+                f"Signature was made with {detached.algorithm}, not {algorithm}"
+            )
+        cache = None if no_cache else verify_cache.get_verify_cache()
+        valid = signing.verify_file(public, input_file, detached, cache)
+        if cache is not None:
+            cache.save()
+    except (OSError, keys.KeyFileError, lib.LibOQSError) as e:
+        raise click.ClickException(str(e)) from e
+
+    if not valid:
+        raise click.ClickException("Signature verification FAILED")
+    click.echo("Signature OK")
+
+    if input_dir:
+        from .. import manifest as manifests
+
+        click.echo(f"Checking {input_dir} against manifest...")
+        try:
+            tree = manifests.Manifest.loads(Path(input_file).read_text())
+            diff = manifests.check_manifest(
+                input_dir, tree, detached.chunk_size, workers
+            )
+        except (OSError, ValueError) as e:
+            raise click.ClickException(str(e)) from e
+        for label, paths in (
+            ("MISMATCH", diff.mismatched),
+            ("MISSING", diff.missing),
+            ("EXTRA", diff.extra),
+        ):
+            for path in paths:
+                click.echo(f"{label}: {path}")
+        if not diff.ok:
+            raise click.ClickException("Directory does not match signed manifest")
+        click.echo(f"All {len(tree.entries)} files OK")
+
+
+def _sign_merkle(
+    algorithm: str,
+    public_key: str,
+    private_key: str,
+    input_dir: str,
+    signature_file: str,
+    prehash: str,
+    chunk_size: int,
+    workers: int | None,
+) -> None:
+    """Update the persisted Merkle tree for ``input_dir`` and sign its root."""
+    from .. import keys, lib
+    from .. import merkle as merkle_tree
+
+    click.echo(f"Updating Merkle tree for {input_dir}...")
+    try:
+        secret = keys.read_key(private_key, algorithm, keys.PRIVATE)
+        public = keys.read_key(public_key, algorithm, keys.PUBLIC)
+        state, rehashed = merkle_tree.update_state(
+            input_dir, prehash, chunk_size, workers
+        )
+        click.echo(f"Rehashed {rehashed} of {len(state.leaves)} files")
+        signed = merkle_tree.sign_root(algorithm, secret, state)
+        if not signed.verify(public):
+            raise lib.LibOQSError("Public key does not match private key")
+    except (OSError, ValueError, keys.KeyFileError, lib.LibOQSError) as e:
+        raise click.ClickException(str(e)) from e
+
+    sig_path = Path(signature_file)
+    sig_path.parent.mkdir(parents=True, exist_ok=True)
+    sig_path.write_text(signed.dumps())
+    click.echo(f"Merkle root {signed.root.hex()} signed to {signature_file}")
+
+
+def _verify_merkle(
+    algorithm: str,
+    public_key: str,
+    input_file: str,
+    input_dir: str | None,
+    proof: str | None,
+    signature_file: str,
+    workers: int | None,
+) -> None:
+    """Check a whole tree, or one file with a proof, against a signed root."""
+    from .. import keys, lib
+    from .. import merkle as merkle_tree
+
+    try:
+        public = keys.read_key(public_key, algorithm, keys.PUBLIC)
+        signed = merkle_tree.MerkleSignature.loads(Path(signature_file).read_text())
+        if signed.algorithm != lib.resolve_algorithm(algorithm):
+            raise click.ClickException(
+                f"Signature was made with {signed.algorithm}, not {algorithm}"
+            )
+        if input_dir:
+            click.echo(f"Rehashing {input_dir}...")
+            root, leaves = merkle_tree.compute_root(
+                input_dir, signed.prehash, workers=workers
+            )
+            valid = (root, leaves) == (signed.root, signed.leaves)
+            valid = valid and signed.verify(public)
+        else:
+            click.echo(f"Checking {input_file} with inclusion proof...")
+            inclusion = merkle_tree.MerkleProof.loads(Path(proof or "").read_text())
+            valid = merkle_tree.verify_inclusion(public, input_file, inclusion, signed)
+    except (OSError, ValueError, keys.KeyFileError, lib.LibOQSError) as e:
+        raise click.ClickException(str(e)) from e
+
+    if not valid:
+        raise click.ClickException("Merkle verification FAILED")
+    click.echo("Merkle signature OK")
+
+
+@click.command()
+@click.option(
+    "--dir",
+    "input_dir",
+    type=click.Path(exists=True, file_okay=False),
+    required=True,
+    help="Directory previously signed with sign --merkle",
+)
+@click.option("--path", "member", required=True, help="File path relative to --dir")
+@click.option(
+    "--out", "output", type=click.Path(), required=True, help="Output proof file"
+)
+def proof(input_dir: str, member: str, output: str) -> None:
+    """Export a Merkle inclusion proof for one file of a signed tree."""
+    from .. import merkle as merkle_tree
+
+    state = merkle_tree.load_state(input_dir)
+    if state is None:
+        raise click.ClickException(f"No Merkle tree recorded for {input_dir}")
+    try:
+        inclusion = merkle_tree.make_proof(state, Path(member).as_posix())
+    except KeyError as e:
+        raise click.ClickException(f"{member} is not in the signed tree") from e
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    Path(output).write_text(inclusion.dumps())
+    click.echo(f"Inclusion proof for {member} saved to {output}")
@@ -0,0 +1,289 @@
+"""``pqc-lab handshake``: ML-KEM handshake server, client and load test."""
+
+import asyncio
+import os
+from pathlib import Path
+
+import click
+
+from .. import bench as benchmark
+from .. import config, keys, lib, loadtest
+from .. import handshake as handshakes
+from .bench import ByteSize
+
+KEMS = ["mlkem512", "mlkem768", "mlkem1024", "x25519-mlkem768"]
+
+
+@click.group()
+def handshake() -> None:
+    """Perform PQC-based secure handshake."""
+    pass
+
+
+@handshake.command()
+@click.option("--host", default="127.0.0.1", help="Host to bind to")
+@click.option("--port", default=5555, help="Port to bind to")
+@click.option(
+    "--alg",
+    "algorithm",
+    type=click.Choice(KEMS),
+    default="mlkem768",
+    help="KEM algorithm to use",
+)
+@click.option(
+    "--pool-size",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Pre-generated ephemeral keypairs to keep ready (0 disables the pool)",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(min=0, max=65535),
+    default=None,
+    help="Serve /metrics and /metrics.json on this port (see 'pqc-lab stats')",
+)
+def server(
+    host: str,
+    port: int,
+    algorithm: str,
+    pool_size: int | None,
+    metrics_port: int | None,
+) -> None:
+    """Start handshake server."""
+    click.echo(f"Starting {algorithm} handshake server on {host}:{port}...")
+
+    network = config.get_network_config()
+    if pool_size is not None:
+        network = network.model_copy(update={"keypair_pool_size": pool_size})
+    if metrics_port is not None:
+        network = network.model_copy(update={"metrics_port": metrics_port})
+    try:
+        hs_server = handshakes.HandshakeServer(algorithm, host, port, network)
+    except lib.LibOQSError as e:
+        raise click.ClickException(str(e)) from e
+
+    async def serve() -> None:
+        await hs_server.start()
+        click.echo(f"Listening on {hs_server.host}:{hs_server.port} (Ctrl+C to stop)")
+        if hs_server.metrics_port is not None:
+            click.echo(
+                f"Metrics on http://{hs_server.host}:{hs_server.metrics_port}/metrics"
+            )
+        try:
+            await hs_server.serve_forever()
+        finally:
+            await hs_server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    except (OSError, lib.LibOQSError) as e:
+        raise click.ClickException(str(e)) from e
+    stats = hs_server.stats
+    click.echo(
+        f"Server stopped: {stats.completed} completed, {stats.failed} failed, "
+        f"{stats.timed_out} timed out, {stats.rejected} rejected, "
+        f"{stats.resumed} resumed"
+    )
+    if hs_server.pool is not None:
+        click.echo(
+            f"Keypair pool: {hs_server.pool.hits} hits, {hs_server.pool.misses} misses"
+        )
+
+
+@handshake.command()
+@click.option("--host", default="127.0.0.1", help="Server host")
+@click.option("--port", default=5555, help="Server port")
+@click.option(
+    "--alg",
+    "algorithm",
+    type=click.Choice(KEMS),
+    default="mlkem768",
+    help="KEM algorithm to use",
+)
+@click.option("--message", default="Hello PQC!", help="Message to send")
+@click.option(
+    "--cipher",
+    type=click.Choice(list(handshakes.CIPHER_IDS)),
+    help="Record cipher for application data (default from configuration)",
+)
+@click.option(
+    "--bytes",
+    "size",
+    type=ByteSize(),
+    help="Throughput mode: stream this many bytes (e.g. 64M) and time the echo",
+)
+@click.option(
+    "--record-size",
+    type=ByteSize(),
+    help="Application bytes per record (default from configuration)",
+)
+@click.option(
+    "--ticket",
+    "ticket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Session ticket file: resume from it if present, then store the new one",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Load test: number of simultaneous clients",
+)
+@click.option(
+    "--duration",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Load test: seconds to run (default 10)",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    help="Load test: target handshakes per second across all clients",
+)
+@click.option("--output", type=click.Path(), help="Load test: output file for results")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["json", "text", "csv"]),
+    help="Load test: output format (default from configuration)",
+)
+def client(
+    host: str,
+    port: int,
+    algorithm: str,
+    message: str,
+    cipher: str | None,
+    size: int | None,
+    record_size: int | None,
+    ticket_path: Path | None,
+    concurrency: int | None,
+    duration: float | None,
+    rate: float | None,
+    output: str | None,
+    output_format: str | None,
+) -> None:
+    """Connect to handshake server, or load test it with --concurrency/--duration."""
+    if concurrency or duration or rate:
+        _load_test(
+            host,
+            port,
+            algorithm,
+            message,
+            concurrency or 1,
+            duration or 10.0,
+            rate,
+            output,
+            output_format,
+        )
+        return
+
+    network = config.get_network_config()
+    if record_size is not None:
+        if record_size > handshakes.MAX_RECORD_SIZE:
+            raise click.BadParameter(
+                f"at most {handshakes.MAX_RECORD_SIZE} bytes",
+                param_hint="--record-size",
+            )
+        network = network.model_copy(update={"record_size": record_size})
+    payload = message.encode()
+    if size is not None:
+        # One record's worth of random data, repeated up to the requested size
+        payload = os.urandom(network.record_size)
+
+    click.echo(f"Connecting to {algorithm} handshake server at {host}:{port}...")
+
+    ticket = None
+    if ticket_path is not None and ticket_path.exists():
+        try:
+            ticket = handshakes.SessionTicket.loads(ticket_path.read_text())
+        except keys.KeyFileError as e:
+            click.echo(f"Ignoring unreadable ticket {ticket_path}: {e}", err=True)
+
+    try:
+        result = asyncio.run(
+            handshakes.run_client(
+                algorithm,
+                host,
+                port,
+                payload,
+                network,
+                ticket=ticket,
+                cipher=cipher,
+                size=size,
+            )
+        )
+    except (handshakes.HandshakeError, lib.LibOQSError) as e:
+        raise click.ClickException(str(e)) from e
+
+    kind = "Resumed session" if result.resumed else "Handshake complete"
+    click.echo(
+        f"{kind} in {result.handshake_ns / 1e6:.2f} ms "
+        f"({result.bytes_sent} B sent, {result.bytes_received} B received)"
+    )
+    if ticket_path is not None and result.ticket is not None:
+        fd = os.open(ticket_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(result.ticket.dumps())
+    if size is None:
+        click.echo(f"Server replied: {result.reply.decode(errors='replace')}")
+        return
+    overhead = handshakes.RECORD_OVERHEAD
+    click.echo(
+        f"Echoed {result.payload_bytes} B over {result.cipher} in "
+        f"{result.transfer_ns / 1e6:.2f} ms: {result.throughput:.1f} MB/s each way"
+    )
+    session_ns = result.handshake_ns + result.transfer_ns
+    click.echo(
+        f"Handshake share of the session: {result.handshake_ns / session_ns:.2%}"
+    )
+    click.echo(
+        f"{result.records} records of up to {network.record_size} B, "
+        f"{overhead} B overhead each "
+        f"({result.records * overhead / max(result.payload_bytes, 1):.2%} of payload)"
+    )
+
+
+def _load_test(
+    host: str,
+    port: int,
+    algorithm: str,
+    message: str,
+    concurrency: int,
+    duration: float,
+    rate: float | None,
+    output: str | None,
+    output_format: str | None,
+) -> None:
+    """Run ``handshake client`` in load-generating mode."""
+    bench_config = config.get_benchmark_config()
+    output_format = output_format or bench_config.output_format
+    pacing = f" at {rate:g}/s" if rate else ""
+    click.echo(
+        f"Load testing {host}:{port} with {concurrency} {algorithm} clients "
+        f"for {duration:g} s{pacing}...",
+        err=True,
+    )
+
+    try:
+        result = asyncio.run(
+            loadtest.run_load(
+                algorithm, host, port, concurrency, duration, rate, message.encode()
+            )
+        )
+    except lib.LibOQSError as e:
+        raise click.ClickException(str(e)) from e
+
+    rendered = loadtest.format_load([result], output_format)
+    click.echo(rendered)
+
+    if output or bench_config.save_results:
+        output_path = (
+            Path(output)
+            if output
+            else benchmark.default_output_path(output_format, "handshake")
+        )
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(rendered + "\n")
+        click.echo(f"Results saved to {output_path}", err=True)
+    if not result.completed:
+        raise click.ClickException("No handshake completed")
@@ -0,0 +1,54 @@
+"""``pqc-lab info`` and ``list``: library and algorithm information."""
+
+import click
+
+from .. import __version__, config, lib
+
+
+@click.command()
+def info() -> None:
+    """Show system information and capabilities."""
+    click.echo("PQC Readiness Lab System Information")
+    click.echo("=" * 40)
+
+    click.echo(f"Version: {__version__}")
+    click.echo(f"liboqs available: {lib.is_available()}")
+
+    if lib.is_available():
+        click.echo(f"liboqs version: {lib.get_version()}")
+        click.echo(f"Enabled features: {', '.join(lib.get_enabled_features())}")
+        click.echo(f"Supported KEMs: {', '.join(lib.get_supported_kems())}")
+        click.echo(f"Supported DSAs: {', '.join(lib.get_supported_sigs())}")
+    else:
+        click.echo("liboqs not available - PQC operations will not work")
+
+    click.echo(f"Artifacts directory: {config.get_artifacts_dir()}")
+    click.echo(f"Default KEM: {config.get_default_kem()}")
+    click.echo(f"Default DSA: {config.get_default_dsa()}")
+
+
+@click.command()
+def list() -> None:
+    """List supported algorithms and their details."""
+    click.echo("Supported PQC Algorithms")
+    click.echo("=" * 30)
+
+    click.echo("\nKey Encapsulation Mechanisms (KEM):")
+    for kem in lib.get_supported_kems():
+        details = lib.get_kem_details(kem)
+        if details:
+            click.echo(
+                f"  {kem}: NIST Level {details['claimed_nist_level']}, "
+                f"pk {details['length_public_key']} B, "
+                f"ct {details['length_ciphertext']} B"
+            )
+
+    click.echo("\nDigital Signature Algorithms (DSA):")
+    for dsa in lib.get_supported_sigs():
+        details = lib.get_sig_details(dsa)
+        if details:
+            click.echo(
+                f"  {dsa}: NIST Level {details['claimed_nist_level']}, "
+                f"pk {details['length_public_key']} B, "
+                f"sig {details['length_signature']} B"
+            )
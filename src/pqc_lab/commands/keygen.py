@@ -0,0 +1,105 @@
+"""``pqc-lab keygen``: write key files or bulk-generate into a key ring."""
+
+import time
+
+import click
+
+from .. import bench as benchmark
+from .. import keyring as key_ring
+from .. import keys, lib
+
+
+@click.command()
+@click.option(
+    "--alg",
+    "algorithm",
+    type=click.Choice(
+        ["mlkem512", "mlkem768", "mlkem1024", "mldsa44", "mldsa65", "mldsa87"]
+    ),
+    default="mlkem768",
+    help="Algorithm to generate keys for",
+)
+@click.option("--pub", "public_key", type=click.Path(), help="Public key file")
+@click.option("--priv", "private_key", type=click.Path(), help="Private key file")
+@click.option(
+    "--out",
+    "output_dir",
+    type=click.Path(),
+    default="artifacts",
+    help="Output directory",
+)
+@click.option(
+    "--count",
+    type=click.IntRange(min=1),
+    default=1,
+    help="Number of keypairs to generate (more than one needs --keyring)",
+)
+@click.option(
+    "--keyring",
+    "keyring_path",
+    type=click.Path(dir_okay=False),
+    help="Append the keys to this binary key ring instead of writing key files",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Threads generating keys for --keyring (default: CPU count)",
+)
+def keygen(
+    algorithm: str,
+    public_key: str | None,
+    private_key: str | None,
+    output_dir: str,
+    count: int,
+    keyring_path: str | None,
+    workers: int | None,
+) -> None:
+    """Generate keypair for PQC algorithm."""
+    if keyring_path is None and count > 1:
+        raise click.UsageError("--count above 1 requires --keyring")
+    if keyring_path is not None and (public_key or private_key):
+        raise click.UsageError("--keyring cannot be combined with --pub/--priv")
+
+    if keyring_path is None:
+        click.echo(f"Generating {algorithm} keypair...")
+    try:
+        scheme = (
+            lib.KEM(algorithm)
+            if benchmark.is_kem(algorithm)
+            else lib.Signature(algorithm)
+        )
+        if keyring_path is not None:
+            _append(keyring_path, scheme, count, workers)
+            return
+        public, secret = scheme.keypair()
+    except lib.LibOQSError as e:
+        raise click.ClickException(str(e)) from e
+
+    # Set default filenames if not provided
+    if not public_key:
+        public_key = f"{output_dir}/{algorithm}.pub"
+    if not private_key:
+        private_key = f"{output_dir}/{algorithm}.priv"
+
+    keys.write_key(public_key, algorithm, keys.PUBLIC, public)
+    keys.write_key(private_key, algorithm, keys.PRIVATE, secret)
+
+    click.echo(f"Keys saved to {public_key} and {private_key}")
+
+
+def _append(
+    path: str, scheme: key_ring.KeyPairScheme, count: int, workers: int | None
+) -> None:
+    """Generate ``count`` keypairs into the key ring at ``path``."""
+    click.echo(f"Generating {count} {scheme.name} keypairs into {path}...")
+    start = time.perf_counter()
+    try:
+        section = key_ring.append_keys(path, scheme, count, workers)
+    except (OSError, key_ring.KeyringError) as e:
+        raise click.ClickException(str(e)) from e
+    elapsed = time.perf_counter() - start
+    last = section.first_id + section.count - 1
+    click.echo(
+        f"Added keys {section.first_id}-{last} to {path} "
+        f"({count / elapsed:,.0f} keypairs/s)"
+    )
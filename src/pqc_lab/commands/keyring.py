@@ -0,0 +1,67 @@
+"""``pqc-lab keyring``: inspect key rings and export keys from them."""
+
+from pathlib import Path
+
+import click
+
+from .. import keyring as key_ring
+from .. import keys
+
+
+@click.group()
+def keyring() -> None:
+    """Inspect a key ring and export keys from it by ID."""
+
+
+@keyring.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+def info(path: str) -> None:
+    """Show the sections of a key ring."""
+    try:
+        with key_ring.Keyring(path) as ring:
+            click.echo(f"{path}: {len(ring)} keys in {len(ring.sections)} sections")
+            for section in ring.sections:
+                last = section.first_id + section.count - 1
+                click.echo(
+                    f"  IDs {section.first_id}-{last}: {section.algorithm}, "
+                    f"{section.record_size} bytes per key at offset {section.offset}"
+                )
+    except (OSError, key_ring.KeyringError) as e:
+        raise click.ClickException(str(e)) from e
+
+
+@keyring.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.argument("key_id", type=click.IntRange(min=0))
+@click.option("--pub", "public_key", type=click.Path(), help="Public key file")
+@click.option("--priv", "private_key", type=click.Path(), help="Private key file")
+@click.option(
+    "--out",
+    "output_dir",
+    type=click.Path(),
+    default="artifacts",
+    help="Output directory",
+)
+def export(
+    path: str,
+    key_id: int,
+    public_key: str | None,
+    private_key: str | None,
+    output_dir: str,
+) -> None:
+    """Write key KEY_ID of a key ring out as key files."""
+    public_key = public_key or str(Path(output_dir) / f"key-{key_id}.pub")
+    private_key = private_key or str(Path(output_dir) / f"key-{key_id}.priv")
+    try:
+        with key_ring.Keyring(path) as ring:
+            key = ring.get(key_id)
+            algorithm = key.algorithm
+            public, secret = bytes(key.public_key), bytes(key.secret_key)
+            key.public_key.release()
+            key.secret_key.release()
+    except (OSError, key_ring.KeyringError) as e:
+        raise click.ClickException(str(e)) from e
+
+    keys.write_key(public_key, algorithm, keys.PUBLIC, public)
+    keys.write_key(private_key, algorithm, keys.PRIVATE, secret)
+    click.echo(f"{algorithm} key {key_id} saved to {public_key} and {private_key}")
@@ -0,0 +1,59 @@
+"""``pqc-lab serve``: signing daemon for ``sign``/``verify --socket``."""
+
+import asyncio
+
+import click
+
+from .. import daemon, keys, lib
+
+
+@click.command()
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False),
+    required=True,
+    help="Unix socket to listen on",
+)
+@click.option(
+    "--priv",
+    "private_keys",
+    type=click.Path(exists=True, dir_okay=False),
+    multiple=True,
+    help="Private key file to hold for signing (repeatable)",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Threads answering requests (default: CPU count)",
+)
+def serve(socket_path: str, private_keys: tuple[str, ...], workers: int | None) -> None:
+    """Run a signing daemon on a Unix socket for sign/verify --socket."""
+    if not lib.is_available():
+        raise click.ClickException("liboqs library not available")
+    try:
+        signd = daemon.SigningDaemon(socket_path, private_keys, workers)
+    except (OSError, keys.KeyFileError, lib.LibOQSError) as e:
+        raise click.ClickException(str(e)) from e
+    for loaded in signd.keys.values():
+        click.echo(f"Holding {loaded.algorithm} private key")
+
+    async def run() -> None:
+        await signd.start()
+        click.echo(f"Listening on {socket_path} (Ctrl+C to stop)")
+        try:
+            await signd.serve_forever()
+        finally:
+            await signd.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        raise click.ClickException(str(e)) from e
+    stats = signd.stats
+    click.echo(
+        f"Daemon stopped: {stats.signed} signed, {stats.verified} verified, "
+        f"{stats.failed} failed verifications, {stats.errors} errors"
+    )
@@ -0,0 +1,41 @@
+"""``pqc-lab stats``: native call metrics of a running handshake server."""
+
+import json
+import urllib.error
+import urllib.request
+
+import click
+
+from .. import metrics
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Server host")
+@click.option(
+    "--port",
+    type=click.IntRange(min=1, max=65535),
+    default=metrics.DEFAULT_PORT,
+    help="Server metrics port (handshake server --metrics-port)",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["text", "json", "prometheus"]),
+    default="text",
+    help="Output format",
+)
+def stats(host: str, port: int, output_format: str) -> None:
+    """Show per-algorithm call counts and latencies from a running server."""
+    url = f"http://{host}:{port}/metrics.json"
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            data = json.load(response)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        raise click.ClickException(f"Could not fetch metrics from {url}: {e}") from e
+
+    if output_format == "json":
+        click.echo(metrics.format_json(data))
+    elif output_format == "prometheus":
+        click.echo(metrics.format_prometheus(data), nl=False)
+    else:
+        click.echo(metrics.format_text(data))
@@ -36,6 +36,37 @@ class NetworkConfig(BaseModel):
     )
     timeout: float = Field(default=30.0, description="Network timeout in seconds")
     buffer_size: int = Field(default=4096, description="Network buffer size")
+    max_connections: int = Field(
+        default=1024, description="Concurrent connections before new ones are refused"
+    )
+    crypto_workers: int = Field(
+        default=4, description="Threads running native KEM operations"
+    )
+    max_pending_crypto: int = Field(
+        default=256, description="KEM operations queued before handshakes wait"
+    )
+    keypair_pool_size: int = Field(
+        default=64, description="Ephemeral keypairs kept ready by the server (0 = off)"
+    )
+    keypair_pool_low_water: int = Field(
+        default=16, description="Ready keypairs at which background refill starts"
+    )
+    ticket_lifetime: float = Field(
+        default=3600.0, description="Session ticket lifetime in seconds (0 = off)"
+    )
+    ticket_replay_cache: int = Field(
+        default=65536, description="Redeemed tickets remembered to block replays"
+    )
+    metrics_port: int | None = Field(
+        default=None, description="HTTP port serving server metrics (unset = off)"
+    )
+    cipher: str = Field(
+        default="aes-256-gcm",
+        description="Client record cipher: aes-256-gcm or chacha20-poly1305",
+    )
+    record_size: int = Field(
+        default=16 * 1024, description="Application bytes per sent record"
+    )
 
 
 class BenchmarkConfig(BaseModel):
@@ -51,6 +82,15 @@ class BenchmarkConfig(BaseModel):
     save_results: bool = Field(
         default=True, description="Save benchmark results to file"
     )
+    regression_threshold: float = Field(
+        default=5.0, description="Median slowdown in percent that fails a compare"
+    )
+    confidence: float = Field(
+        default=0.95, description="Confidence level of compare tests and intervals"
+    )
+    bootstrap_resamples: int = Field(
+        default=1000, description="Resamples behind compare confidence intervals"
+    )
 
 
 class FileConfig(BaseModel):
@@ -71,6 +111,26 @@ class FileConfig(BaseModel):
     )
 
 
+class CacheConfig(BaseModel):
+    """Configuration for the verification and capability caches."""
+
+    enabled: bool = Field(default=True, description="Cache successful verifications")
+    max_entries: int = Field(
+        default=4096, description="Entries kept before least recently used eviction"
+    )
+    trust_mtime: bool = Field(
+        default=False,
+        description="Skip rehashing files whose size, times and inode are unchanged",
+    )
+    filename: str = Field(
+        default="verify-cache.json", description="Cache file in the artifacts directory"
+    )
+    capabilities_filename: str = Field(
+        default="capabilities.json",
+        description="liboqs capability cache in the artifacts directory",
+    )
+
+
 class Config(BaseModel):
     """Main configuration for PQC Readiness Lab."""
 
@@ -78,12 +138,16 @@ class Config(BaseModel):
     network: NetworkConfig = Field(default_factory=NetworkConfig)
     benchmark: BenchmarkConfig = Field(default_factory=BenchmarkConfig)
     file: FileConfig = Field(default_factory=FileConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
 
     # liboqs configuration
     liboqs_path: Path | None = Field(
         default=None, description="Path to liboqs installation"
     )
     enable_openssl: bool = Field(default=True, description="Enable OpenSSL integration")
+    context_pool_size: int = Field(
+        default=8, description="Idle liboqs contexts kept per algorithm"
+    )
 
     # Logging
     log_level: str = Field(default="INFO", description="Logging level")
@@ -134,3 +198,8 @@ def get_network_config() -> NetworkConfig:
 def get_benchmark_config() -> BenchmarkConfig:
     """Get benchmark configuration."""
     return config.benchmark
+
+
+def get_cache_config() -> CacheConfig:
+    """Get verification cache configuration."""
+    return config.cache
@@ -0,0 +1,231 @@
+"""Signing daemon for PQC Readiness Lab.
+
+``pqc-lab serve`` loads liboqs once, decodes the private keys it is given
+and answers the requests of :mod:`pqc_lab.daemon_client` on a Unix socket,
+so a ``sign``/``verify --socket`` call skips the imports, configuration and
+library loading that dominate a one-shot CLI run on small files. Requests
+run on a thread pool, since hashing and liboqs both release the GIL.
+
+The socket is created owner-only: anyone who can connect to it can sign
+with the loaded keys.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import stat
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from . import daemon_client as protocol
+from . import keys, lib, signing, verify_cache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LoadedKey:
+    """A decoded private key held by the daemon."""
+
+    algorithm: str
+    secret_key: bytes = field(repr=False)
+
+
+@dataclass
+class DaemonStats:
+    """Counters for a running daemon."""
+
+    signed: int = 0
+    verified: int = 0
+    failed: int = 0
+    errors: int = 0
+
+
+def _key_id(path: str | Path) -> str:
+    return str(Path(path).resolve())
+
+
+def remove_stale_socket(path: Path) -> None:
+    """Delete a socket left by a daemon that died; refuse if one still answers."""
+    try:
+        mode = path.lstat().st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except (ConnectionRefusedError, FileNotFoundError):
+            path.unlink(missing_ok=True)
+            return
+    raise FileExistsError(f"A daemon is already listening on {path}")
+
+
+class SigningDaemon:
+    """Unix socket server signing and verifying files with preloaded keys."""
+
+    def __init__(
+        self,
+        socket_path: str | Path,
+        private_keys: tuple[str | Path, ...] = (),
+        workers: int | None = None,
+    ) -> None:
+        self.socket_path = Path(socket_path)
+        self.keys: dict[str, LoadedKey] = {}
+        for path in private_keys:
+            self.load_key(path)
+        self.stats = DaemonStats()
+        self._cache = verify_cache.get_verify_cache()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or os.cpu_count() or 1, thread_name_prefix="pqc-serve"
+        )
+        self._server: asyncio.AbstractServer | None = None
+
+    def load_key(self, path: str | Path) -> LoadedKey:
+        """Decode a private key file and keep it for signing requests."""
+        algorithm, secret_key = keys.load_key(path, keys.PRIVATE)
+        # Loads liboqs and rejects algorithms it lacks before serving starts
+        lib.Signature(algorithm)
+        loaded = LoadedKey(algorithm, secret_key)
+        self.keys[_key_id(path)] = loaded
+        return loaded
+
+    # Requests, run on the thread pool
+    def _sign(
+        self,
+        algorithm: str,
+        private_key: str,
+        public_key: str,
+        input_file: str,
+        signature_file: str,
+        prehash: str,
+        chunk_size: str,
+    ) -> tuple[int, str]:
+        loaded = self.keys.get(_key_id(private_key))
+        if loaded is None:
+            raise keys.KeyFileError(f"{private_key} is not loaded by this daemon")
+        if loaded.algorithm != lib.resolve_algorithm(algorithm):
+            raise keys.KeyFileError(
+                f"{private_key}: expected {lib.resolve_algorithm(algorithm)} "
+                f"PRIVATE KEY, found {loaded.algorithm} PRIVATE KEY"
+            )
+        public = keys.read_key(public_key, algorithm, keys.PUBLIC)
+        result = signing.sign_file(
+            algorithm,
+            loaded.secret_key,
+            input_file,
+            prehash,
+            int(chunk_size),
+            public_key=public,
+        )
+        sig_path = Path(signature_file)
+        sig_path.parent.mkdir(parents=True, exist_ok=True)
+        sig_path.write_text(result.dumps())
+        return protocol.OK, f"Signature saved to {signature_file}"
+
+    def _verify(
+        self,
+        algorithm: str,
+        public_key: str,
+        input_file: str,
+        signature_file: str,
+        use_cache: str,
+    ) -> tuple[int, str]:
+        public = keys.read_key(public_key, algorithm, keys.PUBLIC)
+        detached = signing.SignatureFile.loads(Path(signature_file).read_text())
+        if detached.algorithm != lib.resolve_algorithm(algorithm):
+            raise keys.KeyFileError(
+                f"Signature was made with {detached.algorithm}, not {algorithm}"
+            )
+        cache = self._cache if use_cache == "cache" else None
+        if not signing.verify_file(public, input_file, detached, cache):
+            return protocol.FAILED, "Signature verification FAILED"
+        return protocol.OK, "Signature OK"
+
+    def dispatch(self, kind: int, payload: bytes) -> tuple[int, str]:
+        """Answer one request with ``(status, message)``."""
+        operations: dict[int, tuple[Callable[..., tuple[int, str]], int]] = {
+            protocol.SIGN: (self._sign, 7),
+            protocol.VERIFY: (self._verify, 5),
+        }
+        try:
+            if kind not in operations:
+                raise ValueError(f"Unknown operation {kind:#x}")
+            operation, arity = operations[kind]
+            fields = protocol.decode_fields(payload)
+            if len(fields) != arity:
+                raise ValueError(f"Expected {arity} fields, got {len(fields)}")
+            return operation(*fields)
+        except (OSError, ValueError, keys.KeyFileError, lib.LibOQSError) as e:
+            return protocol.ERROR, str(e)
+
+    # Connections
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer requests on one connection until the client closes it."""
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(protocol.HEADER.size)
+                except asyncio.IncompleteReadError:
+                    break
+                version, kind, length = protocol.HEADER.unpack(header)
+                if version != protocol.VERSION or length > protocol.MAX_PAYLOAD:
+                    writer.write(protocol.encode(protocol.ERROR, ["Bad request"]))
+                    break
+                payload = await reader.readexactly(length)
+                status, message = await loop.run_in_executor(
+                    self._executor, self.dispatch, kind, payload
+                )
+                if status == protocol.OK:
+                    if kind == protocol.SIGN:
+                        self.stats.signed += 1
+                    else:
+                        self.stats.verified += 1
+                elif status == protocol.FAILED:
+                    self.stats.failed += 1
+                else:
+                    self.stats.errors += 1
+                writer.write(protocol.encode(status, [message]))
+                await writer.drain()
+        except (OSError, asyncio.IncompleteReadError) as e:
+            logger.debug(f"Daemon connection failed: {e}")
+        finally:
+            writer.close()
+
+    async def start(self) -> None:
+        """Listen on the socket, replacing a stale one."""
+        remove_stale_socket(self.socket_path)
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        # Owner-only from the moment it exists, rather than after a chmod
+        umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(
+                self._handle, path=str(self.socket_path)
+            )
+        finally:
+            os.umask(umask)
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop serving, remove the socket and persist the verify cache."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self.socket_path.unlink(missing_ok=True)
+        self._executor.shutdown(wait=False)
+        if self._cache is not None:
+            self._cache.save()
@@ -0,0 +1,103 @@
+"""Protocol and client of the ``pqc-lab serve`` signing daemon.
+
+Only the standard library is imported here, so ``sign --socket`` and
+``verify --socket`` start without pydantic or liboqs. Requests and replies
+are frames of a 6-byte header (version, kind, 4-byte big-endian payload
+length) and a payload of UTF-8 fields, each prefixed by its 2-byte length.
+A request's kind is its operation, a reply's kind is its status:
+
+``SIGN``    algorithm, private key, public key, input, signature, pre-hash,
+            chunk size -> message
+``VERIFY``  algorithm, public key, input, signature, ``cache``/``no-cache``
+            -> message
+
+Paths are absolute: the daemon reads the inputs and writes the signature
+itself, so only file names cross the socket.
+"""
+
+import os
+import socket
+import struct
+from collections.abc import Sequence
+
+VERSION = 1
+
+# Operations
+SIGN = 0x01
+VERIFY = 0x02
+
+# Statuses
+OK = 0x00
+FAILED = 0x01
+ERROR = 0x02
+
+MAX_PAYLOAD = 64 * 1024
+HEADER = struct.Struct(">BBI")
+_FIELD = struct.Struct(">H")
+_CONNECT_TIMEOUT = 5.0
+
+
+class DaemonError(Exception):
+    """The daemon is unreachable or sent a malformed reply."""
+
+
+def encode(kind: int, fields: Sequence[str]) -> bytes:
+    """One frame carrying ``fields``."""
+    parts: list[bytes] = []
+    for field in fields:
+        data = field.encode()
+        parts += (_FIELD.pack(len(data)), data)
+    payload = b"".join(parts)
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"Payload of {len(payload)} bytes too big")
+    return HEADER.pack(VERSION, kind, len(payload)) + payload
+
+
+def decode_fields(payload: bytes) -> list[str]:
+    """Split a frame payload into its fields."""
+    fields = []
+    offset = 0
+    while offset < len(payload):
+        if offset + _FIELD.size > len(payload):
+            raise ValueError("Truncated field length")
+        (length,) = _FIELD.unpack_from(payload, offset)
+        offset += _FIELD.size
+        if offset + length > len(payload):
+            raise ValueError("Truncated field")
+        fields.append(payload[offset : offset + length].decode())
+        offset += length
+    return fields
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    while view:
+        n = sock.recv_into(view)
+        if not n:
+            raise DaemonError("Daemon closed the connection")
+        view = view[n:]
+    return bytes(buffer)
+
+
+def request(socket_path: str, kind: int, fields: Sequence[str]) -> tuple[int, str]:
+    """Send one request and wait for its ``(status, message)`` reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(_CONNECT_TIMEOUT)
+        try:
+            sock.connect(os.fspath(socket_path))
+        except OSError as e:
+            raise DaemonError(f"Cannot reach daemon at {socket_path}: {e}") from e
+        # Signing a large file takes as long as hashing it
+        sock.settimeout(None)
+        try:
+            sock.sendall(encode(kind, fields))
+            version, status, length = HEADER.unpack(_recv_exactly(sock, HEADER.size))
+            if version != VERSION or length > MAX_PAYLOAD:
+                raise DaemonError(f"Unexpected reply header {version}/{length}")
+            reply = decode_fields(_recv_exactly(sock, length))
+        except OSError as e:
+            raise DaemonError(f"Daemon connection failed: {e}") from e
+        except ValueError as e:
+            raise DaemonError(f"Malformed reply: {e}") from e
+    return status, reply[0] if reply else ""
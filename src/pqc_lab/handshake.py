@@ -0,0 +1,1136 @@
+"""ML-KEM handshake server and client for PQC Readiness Lab.
+
+Every message is a binary frame: a 7-byte header (version, message type,
+algorithm ID, 4-byte big-endian payload length) followed by the payload.
+The algorithm ID names the KEM the connection uses and must not change.
+
+1. client -> server  ``CLIENT_HELLO``     cipher ID (the algorithm ID selects)
+2. server -> client  ``SERVER_KEY``       ephemeral ML-KEM public key
+3. client -> server  ``CLIENT_KEY``       ciphertext encapsulated to that key
+4. server -> client  ``SERVER_FINISHED``  HMAC over the transcript
+5. server -> client  ``NEW_TICKET``       resumption ticket (optional)
+6. client -> server  ``DATA``...          application message, echoed back
+
+Both sides derive session keys from the shared secret with HKDF-SHA256
+bound to a hash of the transcript. The hybrid ``X25519-ML-KEM-768`` of
+:mod:`pqc_lab.hybrid` runs the same exchange with its concatenated keys and
+ciphertexts.
+
+Application data then travels in AEAD records (AES-256-GCM or
+ChaCha20-Poly1305, as the client's cipher ID chose): a message is a run of
+``DATA`` records closed by a ``DATA_END`` record, so it can be any size;
+see :class:`RecordChannel`.
+
+A client holding a ticket from an earlier session may open with ``RESUME``
+(cipher ID, a fresh nonce and the ticket) instead of ``CLIENT_HELLO``. The server
+answers ``SERVER_RESUMED`` (its nonce plus a finished tag), and keys are
+derived from the ticket's resumption secret, so no encaps/decaps runs. An
+expired, replayed or unreadable ticket gets ``RESUME_REJECTED`` and the
+client continues with a full handshake on the same connection. Tickets are
+single-use: every session, resumed or not, is issued a new one.
+
+The server runs on asyncio and pushes native keypair/decaps calls to a
+bounded thread pool (ctypes releases the GIL), so the event loop never
+blocks on crypto. Ephemeral keypairs are pre-generated into a
+:class:`KeypairPool` so keygen stays off the request path. With a
+``metrics_port`` configured, the server also serves its counters and the
+native call metrics of :mod:`pqc_lab.metrics` over HTTP.
+"""
+
+import asyncio
+import hashlib
+import heapq
+import hmac
+import logging
+import os
+import struct
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, NamedTuple, TypeVar, cast
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from . import config, hybrid, keys, lib, metrics
+
+logger = logging.getLogger(__name__)
+
+# Message types
+CLIENT_HELLO = 0x01
+SERVER_KEY = 0x02
+CLIENT_KEY = 0x03
+SERVER_FINISHED = 0x04
+DATA = 0x05
+RESUME = 0x06
+SERVER_RESUMED = 0x07
+RESUME_REJECTED = 0x08
+NEW_TICKET = 0x09
+DATA_END = 0x0A
+ERROR = 0x7F
+
+WIRE_VERSION = 1
+MAX_FRAME_SIZE = 64 * 1024
+# version, message type, algorithm ID, payload length
+_HEADER = struct.Struct(">BBBI")
+
+# Wire identifiers of the KEM algorithms; 0 means none (e.g. early errors)
+ALGORITHM_IDS = {
+    "ML-KEM-512": 1,
+    "ML-KEM-768": 2,
+    "ML-KEM-1024": 3,
+    "X25519-ML-KEM-768": 4,
+}
+
+# Wire identifiers of the record ciphers
+CIPHER_IDS = {"aes-256-gcm": 1, "chacha20-poly1305": 2}
+
+_KDF_INFO = b"pqc-lab handshake v1"
+_NONCE_SIZE = 32
+TICKET_LABEL = "PQC-LAB SESSION TICKET"
+
+_T = TypeVar("_T")
+
+
+class HandshakeError(Exception):
+    """Exception raised when a handshake fails or the peer misbehaves."""
+
+
+# Framing
+def algorithm_id(algorithm: str) -> int:
+    """Wire identifier of a KEM algorithm."""
+    try:
+        return ALGORITHM_IDS[lib.resolve_algorithm(algorithm)]
+    except KeyError:
+        raise HandshakeError(f"No wire identifier for {algorithm}") from None
+
+
+class Frame(NamedTuple):
+    """One received message."""
+
+    kind: int
+    algorithm_id: int
+    payload: bytes
+
+
+class FrameConnection(asyncio.BufferedProtocol):
+    """Framed connection that receives straight into a reusable buffer.
+
+    The event loop ``recv_into``s the free tail of one buffer sized from
+    ``NetworkConfig.buffer_size``; headers are parsed in place through a
+    memoryview and each payload is copied out exactly once. A partial frame
+    is moved to the front only when the tail runs out, and the buffer grows
+    (up to one maximum-size frame) only for frames that do not fit.
+    """
+
+    # Parsed frames held before reading from the socket is paused
+    _MAX_QUEUED = 16
+
+    def __init__(
+        self,
+        buffer_size: int = 4096,
+        on_connect: Callable[["FrameConnection"], Coroutine[Any, Any, None]]
+        | None = None,
+        algorithm_id: int = 0,
+    ) -> None:
+        self.algorithm_id = algorithm_id
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.transport: asyncio.Transport | None = None
+        self._buffer_size = max(buffer_size, _HEADER.size)
+        self._view = memoryview(bytearray(self._buffer_size))
+        self._start = self._end = 0
+        self._needed = _HEADER.size
+        self._frames: deque[Frame] = deque()
+        self._waiter: asyncio.Future[None] | None = None
+        self._error: Exception | None = None
+        self._closed = False
+        self._reading_paused = False
+        self._write_ready = asyncio.Event()
+        self._write_ready.set()
+        self._on_connect = on_connect
+        self._task: asyncio.Task[None] | None = None
+
+    # asyncio protocol callbacks
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = cast(asyncio.Transport, transport)
+        if self._on_connect is not None:
+            self._task = asyncio.get_running_loop().create_task(self._on_connect(self))
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._closed = True
+        if exc is not None and self._error is None:
+            self._error = exc
+        self._write_ready.set()
+        self._wake()
+
+    def pause_writing(self) -> None:
+        self._write_ready.clear()
+
+    def resume_writing(self) -> None:
+        self._write_ready.set()
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        """Free space after the unparsed bytes, making room for the next frame."""
+        if self._end == len(self._view) or self._start + self._needed > len(self._view):
+            self._compact()
+        return self._view[self._end :]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        """Parse every complete frame now in the buffer."""
+        self._end += nbytes
+        self.bytes_received += nbytes
+        view = self._view
+        while self._end - self._start >= _HEADER.size:
+            version, kind, alg, length = _HEADER.unpack_from(view, self._start)
+            if version != WIRE_VERSION:
+                return self._fail(HandshakeError(f"Unsupported version {version}"))
+            if length > MAX_FRAME_SIZE:
+                return self._fail(HandshakeError(f"Frame of {length} bytes too big"))
+            frame_end = self._start + _HEADER.size + length
+            if frame_end > self._end:
+                self._needed = _HEADER.size + length
+                break
+            payload = bytes(view[self._start + _HEADER.size : frame_end])
+            self._frames.append(Frame(kind, alg, payload))
+            self._start = frame_end
+        else:
+            self._needed = _HEADER.size
+
+        if self._start == self._end:
+            self._start = self._end = 0
+            if len(self._view) > self._buffer_size:
+                self._view = memoryview(bytearray(self._buffer_size))
+        if len(self._frames) >= self._MAX_QUEUED and self.transport is not None:
+            self.transport.pause_reading()
+            self._reading_paused = True
+        self._wake()
+
+    def eof_received(self) -> bool | None:
+        return None
+
+    # Internals
+    def _compact(self) -> None:
+        """Move the partial frame to the front, growing only if it cannot fit."""
+        pending = self._end - self._start
+        if self._needed > len(self._view):
+            view = memoryview(bytearray(self._needed))
+            view[:pending] = self._view[self._start : self._end]
+            self._view = view
+        elif self._start:
+            self._view[:pending] = self._view[self._start : self._end]
+        self._start, self._end = 0, pending
+
+    def _fail(self, error: Exception) -> None:
+        self._error = error
+        if self.transport is not None:
+            self.transport.close()
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    # Public API
+    async def read_frame(self, timeout: float | None = None) -> Frame:
+        """Next received frame, waiting up to ``timeout`` seconds for one."""
+        while not self._frames:
+            if self._error is not None:
+                raise self._error
+            if self._closed:
+                raise asyncio.IncompleteReadError(b"", None)
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await asyncio.wait_for(self._waiter, timeout)
+            finally:
+                self._waiter = None
+        frame = self._frames.popleft()
+        if self._reading_paused and len(self._frames) < self._MAX_QUEUED // 2:
+            assert self.transport is not None
+            self.transport.resume_reading()
+            self._reading_paused = False
+        return frame
+
+    async def expect(self, kind: int) -> bytes:
+        """Payload of the next frame, which must be ``kind`` on our algorithm."""
+        frame = await self.read_frame()
+        if frame.kind == ERROR:
+            raise HandshakeError(
+                f"Peer error: {frame.payload.decode(errors='replace')}"
+            )
+        if frame.kind != kind:
+            raise HandshakeError(f"Expected message {kind:#x}, got {frame.kind:#x}")
+        if frame.algorithm_id != self.algorithm_id:
+            raise HandshakeError(f"Unexpected algorithm ID {frame.algorithm_id}")
+        return frame.payload
+
+    def write_frame(self, kind: int, payload: bytes = b"") -> int:
+        """Queue one frame for sending, returning its size on the wire."""
+        if self.transport is None or self.transport.is_closing():
+            raise ConnectionResetError("Connection closed")
+        header = _HEADER.pack(WIRE_VERSION, kind, self.algorithm_id, len(payload))
+        # writelines lets transports with sendmsg skip joining the two parts
+        self.transport.writelines((header, payload))
+        self.bytes_sent += len(header) + len(payload)
+        return len(header) + len(payload)
+
+    async def drain(self) -> None:
+        """Wait until the transport accepts more data."""
+        await self._write_ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self.transport is not None:
+            self.transport.close()
+
+
+# Key schedule
+@dataclass
+class SessionKeys:
+    """Keys derived from a KEM shared secret."""
+
+    client_key: bytes
+    server_key: bytes
+    resumption_secret: bytes
+    transcript_hash: bytes
+
+    def server_finished(self) -> bytes:
+        """Tag proving the server derived the same keys."""
+        return hmac.new(
+            self.server_key, b"server finished" + self.transcript_hash, "sha256"
+        ).digest()
+
+
+def transcript_hash(algorithm: str, *parts: bytes) -> bytes:
+    """Hash binding the algorithm and the handshake messages, length-prefixed."""
+    h = hashlib.sha256()
+    for part in (algorithm.encode(), *parts):
+        h.update(struct.pack(">I", len(part)))
+        h.update(part)
+    return h.digest()
+
+
+def derive_keys(shared_secret: bytes, transcript: bytes) -> SessionKeys:
+    """Derive directional session keys and a resumption secret with HKDF-SHA256."""
+    okm = HKDF(
+        algorithm=hashes.SHA256(), length=96, salt=None, info=_KDF_INFO + transcript
+    ).derive(shared_secret)
+    return SessionKeys(okm[:32], okm[32:64], okm[64:], transcript)
+
+
+def resumption_transcript(
+    algorithm: str, ticket: bytes, client_nonce: bytes, server_nonce: bytes
+) -> bytes:
+    """Transcript hash for a resumed session."""
+    return transcript_hash(algorithm, b"resume", ticket, client_nonce, server_nonce)
+
+
+# Record layer
+_TRAFFIC_INFO = b"pqc-lab traffic v1"
+_TAG_SIZE = 16
+_IV_SIZE = 12
+# Wire bytes each record adds to its content: frame header and AEAD tag
+RECORD_OVERHEAD = _HEADER.size + _TAG_SIZE
+MAX_RECORD_SIZE = MAX_FRAME_SIZE - _TAG_SIZE
+_AEADS: dict[str, Callable[[bytes], AESGCM | ChaCha20Poly1305]] = {
+    "aes-256-gcm": AESGCM,
+    "chacha20-poly1305": ChaCha20Poly1305,
+}
+# decrypt_into (cryptography 45+) lets records reuse one plaintext buffer
+_DECRYPT_INTO = hasattr(AESGCM, "decrypt_into")
+
+
+def cipher_id(cipher: str) -> int:
+    """Wire identifier of a record cipher."""
+    try:
+        return CIPHER_IDS[cipher]
+    except KeyError:
+        raise HandshakeError(f"Unknown cipher {cipher}") from None
+
+
+def _split_cipher(payload: bytes) -> tuple[str, bytes]:
+    """Cipher named by the first byte of an opening message, and the rest."""
+    for cipher, ident in CIPHER_IDS.items():
+        if payload[:1] == bytes((ident,)):
+            return cipher, payload[1:]
+    raise HandshakeError(f"Unsupported cipher ID {payload[:1].hex() or 'missing'}")
+
+
+class RecordProtection:
+    """One direction of the record layer: a traffic key and its nonce counter.
+
+    As in TLS 1.3, each nonce is the traffic IV XORed with the record's
+    sequence number, and the record's frame header is its associated data.
+    """
+
+    def __init__(
+        self, cipher: str, secret: bytes, transcript: bytes, direction: bytes
+    ) -> None:
+        okm = HKDF(
+            algorithm=hashes.SHA256(),
+            length=32 + _IV_SIZE,
+            salt=None,
+            info=_TRAFFIC_INFO + cipher.encode() + direction + transcript,
+        ).derive(secret)
+        self._aead = _AEADS[cipher](okm[:32])
+        self._iv = int.from_bytes(okm[32:], "big")
+        self._plaintext = bytearray(MAX_RECORD_SIZE) if _DECRYPT_INTO else None
+        self.sequence = 0
+
+    def _nonce(self) -> bytes:
+        nonce = (self._iv ^ self.sequence).to_bytes(_IV_SIZE, "big")
+        self.sequence += 1
+        return nonce
+
+    def seal(self, header: bytes, content: bytes | memoryview) -> bytes:
+        """Encrypt the next record."""
+        return self._aead.encrypt(self._nonce(), content, header)
+
+    def open(self, header: bytes, payload: bytes) -> bytes | memoryview:
+        """Decrypt the next record; a view is only valid until the next call."""
+        try:
+            if self._plaintext is None:
+                return self._aead.decrypt(self._nonce(), payload, header)
+            out = memoryview(self._plaintext)[: len(payload) - _TAG_SIZE]
+            self._aead.decrypt_into(self._nonce(), payload, header, out)
+            return out
+        except (InvalidTag, ValueError) as e:
+            raise HandshakeError("Record authentication failed") from e
+
+
+class RecordChannel:
+    """Messages over AEAD records on a connection that completed a handshake.
+
+    ``send`` splits a message into ``DATA`` records of at most
+    ``record_size`` bytes and marks the last as ``DATA_END``; each direction
+    has its own traffic key derived from the session keys, the transcript
+    and the cipher name.
+    """
+
+    def __init__(
+        self,
+        conn: FrameConnection,
+        session_keys: SessionKeys,
+        cipher: str,
+        server: bool = False,
+        record_size: int = 16 * 1024,
+    ) -> None:
+        if not 0 < record_size <= MAX_RECORD_SIZE:
+            raise ValueError(f"Record size must be 1 to {MAX_RECORD_SIZE} bytes")
+        self.conn = conn
+        self.cipher = cipher
+        self.record_size = record_size
+        transcript = session_keys.transcript_hash
+        client = RecordProtection(
+            cipher, session_keys.client_key, transcript, b"client"
+        )
+        server_side = RecordProtection(
+            cipher, session_keys.server_key, transcript, b"server"
+        )
+        self._out, self._in = (server_side, client) if server else (client, server_side)
+        self.payload_sent = 0
+        self.payload_received = 0
+
+    @property
+    def records_sent(self) -> int:
+        return self._out.sequence
+
+    def _header(self, kind: int, length: int) -> bytes:
+        return _HEADER.pack(WIRE_VERSION, kind, self.conn.algorithm_id, length)
+
+    def write_record(self, content: bytes | memoryview, last: bool) -> int:
+        """Queue one record, returning its size on the wire."""
+        kind = DATA_END if last else DATA
+        header = self._header(kind, len(content) + _TAG_SIZE)
+        self.payload_sent += len(content)
+        return self.conn.write_frame(kind, self._out.seal(header, content))
+
+    def open(self, frame: Frame) -> tuple[bytes | memoryview, bool]:
+        """Decrypt a received record: its content and whether it ends the message."""
+        if frame.kind not in (DATA, DATA_END):
+            raise HandshakeError(f"Expected a data record, got {frame.kind:#x}")
+        if frame.algorithm_id != self.conn.algorithm_id:
+            raise HandshakeError(f"Unexpected algorithm ID {frame.algorithm_id}")
+        header = self._header(frame.kind, len(frame.payload))
+        content = self._in.open(header, frame.payload)
+        self.payload_received += len(content)
+        return content, frame.kind == DATA_END
+
+    async def read_record(
+        self, timeout: float | None = None
+    ) -> tuple[bytes | memoryview, bool]:
+        """Next record's content and whether it ends the message."""
+        frame = await self.conn.read_frame(timeout)
+        if frame.kind == ERROR:
+            raise HandshakeError(
+                f"Peer error: {frame.payload.decode(errors='replace')}"
+            )
+        return self.open(frame)
+
+    async def send(self, data: bytes, size: int | None = None) -> None:
+        """Send a message of ``size`` bytes (default ``len(data)``).
+
+        A ``size`` beyond ``len(data)`` repeats ``data``, so throughput runs
+        can stream any amount from one buffer.
+        """
+        view = memoryview(data)
+        remaining = len(view) if size is None else size
+        if remaining and not view:
+            raise ValueError("Cannot send a non-empty message from empty data")
+        offset = 0
+        while True:
+            n = min(self.record_size, remaining, len(view) - offset)
+            self.write_record(view[offset : offset + n], last=n == remaining)
+            remaining -= n
+            offset = (offset + n) % len(view) if view else 0
+            await self.conn.drain()
+            if not remaining:
+                return
+
+    async def receive(self, timeout: float | None = None) -> bytes:
+        """Receive one whole message."""
+        parts = []
+        while True:
+            content, last = await self.read_record(timeout)
+            parts.append(bytes(content))
+            if last:
+                return b"".join(parts)
+
+
+# Session tickets
+_TICKET_KEY_ID = struct.Struct(">I")
+_TICKET_BODY = struct.Struct(">QB")
+_TICKET_NONCE_SIZE = 12
+
+
+class TicketStore:
+    """Server-side ticket keys and replay cache, both bounded.
+
+    Tickets are AES-256-GCM sealed ``(issued_at, algorithm, secret)`` under
+    a ticket key that rotates every ``lifetime`` seconds. Only the current
+    and previous keys are kept, which is enough to open any unexpired
+    ticket. Redeemed tickets are remembered until they expire; when the
+    replay cache is full of live entries, resumption is refused rather
+    than risk accepting a replay.
+    """
+
+    def __init__(
+        self,
+        lifetime: float,
+        max_replay_entries: int,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.lifetime = lifetime
+        self.max_replay_entries = max_replay_entries
+        self.clock = clock
+        self._keys: OrderedDict[int, tuple[AESGCM, float]] = OrderedDict()
+        self._next_key_id = int.from_bytes(os.urandom(4), "big")
+        # Redeemed ticket digests, and a heap of them by expiry for pruning
+        self._redeemed: set[bytes] = set()
+        self._expiries: list[tuple[float, bytes]] = []
+
+    def _current_key(self) -> tuple[int, AESGCM]:
+        """The newest ticket key, rotating it once it is a lifetime old."""
+        now = self.clock()
+        if self._keys:
+            key_id, (aead, created) = next(reversed(self._keys.items()))
+            if now - created < self.lifetime:
+                return key_id, aead
+        key_id = self._next_key_id
+        self._next_key_id = (self._next_key_id + 1) & 0xFFFFFFFF
+        self._keys[key_id] = (AESGCM(AESGCM.generate_key(bit_length=256)), now)
+        while len(self._keys) > 2:
+            self._keys.popitem(last=False)
+        return key_id, self._keys[key_id][0]
+
+    def issue(self, algorithm: str, secret: bytes) -> bytes:
+        """Seal a resumption secret into a new ticket."""
+        key_id, aead = self._current_key()
+        header = _TICKET_KEY_ID.pack(key_id)
+        nonce = os.urandom(_TICKET_NONCE_SIZE)
+        body = (
+            _TICKET_BODY.pack(int(self.clock()), len(algorithm))
+            + algorithm.encode()
+            + secret
+        )
+        return header + nonce + aead.encrypt(nonce, body, header)
+
+    def redeem(self, algorithm: str, ticket: bytes) -> bytes | None:
+        """Resumption secret of a valid, unexpired, unused ticket, else ``None``."""
+        offset = _TICKET_KEY_ID.size + _TICKET_NONCE_SIZE
+        if len(ticket) <= offset:
+            return None
+        (key_id,) = _TICKET_KEY_ID.unpack_from(ticket)
+        entry = self._keys.get(key_id)
+        if entry is None:
+            return None
+        try:
+            body = entry[0].decrypt(
+                ticket[_TICKET_KEY_ID.size : offset],
+                ticket[offset:],
+                ticket[: _TICKET_KEY_ID.size],
+            )
+        except InvalidTag:
+            return None
+
+        issued, alg_len = _TICKET_BODY.unpack_from(body)
+        start = _TICKET_BODY.size
+        expires = issued + self.lifetime
+        now = self.clock()
+        if body[start : start + alg_len] != algorithm.encode() or now >= expires:
+            return None
+
+        digest = hashlib.sha256(ticket).digest()
+        # Tickets are redeemed in any order, so prune by expiry, not arrival
+        while self._expiries and self._expiries[0][0] <= now:
+            self._redeemed.discard(heapq.heappop(self._expiries)[1])
+        if digest in self._redeemed or len(self._redeemed) >= self.max_replay_entries:
+            return None
+        self._redeemed.add(digest)
+        heapq.heappush(self._expiries, (expires, digest))
+        return body[start + alg_len :]
+
+
+# Server
+class KeypairPool:
+    """Bounded pool of ready ephemeral keypairs, refilled in the background.
+
+    Each keypair is handed out once and dropped. When the pool falls to
+    ``low_water`` a refill task tops it back up to ``size`` in small batches
+    on ``executor``; an empty pool falls back to generating inline.
+    """
+
+    _BATCH = 8
+
+    def __init__(
+        self,
+        algorithm: str,
+        size: int,
+        low_water: int,
+        executor: Executor | None = None,
+    ) -> None:
+        self.algorithm = lib.resolve_algorithm(algorithm)
+        self.size = size
+        self.low_water = min(low_water, size)
+        self.executor = executor
+        self.hits = 0
+        self.misses = 0
+        self._kem = hybrid.new_kem(self.algorithm)
+        self._ready: deque[tuple[bytes, bytes]] = deque()
+        self._refill: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._ready)
+
+    async def fill(self) -> None:
+        """Generate keypairs until the pool is full."""
+        loop = asyncio.get_running_loop()
+        pk_len, sk_len = self._kem.length_public_key, self._kem.length_secret_key
+        while len(self._ready) < self.size:
+            count = min(self._BATCH, self.size - len(self._ready))
+            public_keys, secret_keys = await loop.run_in_executor(
+                self.executor, hybrid.keypair_batch, self.algorithm, count
+            )
+            for i in range(count):
+                self._ready.append(
+                    (
+                        bytes(public_keys[i * pk_len : (i + 1) * pk_len]),
+                        bytes(secret_keys[i * sk_len : (i + 1) * sk_len]),
+                    )
+                )
+
+    async def _background_fill(self) -> None:
+        try:
+            await self.fill()
+        except lib.LibOQSError as e:
+            logger.warning(f"Keypair pool refill failed: {e}")
+        finally:
+            self._refill = None
+
+    async def take(self) -> tuple[bytes, bytes]:
+        """Remove and return one ``(public_key, secret_key)`` pair."""
+        if self._ready:
+            self.hits += 1
+            keypair = self._ready.popleft()
+        else:
+            self.misses += 1
+            loop = asyncio.get_running_loop()
+            keypair = await loop.run_in_executor(self.executor, self._kem.keypair)
+        if len(self._ready) <= self.low_water and self._refill is None:
+            self._refill = asyncio.create_task(self._background_fill())
+        return keypair
+
+    async def close(self) -> None:
+        """Stop refilling and drop every unused keypair."""
+        if self._refill is not None:
+            self._refill.cancel()
+            try:
+                await self._refill
+            except asyncio.CancelledError:
+                pass
+        self._ready.clear()
+
+
+@dataclass
+class ServerStats:
+    """Counters for a running handshake server."""
+
+    accepted: int = 0
+    rejected: int = 0
+    completed: int = 0
+    failed: int = 0
+    timed_out: int = 0
+    active: int = 0
+    resumed: int = 0
+    resume_rejected: int = 0
+    data_bytes: int = 0
+
+
+class HandshakeServer:
+    """asyncio handshake server with bounded native crypto concurrency."""
+
+    def __init__(
+        self,
+        algorithm: str,
+        host: str | None = None,
+        port: int | None = None,
+        network: config.NetworkConfig | None = None,
+    ) -> None:
+        self.network = network or config.get_network_config()
+        self.algorithm = lib.resolve_algorithm(algorithm)
+        self.algorithm_id = algorithm_id(self.algorithm)
+        self.host = host or self.network.default_host
+        self.port = self.network.default_port if port is None else port
+        self.kem = hybrid.new_kem(self.algorithm)
+        self.stats = ServerStats()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.network.crypto_workers, thread_name_prefix="pqc-kem"
+        )
+        self.pool: KeypairPool | None = None
+        if self.network.keypair_pool_size > 0:
+            self.pool = KeypairPool(
+                self.algorithm,
+                self.network.keypair_pool_size,
+                self.network.keypair_pool_low_water,
+                self._executor,
+            )
+        self.tickets: TicketStore | None = None
+        if self.network.ticket_lifetime > 0:
+            self.tickets = TicketStore(
+                self.network.ticket_lifetime, self.network.ticket_replay_cache
+            )
+        self.metrics_port = self.network.metrics_port
+        self._crypto_slots: asyncio.Semaphore | None = None
+        self._server: asyncio.Server | None = None
+        self._metrics_server: asyncio.Server | None = None
+
+    async def _run_crypto(self, func: Callable[..., _T], *args: object) -> _T:
+        """Run a native call on the thread pool, waiting for a free slot.
+
+        The semaphore caps queued work so a connection burst turns into
+        waiting coroutines rather than an unbounded executor queue.
+        """
+        assert self._crypto_slots is not None
+        async with self._crypto_slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def _full_handshake(self, conn: FrameConnection) -> SessionKeys:
+        """Run the ML-KEM exchange after a ``CLIENT_HELLO``."""
+        if self.pool is not None:
+            public_key, secret_key = await self.pool.take()
+        else:
+            public_key, secret_key = await self._run_crypto(self.kem.keypair)
+        conn.write_frame(SERVER_KEY, public_key)
+        await conn.drain()
+
+        ciphertext = await conn.expect(CLIENT_KEY)
+        if len(ciphertext) != self.kem.length_ciphertext:
+            raise HandshakeError("Invalid ciphertext length")
+        shared_secret = await self._run_crypto(self.kem.decaps, ciphertext, secret_key)
+
+        session_keys = derive_keys(
+            shared_secret, transcript_hash(self.algorithm, public_key, ciphertext)
+        )
+        conn.write_frame(SERVER_FINISHED, session_keys.server_finished())
+        return session_keys
+
+    def _resume(self, conn: FrameConnection, payload: bytes) -> SessionKeys | None:
+        """Accept a ``RESUME`` if its ticket is good; ``None`` to fall back."""
+        client_nonce, ticket = payload[:_NONCE_SIZE], payload[_NONCE_SIZE:]
+        secret = None
+        if self.tickets is not None and len(client_nonce) == _NONCE_SIZE:
+            secret = self.tickets.redeem(self.algorithm, ticket)
+        if secret is None:
+            self.stats.resume_rejected += 1
+            conn.write_frame(RESUME_REJECTED)
+            return None
+
+        server_nonce = os.urandom(_NONCE_SIZE)
+        session_keys = derive_keys(
+            secret,
+            resumption_transcript(self.algorithm, ticket, client_nonce, server_nonce),
+        )
+        conn.write_frame(SERVER_RESUMED, server_nonce + session_keys.server_finished())
+        self.stats.resumed += 1
+        return session_keys
+
+    async def _handshake(self, conn: FrameConnection) -> RecordChannel:
+        """Run the server side of one handshake, up to the application data."""
+        frame = await conn.read_frame()
+        if frame.algorithm_id != self.algorithm_id:
+            conn.write_frame(ERROR, f"Server only offers {self.algorithm}".encode())
+            await conn.drain()
+            raise HandshakeError(f"Client requested algorithm ID {frame.algorithm_id}")
+
+        session_keys = None
+        if frame.kind == RESUME:
+            cipher, payload = _split_cipher(frame.payload)
+            session_keys = self._resume(conn, payload)
+            if session_keys is None:
+                await conn.drain()
+                cipher, _ = _split_cipher(await conn.expect(CLIENT_HELLO))
+        elif frame.kind == CLIENT_HELLO:
+            cipher, _ = _split_cipher(frame.payload)
+        else:
+            raise HandshakeError(f"Unexpected opening message {frame.kind:#x}")
+        if session_keys is None:
+            session_keys = await self._full_handshake(conn)
+
+        if self.tickets is not None:
+            ticket = self.tickets.issue(self.algorithm, session_keys.resumption_secret)
+            lifetime = struct.pack(">I", int(self.network.ticket_lifetime))
+            conn.write_frame(NEW_TICKET, lifetime + ticket)
+        await conn.drain()
+        return RecordChannel(conn, session_keys, cipher, server=True)
+
+    async def _echo(self, channel: RecordChannel) -> None:
+        """Echo one message back record by record, however large it is.
+
+        The network timeout applies to each record rather than the whole
+        message, so long transfers only fail when the peer stalls.
+        """
+        last = False
+        while not last:
+            content, last = await channel.read_record(self.network.timeout)
+            channel.write_record(content, last)
+            await channel.conn.drain()
+        self.stats.data_bytes += channel.payload_received
+
+    async def handle(self, conn: FrameConnection) -> None:
+        """Connection callback: enforce limits and the network timeout."""
+        assert conn.transport is not None
+        peer = conn.transport.get_extra_info("peername")
+        if self.stats.active >= self.network.max_connections:
+            self.stats.rejected += 1
+            conn.write_frame(ERROR, b"Server busy")
+            conn.close()
+            return
+
+        self.stats.accepted += 1
+        self.stats.active += 1
+        try:
+            channel = await asyncio.wait_for(
+                self._handshake(conn), self.network.timeout
+            )
+            await self._echo(channel)
+            self.stats.completed += 1
+        except asyncio.TimeoutError:
+            self.stats.timed_out += 1
+            logger.debug(f"Handshake with {peer} timed out")
+        except (HandshakeError, lib.LibOQSError, OSError, EOFError) as e:
+            self.stats.failed += 1
+            logger.debug(f"Handshake with {peer} failed: {e}")
+        finally:
+            self.stats.active -= 1
+            conn.close()
+
+    def counters(self) -> dict[str, float]:
+        """Server and keypair pool totals exported with the native metrics."""
+        counters: dict[str, float] = {
+            f"handshake_{name}": value for name, value in vars(self.stats).items()
+        }
+        if self.pool is not None:
+            counters["keypair_pool_hits"] = self.pool.hits
+            counters["keypair_pool_misses"] = self.pool.misses
+            counters["keypair_pool_ready"] = len(self.pool)
+        return counters
+
+    def _connection(self) -> FrameConnection:
+        """Protocol factory for accepted connections."""
+        return FrameConnection(self.network.buffer_size, self.handle, self.algorithm_id)
+
+    async def start(self) -> None:
+        """Fill the keypair pool and start listening (and serving metrics)."""
+        self._crypto_slots = asyncio.Semaphore(self.network.max_pending_crypto)
+        if self.metrics_port is not None:
+            metrics.enable()
+            self._metrics_server = await metrics.start_http_server(
+                self.host, self.metrics_port, self.counters
+            )
+            self.metrics_port = self._metrics_server.sockets[0].getsockname()[1]
+        if self.pool is not None:
+            await self.pool.fill()
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            self._connection,
+            self.host,
+            self.port,
+            backlog=self.network.max_connections,
+        )
+        if self._server.sockets:
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Start (if needed) and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        assert self._server is not None
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop accepting connections and shut the crypto pool down."""
+        for server in (self._server, self._metrics_server):
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+        if self.pool is not None:
+            await self.pool.close()
+        self._executor.shutdown(wait=False)
+
+
+# Client
+@dataclass
+class SessionTicket:
+    """A resumption ticket held by the client, with its secret."""
+
+    algorithm: str
+    ticket: bytes
+    secret: bytes
+    expires: float
+
+    @property
+    def expired(self) -> bool:
+        """Whether the server will have stopped accepting the ticket."""
+        return time.time() >= self.expires
+
+    def dumps(self) -> str:
+        """Serialize to text armor; the payload is the secret then the ticket."""
+        headers = {"Algorithm": self.algorithm, "Expires": str(int(self.expires))}
+        return keys.armor(TICKET_LABEL, self.secret + self.ticket, headers)
+
+    @classmethod
+    def loads(cls, text: str) -> "SessionTicket":
+        """Parse a ticket file written by :meth:`dumps`."""
+        label, headers, data = keys.dearmor(text)
+        if label != TICKET_LABEL or len(data) <= 32:
+            raise keys.KeyFileError(f"Not a session ticket: {label}")
+        try:
+            return cls(
+                algorithm=headers["Algorithm"],
+                ticket=data[32:],
+                secret=data[:32],
+                expires=float(headers["Expires"]),
+            )
+        except (KeyError, ValueError) as e:
+            raise keys.KeyFileError(f"Invalid ticket header: {e}") from e
+
+
+@dataclass
+class HandshakeResult:
+    """Outcome and timings of one client handshake."""
+
+    algorithm: str
+    reply: bytes
+    connect_ns: int
+    handshake_ns: int
+    first_byte_ns: int
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    resumed: bool = False
+    cipher: str = ""
+    payload_bytes: int = 0
+    records: int = 0
+    transfer_ns: int = 0
+    keys: SessionKeys | None = field(default=None, repr=False)
+    ticket: SessionTicket | None = field(default=None, repr=False)
+
+    @property
+    def throughput(self) -> float:
+        """Application data echoed per second, in MB/s each way."""
+        return self.payload_bytes / self.transfer_ns * 1e3 if self.transfer_ns else 0.0
+
+
+async def run_client(
+    algorithm: str,
+    host: str | None = None,
+    port: int | None = None,
+    message: bytes = b"",
+    network: config.NetworkConfig | None = None,
+    ticket: SessionTicket | None = None,
+    cipher: str | None = None,
+    size: int | None = None,
+) -> HandshakeResult:
+    """Connect, run the handshake, send ``message`` and await its echo.
+
+    With a usable ``ticket`` the client tries resumption first and falls
+    back to a full handshake if the server rejects it. The result carries
+    the new ticket, if the server issued one.
+
+    The message goes out in ``cipher`` records (default from the network
+    configuration). With ``size`` it is repeated up to ``size`` bytes and
+    the echo is only counted, not kept: a throughput run, timed in
+    ``transfer_ns``. The network timeout bounds the handshake as a whole,
+    then each record of the transfer.
+    """
+    network = network or config.get_network_config()
+    host = host or network.default_host
+    port = network.default_port if port is None else port
+    algorithm = lib.resolve_algorithm(algorithm)
+    alg_id = algorithm_id(algorithm)
+    cipher = cipher or network.cipher
+    hello = bytes((cipher_id(cipher),))
+    kem = hybrid.new_kem(algorithm)
+    loop = asyncio.get_running_loop()
+    clock = time.perf_counter_ns
+    if ticket is not None and (ticket.algorithm != algorithm or ticket.expired):
+        ticket = None
+
+    async def exchange() -> HandshakeResult:
+        first_byte = 0
+
+        async def recv(timeout: float | None = None) -> Frame:
+            nonlocal first_byte
+            frame = await conn.read_frame(timeout)
+            first_byte = first_byte or clock()
+            if frame.kind == ERROR:
+                error = frame.payload.decode(errors="replace")
+                raise HandshakeError(f"Peer error: {error}")
+            if frame.algorithm_id != alg_id:
+                raise HandshakeError(f"Unexpected algorithm ID {frame.algorithm_id}")
+            return frame
+
+        async def expect(kind: int) -> bytes:
+            frame = await recv()
+            if frame.kind != kind:
+                raise HandshakeError(f"Expected message {kind:#x}, got {frame.kind:#x}")
+            return frame.payload
+
+        async def handshake() -> tuple[SessionKeys, bool]:
+            if ticket is not None:
+                client_nonce = os.urandom(_NONCE_SIZE)
+                conn.write_frame(RESUME, hello + client_nonce + ticket.ticket)
+                await conn.drain()
+                frame = await recv()
+                if frame.kind == SERVER_RESUMED:
+                    server_nonce = frame.payload[:_NONCE_SIZE]
+                    session_keys = derive_keys(
+                        ticket.secret,
+                        resumption_transcript(
+                            algorithm, ticket.ticket, client_nonce, server_nonce
+                        ),
+                    )
+                    finished = frame.payload[_NONCE_SIZE:]
+                    if not hmac.compare_digest(
+                        finished, session_keys.server_finished()
+                    ):
+                        raise HandshakeError("Server key confirmation failed")
+                    return session_keys, True
+                if frame.kind != RESUME_REJECTED:
+                    raise HandshakeError(f"Unexpected resumption reply {frame.kind:#x}")
+
+            conn.write_frame(CLIENT_HELLO, hello)
+            await conn.drain()
+            public_key = await expect(SERVER_KEY)
+            if len(public_key) != kem.length_public_key:
+                raise HandshakeError("Invalid public key length")
+
+            ciphertext, shared_secret = await loop.run_in_executor(
+                None, kem.encaps, public_key
+            )
+            conn.write_frame(CLIENT_KEY, ciphertext)
+            await conn.drain()
+            session_keys = derive_keys(
+                shared_secret, transcript_hash(algorithm, public_key, ciphertext)
+            )
+            finished = await expect(SERVER_FINISHED)
+            if not hmac.compare_digest(finished, session_keys.server_finished()):
+                raise HandshakeError("Server key confirmation failed")
+            return session_keys, False
+
+        start = clock()
+        _, conn = await asyncio.wait_for(
+            loop.create_connection(
+                lambda: FrameConnection(network.buffer_size, algorithm_id=alg_id),
+                host,
+                port,
+            ),
+            network.timeout,
+        )
+        connected = clock()
+        try:
+            session_keys, resumed = await asyncio.wait_for(handshake(), network.timeout)
+            handshaken = clock()
+
+            channel = RecordChannel(
+                conn, session_keys, cipher, record_size=network.record_size
+            )
+            # Send while reading the echo, or a large message deadlocks once
+            # both directions' socket buffers fill
+            sender = asyncio.ensure_future(channel.send(message, size))
+            try:
+                new_ticket = None
+                frame = await recv(network.timeout)
+                if frame.kind == NEW_TICKET and len(frame.payload) > 4:
+                    (lifetime,) = struct.unpack_from(">I", frame.payload)
+                    new_ticket = SessionTicket(
+                        algorithm,
+                        frame.payload[4:],
+                        session_keys.resumption_secret,
+                        time.time() + lifetime,
+                    )
+                    frame = await recv(network.timeout)
+                reply = bytearray()
+                content, last = channel.open(frame)
+                while True:
+                    if size is None:
+                        reply += content
+                    if last:
+                        break
+                    content, last = await channel.read_record(network.timeout)
+                transferred = clock()
+                await sender
+            finally:
+                sender.cancel()
+        finally:
+            conn.close()
+        return HandshakeResult(
+            algorithm=algorithm,
+            reply=bytes(reply),
+            connect_ns=connected - start,
+            handshake_ns=handshaken - connected,
+            first_byte_ns=first_byte - connected,
+            bytes_sent=conn.bytes_sent,
+            bytes_received=conn.bytes_received,
+            resumed=resumed,
+            cipher=cipher,
+            payload_bytes=channel.payload_received,
+            records=channel.records_sent,
+            transfer_ns=transferred - handshaken,
+            keys=session_keys,
+            ticket=new_ticket,
+        )
+
+    try:
+        return await exchange()
+    except asyncio.TimeoutError as e:
+        raise HandshakeError(f"Handshake timed out after {network.timeout}s") from e
+    except (OSError, asyncio.IncompleteReadError) as e:
+        raise HandshakeError(f"Connection failed: {e}") from e
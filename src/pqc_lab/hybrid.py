@@ -0,0 +1,202 @@
+"""Hybrid X25519 + ML-KEM key encapsulation for PQC Readiness Lab.
+
+``X25519-ML-KEM-768`` pairs an X25519 exchange from ``cryptography`` with
+ML-KEM-768 from liboqs, so a session stays secure while either one holds.
+Keys and ciphertexts are the ML-KEM value followed by the X25519 value (the
+order of the TLS ``X25519MLKEM768`` group); the secret key also carries the
+X25519 public key. Both shared secrets are combined X-Wing style::
+
+    SHA3-256(label || ss_mlkem || ss_x25519 || ct_x25519 || pk_x25519)
+
+binding the X25519 leg to its transcript (ML-KEM already binds its own).
+
+The two legs of every operation run at the same time: the ML-KEM call is
+handed to a small thread pool (ctypes releases the GIL while liboqs runs)
+while the calling thread does X25519, so hybrid latency tends towards the
+slower leg rather than the sum of both.
+"""
+
+import hashlib
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Protocol, TypeVar
+
+from cryptography.hazmat.primitives.asymmetric import x25519
+
+from . import lib
+
+_LABEL = b"pqc-lab hybrid v1"
+_X25519_SIZE = 32
+
+# Canonical hybrid name -> its ML-KEM leg
+HYBRID_ALGORITHMS = {"X25519-ML-KEM-768": "ML-KEM-768"}
+
+_P = TypeVar("_P")
+_C = TypeVar("_C")
+
+
+class KEMLike(Protocol):
+    """What the handshake and benchmarks need from a KEM."""
+
+    name: str
+    length_public_key: int
+    length_secret_key: int
+    length_ciphertext: int
+    length_shared_secret: int
+
+    def keypair(self) -> tuple[bytes, bytes]: ...
+
+    def encaps(self, public_key: bytes) -> tuple[bytes, bytes]: ...
+
+    def decaps(self, ciphertext: bytes, secret_key: bytes) -> bytes: ...
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _leg_executor() -> ThreadPoolExecutor:
+    """Shared pool running ML-KEM legs, created on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=max(4, os.cpu_count() or 1),
+                thread_name_prefix="pqc-hybrid",
+            )
+        return _executor
+
+
+def is_hybrid(algorithm: str) -> bool:
+    """Whether ``algorithm`` names a hybrid KEM."""
+    return lib.resolve_algorithm(algorithm) in HYBRID_ALGORITHMS
+
+
+def _x25519_public(data: bytes) -> x25519.X25519PublicKey:
+    try:
+        return x25519.X25519PublicKey.from_public_bytes(data)
+    except ValueError as e:
+        raise lib.LibOQSError(f"Invalid X25519 public key: {e}") from e
+
+
+def _exchange(key: x25519.X25519PrivateKey, peer: bytes) -> bytes:
+    """X25519 exchange, rejecting low-order peer points like liboqs errors."""
+    try:
+        return key.exchange(_x25519_public(peer))
+    except ValueError as e:
+        raise lib.LibOQSError(f"X25519 exchange failed: {e}") from e
+
+
+class HybridKEM:
+    """X25519 + ML-KEM with the same interface as :class:`lib.KEM`.
+
+    With ``concurrent`` (the default) the ML-KEM leg of each operation runs
+    on ``executor`` (a shared pool if not given) alongside X25519 in the
+    calling thread; otherwise the legs run one after the other.
+    """
+
+    def __init__(
+        self,
+        alg_name: str,
+        concurrent: bool = True,
+        executor: Executor | None = None,
+    ) -> None:
+        self.name = lib.resolve_algorithm(alg_name)
+        if self.name not in HYBRID_ALGORITHMS:
+            raise lib.LibOQSError(f"Unknown hybrid KEM: {alg_name}")
+        self.mlkem = lib.KEM(HYBRID_ALGORITHMS[self.name])
+        self.concurrent = concurrent
+        self._executor = executor
+        self.length_public_key = self.mlkem.length_public_key + _X25519_SIZE
+        self.length_secret_key = self.mlkem.length_secret_key + 2 * _X25519_SIZE
+        self.length_ciphertext = self.mlkem.length_ciphertext + _X25519_SIZE
+        self.length_shared_secret = 32
+
+    def _both(
+        self, pqc: Callable[[], _P], classical: Callable[[], _C]
+    ) -> tuple[_P, _C]:
+        """Run ``pqc`` on the leg pool while ``classical`` runs here."""
+        if not self.concurrent:
+            return pqc(), classical()
+        future = (self._executor or _leg_executor()).submit(pqc)
+        try:
+            ours = classical()
+        finally:
+            theirs = future.result()
+        return theirs, ours
+
+    def _combine(
+        self, ss_mlkem: bytes, ss_x25519: bytes, ct_x25519: bytes, pk_x25519: bytes
+    ) -> bytes:
+        return hashlib.sha3_256(
+            _LABEL + ss_mlkem + ss_x25519 + ct_x25519 + pk_x25519
+        ).digest()
+
+    def _check(self, data: bytes, length: int, what: str) -> None:
+        if len(data) != length:
+            raise lib.LibOQSError(
+                f"Invalid {what} length: expected {length}, got {len(data)}"
+            )
+
+    def keypair(self) -> tuple[bytes, bytes]:
+        """Generate a keypair, returning ``(public_key, secret_key)``."""
+
+        def classical() -> tuple[bytes, bytes]:
+            key = x25519.X25519PrivateKey.generate()
+            return key.private_bytes_raw(), key.public_key().public_bytes_raw()
+
+        (pk_m, sk_m), (sk_x, pk_x) = self._both(self.mlkem.keypair, classical)
+        return pk_m + pk_x, sk_m + sk_x + pk_x
+
+    def encaps(self, public_key: bytes) -> tuple[bytes, bytes]:
+        """Encapsulate to ``public_key``, returning ``(ciphertext, shared_secret)``."""
+        self._check(public_key, self.length_public_key, "public key")
+        split = self.mlkem.length_public_key
+        pk_m, pk_x = public_key[:split], public_key[split:]
+
+        def classical() -> tuple[bytes, bytes]:
+            ephemeral = x25519.X25519PrivateKey.generate()
+            return ephemeral.public_key().public_bytes_raw(), _exchange(ephemeral, pk_x)
+
+        (ct_m, ss_m), (ct_x, ss_x) = self._both(
+            lambda: self.mlkem.encaps(pk_m), classical
+        )
+        return ct_m + ct_x, self._combine(ss_m, ss_x, ct_x, pk_x)
+
+    def decaps(self, ciphertext: bytes, secret_key: bytes) -> bytes:
+        """Decapsulate ``ciphertext`` with ``secret_key``."""
+        self._check(ciphertext, self.length_ciphertext, "ciphertext")
+        self._check(secret_key, self.length_secret_key, "secret key")
+        ct_split, sk_split = self.mlkem.length_ciphertext, self.mlkem.length_secret_key
+        ct_m, ct_x = ciphertext[:ct_split], ciphertext[ct_split:]
+        sk_m = secret_key[:sk_split]
+        sk_x = secret_key[sk_split : sk_split + _X25519_SIZE]
+        pk_x = secret_key[sk_split + _X25519_SIZE :]
+
+        def classical() -> bytes:
+            return _exchange(x25519.X25519PrivateKey.from_private_bytes(sk_x), ct_x)
+
+        ss_m, ss_x = self._both(lambda: self.mlkem.decaps(ct_m, sk_m), classical)
+        return self._combine(ss_m, ss_x, ct_x, pk_x)
+
+
+def new_kem(algorithm: str) -> KEMLike:
+    """A :class:`lib.KEM` or, for hybrid names, a :class:`HybridKEM`."""
+    if is_hybrid(algorithm):
+        return HybridKEM(algorithm)
+    return lib.KEM(algorithm)
+
+
+def keypair_batch(algorithm: str, count: int) -> tuple[bytearray, bytearray]:
+    """Packed keypairs like :func:`lib.kem_keypair_batch`, hybrids included."""
+    if not is_hybrid(algorithm):
+        return lib.kem_keypair_batch(algorithm, count)
+    kem = HybridKEM(algorithm)
+    public_keys, secret_keys = bytearray(), bytearray()
+    for _ in range(count):
+        public_key, secret_key = kem.keypair()
+        public_keys += public_key
+        secret_keys += secret_key
+    return public_keys, secret_keys
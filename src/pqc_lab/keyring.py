@@ -0,0 +1,290 @@
+"""Binary key rings for bulk-generated keypairs.
+
+A key ring stores many keypairs in one file laid out to be memory-mapped,
+so any key is found by ID without parsing the rest of the file:
+
+- a fixed 32-byte header: magic, format version, section count, offset of
+  the index and total key count;
+- sections of fixed-size records, one per ``keygen`` run, each record being
+  the public key followed by the secret key;
+- the index, one 64-byte entry per section: algorithm, key lengths, first
+  key ID, key count and the offset of its records.
+
+Key IDs number keys from 0 across all sections. Appending writes the new
+records and a new index past the end of the file and only then rewrites the
+header, so an interrupted append leaves the previous key ring intact.
+Integers are little-endian.
+"""
+
+import bisect
+import mmap
+import os
+import sys
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from struct import Struct
+from typing import Protocol
+
+from typing_extensions import Self
+
+from . import lib
+
+if sys.platform != "win32":
+    import fcntl
+
+MAGIC = b"PQCKRING"
+VERSION = 1
+
+# magic, version, flags, section count, index offset, key count
+_HEADER = Struct("<8sHHIQQ")
+# algorithm, public key length, secret key length, first ID, count, offset
+_ENTRY = Struct("<32sIIQQQ")
+
+# Keypairs generated per task by each worker thread
+CHUNK_SIZE = 256
+
+
+class KeyringError(Exception):
+    """A key ring is malformed, or a key ID is not in it."""
+
+
+class KeyPairScheme(Protocol):
+    """What bulk generation needs from a :class:`lib.KEM` or :class:`lib.Signature`."""
+
+    name: str
+    length_public_key: int
+    length_secret_key: int
+
+    def keypair_into(
+        self, public_key_out: lib.Buffer, secret_key_out: lib.Buffer
+    ) -> None: ...
+
+
+@dataclass(frozen=True)
+class Section:
+    """A run of fixed-size records for one algorithm."""
+
+    algorithm: str
+    length_public_key: int
+    length_secret_key: int
+    first_id: int
+    count: int
+    offset: int
+
+    @property
+    def record_size(self) -> int:
+        return self.length_public_key + self.length_secret_key
+
+
+@dataclass(frozen=True)
+class Key:
+    """One keypair, viewed in place in a mapped key ring."""
+
+    id: int
+    algorithm: str
+    public_key: memoryview
+    secret_key: memoryview
+
+
+def _read_index(buf: mmap.mmap, path: Path) -> list[Section]:
+    """Parse and check the header and index of the key ring in ``buf``."""
+    size = len(buf)
+    if size < _HEADER.size:
+        raise KeyringError(f"{path}: not a key ring (file too short)")
+    magic, version, _, count, index_offset, key_count = _HEADER.unpack_from(buf)
+    if magic != MAGIC:
+        raise KeyringError(f"{path}: not a key ring")
+    if version != VERSION:
+        raise KeyringError(f"{path}: unsupported key ring version {version}")
+    if index_offset < _HEADER.size or index_offset + count * _ENTRY.size > size:
+        raise KeyringError(f"{path}: truncated key ring index")
+
+    sections = []
+    next_id = 0
+    for i in range(count):
+        fields = _ENTRY.unpack_from(buf, index_offset + i * _ENTRY.size)
+        try:
+            algorithm = fields[0].rstrip(b"\0").decode("ascii")
+        except UnicodeDecodeError as e:
+            raise KeyringError(f"{path}: bad algorithm name in section {i}") from e
+        section = Section(algorithm, *fields[1:])
+        end = section.offset + section.count * section.record_size
+        if section.first_id != next_id or not (
+            _HEADER.size <= section.offset <= end <= index_offset
+        ):
+            raise KeyringError(f"{path}: corrupt key ring section {i}")
+        sections.append(section)
+        next_id += section.count
+    if next_id != key_count:
+        raise KeyringError(f"{path}: key count does not match the index")
+    return sections
+
+
+class Keyring:
+    """A key ring mapped read-only, with keys looked up by ID.
+
+    Keys returned by :meth:`get` are views into the mapping; release them
+    (or copy what is needed) before :meth:`close`.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                raise KeyringError(f"{self.path}: not a key ring ({e})") from e
+        try:
+            self.sections = _read_index(self._map, self.path)
+        except KeyringError:
+            self._map.close()
+            raise
+        self._first_ids = [section.first_id for section in self.sections]
+
+    def __len__(self) -> int:
+        last = self.sections[-1] if self.sections else None
+        return last.first_id + last.count if last else 0
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def section(self, key_id: int) -> Section:
+        """The section holding key ``key_id``."""
+        index = bisect.bisect_right(self._first_ids, key_id) - 1
+        if key_id < 0 or index < 0:
+            raise KeyringError(f"No key {key_id} in {self.path}")
+        section = self.sections[index]
+        if key_id >= section.first_id + section.count:
+            raise KeyringError(f"No key {key_id} in {self.path}")
+        return section
+
+    def get(self, key_id: int) -> Key:
+        """Key ``key_id``, read in place from the mapping."""
+        section = self.section(key_id)
+        start = section.offset + (key_id - section.first_id) * section.record_size
+        split = start + section.length_public_key
+        view = memoryview(self._map)
+        return Key(
+            key_id,
+            section.algorithm,
+            view[start:split],
+            view[split : start + section.record_size],
+        )
+
+
+def _records(scheme: KeyPairScheme, count: int) -> bytearray:
+    """``count`` fresh keypairs as consecutive records."""
+    pk_len = scheme.length_public_key
+    record = pk_len + scheme.length_secret_key
+    records = bytearray(count * record)
+    view = memoryview(records)
+    for start in range(0, len(records), record):
+        scheme.keypair_into(
+            view[start : start + pk_len], view[start + pk_len : start + record]
+        )
+    return records
+
+
+def _generate(scheme: KeyPairScheme, count: int, workers: int) -> Iterator[bytearray]:
+    """Records of ``count`` keypairs, made on ``workers`` threads, in order.
+
+    liboqs runs without the GIL, so threads generate keys in parallel; at
+    most two chunks per worker are held in memory at once.
+    """
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="pqc-keygen"
+    ) as pool:
+        pending: deque[Future[bytearray]] = deque()
+        for start in range(0, count, CHUNK_SIZE):
+            size = min(CHUNK_SIZE, count - start)
+            pending.append(pool.submit(_records, scheme, size))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _lock(fd: int) -> None:
+    """Hold an exclusive lock on the key ring until ``fd`` is closed."""
+    if sys.platform != "win32":
+        fcntl.flock(fd, fcntl.LOCK_EX)
+
+
+def _pack_entry(section: Section) -> bytes:
+    name = section.algorithm.encode("ascii")
+    if len(name) > 32:
+        raise KeyringError(f"Algorithm name too long for a key ring: {name!r}")
+    return _ENTRY.pack(
+        name,
+        section.length_public_key,
+        section.length_secret_key,
+        section.first_id,
+        section.count,
+        section.offset,
+    )
+
+
+def append_keys(
+    path: str | Path,
+    scheme: KeyPairScheme,
+    count: int,
+    workers: int | None = None,
+) -> Section:
+    """Generate ``count`` keypairs into a new section of the key ring ``path``.
+
+    The key ring is created owner-only if it does not exist. Keys are made
+    on ``workers`` threads (default: CPU count). Concurrent appends, from
+    this or other processes, take turns on an exclusive lock. Returns the
+    new section.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    with os.fdopen(fd, "r+b") as f:
+        _lock(fd)
+        end = os.fstat(fd).st_size
+        if end:
+            with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as buf:
+                sections = _read_index(buf, path)
+        else:
+            sections = []
+            end = _HEADER.size
+            f.write(_HEADER.pack(MAGIC, VERSION, 0, 0, end, 0))
+        first_id = sections[-1].first_id + sections[-1].count if sections else 0
+        section = Section(
+            scheme.name,
+            scheme.length_public_key,
+            scheme.length_secret_key,
+            first_id,
+            count,
+            end,
+        )
+        index = b"".join(_pack_entry(s) for s in [*sections, section])
+
+        f.seek(end)
+        for records in _generate(scheme, count, workers or os.cpu_count() or 1):
+            f.write(records)
+        index_offset = f.tell()
+        f.write(index)
+        f.flush()
+        os.fsync(fd)
+        # Publish the new section only once its records and index are on disk
+        f.seek(0)
+        f.write(
+            _HEADER.pack(
+                MAGIC, VERSION, 0, len(sections) + 1, index_offset, first_id + count
+            )
+        )
+        f.flush()
+        os.fsync(fd)
+    return section
@@ -0,0 +1,84 @@
+"""Key file handling for PQC Readiness Lab.
+
+Keys are stored as PEM-style text armor labelled with the liboqs algorithm
+name, e.g. ``-----BEGIN ML-DSA-65 PUBLIC KEY-----``.
+"""
+
+import base64
+import os
+import textwrap
+from pathlib import Path
+
+from . import lib
+
+PUBLIC = "PUBLIC"
+PRIVATE = "PRIVATE"
+
+
+class KeyFileError(Exception):
+    """Exception raised for malformed or mismatched key files."""
+
+
+def armor(label: str, data: bytes, headers: dict[str, str] | None = None) -> str:
+    """Wrap ``data`` in base64 text armor with optional ``Key: value`` headers."""
+    lines = [f"-----BEGIN {label}-----"]
+    if headers:
+        lines += [f"{key}: {value}" for key, value in headers.items()] + [""]
+    lines += textwrap.wrap(base64.b64encode(data).decode("ascii"), 64)
+    lines.append(f"-----END {label}-----")
+    return "\n".join(lines) + "\n"
+
+
+def dearmor(text: str) -> tuple[str, dict[str, str], bytes]:
+    """Parse text armor into its label, headers and decoded payload."""
+    lines = [line.strip() for line in text.strip().splitlines()]
+    if len(lines) < 2 or not lines[0].startswith("-----BEGIN "):
+        raise KeyFileError("Missing armor header")
+    label = lines[0][len("-----BEGIN ") : -len("-----")]
+    if lines[-1] != f"-----END {label}-----":
+        raise KeyFileError(f"Missing armor footer for {label}")
+
+    body = lines[1:-1]
+    headers: dict[str, str] = {}
+    if "" in body:
+        split = body.index("")
+        for line in body[:split]:
+            key, _, value = line.partition(":")
+            headers[key.strip()] = value.strip()
+        body = body[split + 1 :]
+    try:
+        data = base64.b64decode("".join(body), validate=True)
+    except ValueError as e:
+        raise KeyFileError(f"Invalid base64 payload in {label}") from e
+    return label, headers, data
+
+
+def write_key(path: str | Path, algorithm: str, kind: str, key: bytes) -> None:
+    """Write a public or private key file; private keys are made owner-only."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    text = armor(f"{lib.resolve_algorithm(algorithm)} {kind} KEY", key)
+    if kind == PRIVATE:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            f.write(text)
+    else:
+        path.write_text(text)
+
+
+def read_key(path: str | Path, algorithm: str, kind: str) -> bytes:
+    """Read a key file, checking it holds a ``kind`` key for ``algorithm``."""
+    label, _, key = dearmor(Path(path).read_text())
+    expected = f"{lib.resolve_algorithm(algorithm)} {kind} KEY"
+    if label != expected:
+        raise KeyFileError(f"{path}: expected {expected}, found {label}")
+    return key
+
+
+def load_key(path: str | Path, kind: str) -> tuple[str, bytes]:
+    """Read a ``kind`` key file of any algorithm, returning ``(algorithm, key)``."""
+    label, _, key = dearmor(Path(path).read_text())
+    suffix = f" {kind} KEY"
+    if not label.endswith(suffix):
+        raise KeyFileError(f"{path}: expected a {kind.lower()} key, found {label}")
+    return label[: -len(suffix)], key
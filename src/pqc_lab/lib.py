@@ -5,16 +5,23 @@ for Post-Quantum Cryptography operations.
 """
 
 import ctypes
-import ctypes.util
 import logging
+import mmap
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
 from pathlib import Path
+from typing import Generic, TypeAlias, TypeVar
 
-from . import config
+from . import config, metrics
 
 logger = logging.getLogger(__name__)
 
-# liboqs library handle
+# liboqs library handle and the file it was loaded from
 _liboqs_lib: ctypes.CDLL | None = None
+_liboqs_path: str | None = None
 
 
 class LibOQSError(Exception):
@@ -23,46 +30,56 @@ class LibOQSError(Exception):
     pass
 
 
-def _load_liboqs() -> ctypes.CDLL | None:
-    """Load the liboqs library."""
-    global _liboqs_lib
+# Library files tried, in order, after any configured ``liboqs_path``
+_LIB_CANDIDATES = (
+    "/usr/local/lib/liboqs.so",
+    "/usr/local/lib/liboqs.dylib",
+    "/usr/lib/liboqs.so",
+    "/usr/lib/liboqs.dylib",
+)
 
-    if _liboqs_lib is not None:
-        return _liboqs_lib
+# Set once loading has been tried, so a missing library is searched for once
+_load_attempted = False
+_load_lock = threading.Lock()
 
-    # Try to find liboqs in common locations
-    lib_paths = [
-        "liboqs",
-        "/usr/local/lib/liboqs.so",
-        "/usr/local/lib/liboqs.dylib",
-        "/usr/lib/liboqs.so",
-        "/usr/lib/liboqs.dylib",
-    ]
 
-    # Add custom path if specified
+def _open_liboqs() -> ctypes.CDLL | None:
+    """Open the first loadable liboqs, searching system paths only as a fallback."""
+    candidates = [Path(p) for p in _LIB_CANDIDATES]
     if config.config.liboqs_path:
-        custom_path = config.config.liboqs_path / "lib" / "liboqs.so"
-        if custom_path.exists():
-            lib_paths.insert(0, str(custom_path))
+        candidates.insert(0, config.config.liboqs_path / "lib" / "liboqs.so")
 
-    lib: ctypes.CDLL | None = None
-    for path in lib_paths:
+    for path in candidates:
+        if not path.exists():
+            continue
         try:
-            if Path(path).exists():
-                lib = ctypes.CDLL(path)
-                logger.info(f"Loaded liboqs from: {path}")
-                break
-            else:
-                # Try to find library in system paths
-                found_lib = ctypes.util.find_library("oqs")
-                if found_lib:
-                    lib = ctypes.CDLL(found_lib)
-                    logger.info(f"Loaded liboqs from system: {found_lib}")
-                    break
-        except (OSError, ImportError) as e:
+            lib = ctypes.CDLL(str(path))
+            logger.info(f"Loaded liboqs from: {path}")
+            return lib
+        except OSError as e:
             logger.debug(f"Failed to load liboqs from {path}: {e}")
-            continue
 
+    # find_library runs ldconfig/gcc in subprocesses, so it is tried once, last
+    from ctypes.util import find_library
+
+    found_lib = find_library("oqs")
+    if found_lib:
+        try:
+            lib = ctypes.CDLL(found_lib)
+            logger.info(f"Loaded liboqs from system: {found_lib}")
+            return lib
+        except OSError as e:
+            logger.debug(f"Failed to load liboqs from {found_lib}: {e}")
+    return None
+
+
+def _setup_liboqs() -> ctypes.CDLL | None:
+    """Open liboqs and declare every function signature used on it.
+
+    No prototype is assigned anywhere else, so threads calling into the
+    library never see one change under them.
+    """
+    lib = _open_liboqs()
     if lib is None:
         logger.warning(
             "Could not load liboqs library. PQC operations will not be available."
@@ -140,10 +157,54 @@ def _load_liboqs() -> ctypes.CDLL | None:
     except AttributeError as e:
         logger.warning(f"Could not configure all liboqs functions: {e}")
 
-    _liboqs_lib = lib
+    # Optional entry points
+    for family in ("KEM", "SIG"):
+        # Algorithm enumeration, used by pqc_lab.capabilities
+        try:
+            count = getattr(lib, f"OQS_{family}_alg_count")
+            count.argtypes = []
+            count.restype = ctypes.c_int
+            identifier = getattr(lib, f"OQS_{family}_alg_identifier")
+            identifier.argtypes = [ctypes.c_size_t]
+            identifier.restype = ctypes.c_char_p
+            is_enabled = getattr(lib, f"OQS_{family}_alg_is_enabled")
+            is_enabled.argtypes = [ctypes.c_char_p]
+            is_enabled.restype = ctypes.c_int
+        except AttributeError as e:
+            logger.warning(f"Cannot list liboqs {family} algorithms: {e}")
+    version_func = getattr(lib, "OQS_get_library_version", None)
+    if version_func is not None:
+        version_func.argtypes = []
+        version_func.restype = ctypes.c_char_p
+    init_func = getattr(lib, "OQS_init", None)
+    if init_func is not None:
+        init_func.argtypes = []
+        init_func.restype = None
+        # Runs CPU feature detection once, before any thread calls liboqs
+        init_func()
     return lib
 
 
+def _load_liboqs() -> ctypes.CDLL | None:
+    """Load the liboqs library on first use; later calls return the result.
+
+    Threads racing on first use wait for one of them to load the library;
+    the handle is published only once it is fully configured.
+    """
+    global _liboqs_lib, _liboqs_path, _load_attempted
+
+    if _liboqs_lib is not None or _load_attempted:
+        return _liboqs_lib
+    with _load_lock:
+        if not _load_attempted:
+            lib = _setup_liboqs()
+            if lib is not None:
+                _liboqs_path = lib._name
+                _liboqs_lib = lib
+            _load_attempted = True
+    return _liboqs_lib
+
+
 def get_liboqs() -> ctypes.CDLL | None:
     """Get the loaded liboqs library instance."""
     return _load_liboqs()
@@ -154,68 +215,44 @@ def is_available() -> bool:
     return get_liboqs() is not None
 
 
+def get_library_path() -> str | None:
+    """File liboqs was loaded from (or the name it was found by), if loaded."""
+    get_liboqs()
+    return _liboqs_path
+
+
 def get_supported_kems() -> list[str]:
-    """Get list of supported KEM algorithms."""
-    lib = get_liboqs()
-    if lib is None:
-        return []
+    """Get list of KEM algorithms enabled in the loaded liboqs."""
+    from . import capabilities
 
-    # For now, return the configured algorithms
-    # In a full implementation, this would query liboqs
-    return config.get_kem_algorithms()
+    caps = capabilities.get_capabilities()
+    return list(caps.kems) if caps else []
 
 
 def get_supported_sigs() -> list[str]:
-    """Get list of supported signature algorithms."""
-    lib = get_liboqs()
-    if lib is None:
-        return []
+    """Get list of signature algorithms enabled in the loaded liboqs."""
+    from . import capabilities
 
-    # For now, return the configured algorithms
-    # In a full implementation, this would query liboqs
-    return config.get_dsa_algorithms()
+    caps = capabilities.get_capabilities()
+    return list(caps.sigs) if caps else []
 
 
 def get_kem_details(alg_name: str) -> dict | None:
-    """Get details about a KEM algorithm."""
-    lib = get_liboqs()
-    if lib is None:
-        return None
+    """Get details about a KEM algorithm, including its exact object sizes."""
+    from . import capabilities
 
-    # For now, return basic information
-    # In a full implementation, this would query liboqs
-    if alg_name in get_supported_kems():
-        return {
-            "name": alg_name,
-            "type": "KEM",
-            "claimed_nist_level": (
-                1 if "512" in alg_name else (2 if "768" in alg_name else 3)
-            ),
-            "is_ind_cca": True,
-        }
-
-    return None
+    caps = capabilities.get_capabilities()
+    details = caps.kems.get(resolve_algorithm(alg_name)) if caps else None
+    return details.model_dump() if details else None
 
 
 def get_sig_details(alg_name: str) -> dict | None:
-    """Get details about a signature algorithm."""
-    lib = get_liboqs()
-    if lib is None:
-        return None
+    """Get details about a signature algorithm, including its exact sizes."""
+    from . import capabilities
 
-    # For now, return basic information
-    # In a full implementation, this would query liboqs
-    if alg_name in get_supported_sigs():
-        return {
-            "name": alg_name,
-            "type": "DSA",
-            "claimed_nist_level": (
-                1 if "44" in alg_name else (2 if "65" in alg_name else 3)
-            ),
-            "is_euf_cma": True,
-        }
-
-    return None
+    caps = capabilities.get_capabilities()
+    details = caps.sigs.get(resolve_algorithm(alg_name)) if caps else None
+    return details.model_dump() if details else None
 
 
 # Version information
@@ -229,7 +266,6 @@ def get_version() -> str:
         # Try to get version from liboqs
         version_func = getattr(lib, "OQS_get_library_version", None)
         if version_func:
-            version_func.restype = ctypes.c_char_p
             result = version_func()
             if result is not None:
                 decoded = result.decode("utf-8")
@@ -267,3 +303,849 @@ def get_enabled_features() -> list[str]:
         features.append("DSA")
 
     return features
+
+
+# Algorithm names
+ALGORITHM_NAMES: dict[str, str] = {
+    "mlkem512": "ML-KEM-512",
+    "mlkem768": "ML-KEM-768",
+    "mlkem1024": "ML-KEM-1024",
+    "mldsa44": "ML-DSA-44",
+    "mldsa65": "ML-DSA-65",
+    "mldsa87": "ML-DSA-87",
+    # Hybrid of X25519 and an ML-KEM, see pqc_lab.hybrid
+    "x25519-mlkem768": "X25519-ML-KEM-768",
+}
+
+
+def resolve_algorithm(alg_name: str) -> str:
+    """Map a CLI algorithm name (e.g. ``mlkem768``) to its canonical name."""
+    return ALGORITHM_NAMES.get(alg_name.lower(), alg_name)
+
+
+# Native context structs
+class _OQSKEM(ctypes.Structure):
+    """Leading fields of liboqs' ``OQS_KEM`` struct (stable across releases)."""
+
+    _fields_ = [
+        ("method_name", ctypes.c_char_p),
+        ("alg_version", ctypes.c_char_p),
+        ("claimed_nist_level", ctypes.c_uint8),
+        ("ind_cca", ctypes.c_bool),
+        ("length_public_key", ctypes.c_size_t),
+        ("length_secret_key", ctypes.c_size_t),
+        ("length_ciphertext", ctypes.c_size_t),
+        ("length_shared_secret", ctypes.c_size_t),
+    ]
+
+
+class _OQSSIG(ctypes.Structure):
+    """Leading fields of liboqs' ``OQS_SIG`` struct (stable across releases)."""
+
+    _fields_ = [
+        ("method_name", ctypes.c_char_p),
+        ("alg_version", ctypes.c_char_p),
+        ("claimed_nist_level", ctypes.c_uint8),
+        ("euf_cma", ctypes.c_bool),
+        ("length_public_key", ctypes.c_size_t),
+        ("length_secret_key", ctypes.c_size_t),
+        ("length_signature", ctypes.c_size_t),
+    ]
+
+
+_u8p = ctypes.POINTER(ctypes.c_uint8)
+
+# Any object exporting contiguous memory (bytes, bytearray, memoryview, mmap)
+Buffer = bytes | bytearray | memoryview | mmap.mmap
+
+
+class _PyBuffer(ctypes.Structure):
+    """CPython's ``Py_buffer``, filled by ``PyObject_GetBuffer``."""
+
+    _fields_ = [
+        ("buf", ctypes.c_void_p),
+        ("obj", ctypes.c_void_p),
+        ("len", ctypes.c_ssize_t),
+        ("itemsize", ctypes.c_ssize_t),
+        ("readonly", ctypes.c_int),
+        ("ndim", ctypes.c_int),
+        ("format", ctypes.c_char_p),
+        ("shape", ctypes.POINTER(ctypes.c_ssize_t)),
+        ("strides", ctypes.POINTER(ctypes.c_ssize_t)),
+        ("suboffsets", ctypes.POINTER(ctypes.c_ssize_t)),
+        ("internal", ctypes.c_void_p),
+    ]
+
+
+# A pointer or array handed to liboqs as ``uint8_t *``
+_Arg: TypeAlias = "ctypes.Array[ctypes.c_uint8] | ctypes._Pointer[ctypes.c_uint8]"
+
+_PyBUF_SIMPLE = 0
+_get_buffer = ctypes.pythonapi.PyObject_GetBuffer
+_get_buffer.argtypes = [ctypes.py_object, ctypes.POINTER(_PyBuffer), ctypes.c_int]
+_get_buffer.restype = ctypes.c_int
+_release_buffer = ctypes.pythonapi.PyBuffer_Release
+_release_buffer.argtypes = [ctypes.POINTER(_PyBuffer)]
+_release_buffer.restype = None
+
+
+class _Pins:
+    """Input buffers exported to liboqs for the duration of one operation.
+
+    ``bytes`` are passed straight through; any other buffer is exported with
+    ``PyObject_GetBuffer`` so liboqs reads its memory in place. While pinned,
+    a ``bytearray`` cannot be resized nor an ``mmap`` closed under the call.
+    """
+
+    __slots__ = ("_views",)
+
+    def __init__(self) -> None:
+        self._views: list[_PyBuffer] = []
+
+    def address(self, data: Buffer, what: str) -> tuple[int, int]:
+        """Pin ``data``, returning the address and size of its memory."""
+        if type(data) is bytes:
+            address = ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p).value
+            return address or 0, len(data)
+        view = _PyBuffer()
+        try:
+            _get_buffer(data, view, _PyBUF_SIMPLE)
+        except (TypeError, BufferError) as e:
+            raise LibOQSError(f"Invalid {what}: {e}") from e
+        self._views.append(view)
+        return view.buf or 0, view.len
+
+    def input(
+        self, data: Buffer, what: str
+    ) -> "tuple[ctypes._Pointer[ctypes.c_uint8], int]":
+        """Pin ``data``, returning a pointer to it and its size in bytes."""
+        if type(data) is bytes:
+            return ctypes.cast(ctypes.c_char_p(data), _u8p), len(data)
+        address, size = self.address(data, what)
+        return ctypes.cast(address, _u8p), size
+
+    def fixed(
+        self, data: Buffer, length: int, what: str
+    ) -> "ctypes._Pointer[ctypes.c_uint8]":
+        """Pin ``data``, which must be exactly ``length`` bytes."""
+        ptr, size = self.input(data, what)
+        if size != length:
+            raise LibOQSError(f"Invalid {what} length: expected {length}, got {size}")
+        return ptr
+
+    def release(self) -> None:
+        """Release every pinned buffer."""
+        for view in self._views:
+            _release_buffer(view)
+        self._views.clear()
+
+
+def _output(data: Buffer, length: int, what: str) -> "ctypes.Array[ctypes.c_uint8]":
+    """Writable view of the first ``length`` bytes of caller-supplied ``data``."""
+    try:
+        return (ctypes.c_uint8 * length).from_buffer(data)
+    except (TypeError, ValueError, BufferError) as e:
+        raise LibOQSError(f"Invalid {what} buffer: {e}") from e
+
+
+class _KEMContext:
+    """An ``OQS_KEM`` handle together with output buffers sized for it."""
+
+    __slots__ = (
+        "ciphertext",
+        "handle",
+        "length_ciphertext",
+        "length_public_key",
+        "length_secret_key",
+        "length_shared_secret",
+        "lib",
+        "public_key",
+        "secret_key",
+        "shared_secret",
+    )
+
+    def __init__(self, lib: ctypes.CDLL, alg_name: str) -> None:
+        handle = lib.OQS_KEM_new(alg_name.encode())
+        if not handle:
+            raise LibOQSError(f"KEM algorithm not enabled in liboqs: {alg_name}")
+        info = _OQSKEM.from_address(handle)
+        self.lib = lib
+        self.handle = handle
+        self.length_public_key = info.length_public_key
+        self.length_secret_key = info.length_secret_key
+        self.length_ciphertext = info.length_ciphertext
+        self.length_shared_secret = info.length_shared_secret
+        self.public_key = (ctypes.c_uint8 * self.length_public_key)()
+        self.secret_key = (ctypes.c_uint8 * self.length_secret_key)()
+        self.ciphertext = (ctypes.c_uint8 * self.length_ciphertext)()
+        self.shared_secret = (ctypes.c_uint8 * self.length_shared_secret)()
+
+    def close(self) -> None:
+        """Free the native handle."""
+        if self.handle:
+            self.lib.OQS_KEM_free(self.handle)
+            self.handle = None
+
+    def __del__(self) -> None:
+        # Frees contexts dropped without close(), e.g. cached by an exited thread
+        if getattr(self, "handle", None):
+            self.close()
+
+
+class _SIGContext:
+    """An ``OQS_SIG`` handle together with output buffers sized for it."""
+
+    __slots__ = (
+        "handle",
+        "length_public_key",
+        "length_secret_key",
+        "length_signature",
+        "lib",
+        "public_key",
+        "secret_key",
+        "signature",
+        "signature_len",
+    )
+
+    def __init__(self, lib: ctypes.CDLL, alg_name: str) -> None:
+        handle = lib.OQS_SIG_new(alg_name.encode())
+        if not handle:
+            raise LibOQSError(f"Signature algorithm not enabled in liboqs: {alg_name}")
+        info = _OQSSIG.from_address(handle)
+        self.lib = lib
+        self.handle = handle
+        self.length_public_key = info.length_public_key
+        self.length_secret_key = info.length_secret_key
+        self.length_signature = info.length_signature
+        self.public_key = (ctypes.c_uint8 * self.length_public_key)()
+        self.secret_key = (ctypes.c_uint8 * self.length_secret_key)()
+        self.signature = (ctypes.c_uint8 * self.length_signature)()
+        self.signature_len = ctypes.c_size_t(0)
+
+    def close(self) -> None:
+        """Free the native handle."""
+        if self.handle:
+            self.lib.OQS_SIG_free(self.handle)
+            self.handle = None
+
+    def __del__(self) -> None:
+        # Frees contexts dropped without close(), e.g. cached by an exited thread
+        if getattr(self, "handle", None):
+            self.close()
+
+
+_Ctx = TypeVar("_Ctx", _KEMContext, _SIGContext)
+
+
+class _ContextPool(Generic[_Ctx]):
+    """Native contexts for a single algorithm.
+
+    Each thread keeps the context it last released for its next call, so a
+    thread calling repeatedly never takes the pool lock; contexts beyond that
+    go to a bounded shared free-list. A context is only ever used by the
+    thread that acquired it.
+    """
+
+    def __init__(self, factory: Callable[[], _Ctx], max_idle: int) -> None:
+        self._factory: Callable[[], _Ctx] = factory
+        self._max_idle = max_idle
+        self._idle: list[_Ctx] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self) -> _Ctx:
+        """Take this thread's context, else an idle one, else a new one."""
+        ctx: _Ctx | None = getattr(self._local, "ctx", None)
+        if ctx is not None:
+            self._local.ctx = None
+            return ctx
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._factory()
+
+    def release(self, ctx: _Ctx) -> None:
+        """Return a context to the pool, freeing it if the pool is full."""
+        if self._closed:
+            ctx.close()
+            return
+        if getattr(self._local, "ctx", None) is None:
+            self._local.ctx = ctx
+            return
+        with self._lock:
+            if not self._closed and len(self._idle) < self._max_idle:
+                self._idle.append(ctx)
+                return
+        ctx.close()
+
+    def close(self) -> None:
+        """Free idle contexts; contexts released later are freed directly.
+
+        Contexts cached by other threads are freed on their next release,
+        or when the thread exits.
+        """
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        own = getattr(self._local, "ctx", None)
+        if own is not None:
+            self._local.ctx = None
+            idle.append(own)
+        for ctx in idle:
+            ctx.close()
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+
+# Per-algorithm pools, least recently used first
+_MAX_POOLED_ALGORITHMS = 16
+_kem_pools: "OrderedDict[str, _ContextPool[_KEMContext]]" = OrderedDict()
+_sig_pools: "OrderedDict[str, _ContextPool[_SIGContext]]" = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def _require_liboqs() -> ctypes.CDLL:
+    """Get the liboqs handle or raise if the library is unavailable."""
+    lib = get_liboqs()
+    if lib is None:
+        raise LibOQSError("liboqs library not available")
+    return lib
+
+
+_clock = time.perf_counter_ns
+
+
+def _record(
+    alg_name: str,
+    operation: str,
+    start: int,
+    nbytes: int,
+    errors: int,
+    calls: int = 1,
+) -> None:
+    """Report native calls timed from ``start`` to :mod:`pqc_lab.metrics`."""
+    metrics.record(
+        resolve_algorithm(alg_name), operation, _clock() - start, nbytes, errors, calls
+    )
+
+
+def _get_pool(
+    pools: "OrderedDict[str, _ContextPool[_Ctx]]",
+    factory: Callable[[], _Ctx],
+    alg_name: str,
+) -> "_ContextPool[_Ctx]":
+    """Look up (or create) the pool for ``alg_name``, evicting the LRU pool."""
+    with _pools_lock:
+        pool = pools.get(alg_name)
+        if pool is not None:
+            pools.move_to_end(alg_name)
+            return pool
+        # Create one context eagerly so unknown algorithms fail here.
+        first = factory()
+        pool = _ContextPool(factory, config.config.context_pool_size)
+        pool.release(first)
+        pools[alg_name] = pool
+        evicted = []
+        while len(pools) > _MAX_POOLED_ALGORITHMS:
+            evicted.append(pools.popitem(last=False)[1])
+    for old in evicted:
+        old.close()
+    return pool
+
+
+def clear_context_pools() -> None:
+    """Free every pooled liboqs context."""
+    with _pools_lock:
+        pools: list[_ContextPool] = [*_kem_pools.values(), *_sig_pools.values()]
+        _kem_pools.clear()
+        _sig_pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+class KEM:
+    """Key encapsulation backed by pooled, reusable liboqs contexts.
+
+    Instances are cheap and may be created per call; the native ``OQS_KEM``
+    handles and their output buffers live in a per-algorithm pool. Inputs may
+    be any :data:`Buffer` and are read in place; the ``*_into`` methods also
+    write their results into caller-supplied writable buffers.
+    """
+
+    def __init__(self, alg_name: str) -> None:
+        lib = _require_liboqs()
+        self.name = resolve_algorithm(alg_name)
+        self._pool = _get_pool(
+            _kem_pools, lambda: _KEMContext(lib, self.name), self.name
+        )
+        ctx = self._pool.acquire()
+        self.length_public_key = ctx.length_public_key
+        self.length_secret_key = ctx.length_secret_key
+        self.length_ciphertext = ctx.length_ciphertext
+        self.length_shared_secret = ctx.length_shared_secret
+        self._pool.release(ctx)
+
+    def _keypair(self, ctx: _KEMContext, pk: _Arg, sk: _Arg) -> None:
+        start = _clock() if metrics.enabled else 0
+        rc = ctx.lib.OQS_KEM_keypair(ctx.handle, pk, sk)
+        if start:
+            nbytes = ctx.length_public_key + ctx.length_secret_key
+            _record(self.name, "keypair", start, nbytes, rc != 0)
+        if rc != 0:
+            raise LibOQSError(f"{self.name} keypair generation failed")
+
+    def _encaps(self, ctx: _KEMContext, ct: _Arg, ss: _Arg, pk: _Arg) -> None:
+        start = _clock() if metrics.enabled else 0
+        rc = ctx.lib.OQS_KEM_encaps(ctx.handle, ct, ss, pk)
+        if start:
+            nbytes = (
+                ctx.length_public_key + ctx.length_ciphertext + ctx.length_shared_secret
+            )
+            _record(self.name, "encaps", start, nbytes, rc != 0)
+        if rc != 0:
+            raise LibOQSError(f"{self.name} encapsulation failed")
+
+    def _decaps(self, ctx: _KEMContext, ss: _Arg, ct: _Arg, sk: _Arg) -> None:
+        start = _clock() if metrics.enabled else 0
+        rc = ctx.lib.OQS_KEM_decaps(ctx.handle, ss, ct, sk)
+        if start:
+            nbytes = (
+                ctx.length_ciphertext + ctx.length_secret_key + ctx.length_shared_secret
+            )
+            _record(self.name, "decaps", start, nbytes, rc != 0)
+        if rc != 0:
+            raise LibOQSError(f"{self.name} decapsulation failed")
+
+    def keypair(self) -> tuple[bytes, bytes]:
+        """Generate a keypair, returning ``(public_key, secret_key)``."""
+        ctx = self._pool.acquire()
+        try:
+            self._keypair(ctx, ctx.public_key, ctx.secret_key)
+            return bytes(ctx.public_key), bytes(ctx.secret_key)
+        finally:
+            self._pool.release(ctx)
+
+    def keypair_into(self, public_key_out: Buffer, secret_key_out: Buffer) -> None:
+        """Generate a keypair into the start of the two output buffers."""
+        ctx = self._pool.acquire()
+        try:
+            pk = _output(public_key_out, ctx.length_public_key, "public key")
+            sk = _output(secret_key_out, ctx.length_secret_key, "secret key")
+            self._keypair(ctx, pk, sk)
+        finally:
+            self._pool.release(ctx)
+
+    def encaps(self, public_key: Buffer) -> tuple[bytes, bytes]:
+        """Encapsulate to ``public_key``, returning ``(ciphertext, shared_secret)``."""
+        ctx = self._pool.acquire()
+        pins = _Pins()
+        try:
+            pk = pins.fixed(public_key, ctx.length_public_key, "public key")
+            self._encaps(ctx, ctx.ciphertext, ctx.shared_secret, pk)
+            return bytes(ctx.ciphertext), bytes(ctx.shared_secret)
+        finally:
+            pins.release()
+            self._pool.release(ctx)
+
+    def encaps_into(
+        self, public_key: Buffer, ciphertext_out: Buffer, shared_secret_out: Buffer
+    ) -> None:
+        """Encapsulate to ``public_key`` into the two output buffers."""
+        ctx = self._pool.acquire()
+        pins = _Pins()
+        try:
+            pk = pins.fixed(public_key, ctx.length_public_key, "public key")
+            ct = _output(ciphertext_out, ctx.length_ciphertext, "ciphertext")
+            ss = _output(shared_secret_out, ctx.length_shared_secret, "shared secret")
+            self._encaps(ctx, ct, ss, pk)
+        finally:
+            pins.release()
+            self._pool.release(ctx)
+
+    def decaps(self, ciphertext: Buffer, secret_key: Buffer) -> bytes:
+        """Decapsulate ``ciphertext`` with ``secret_key``."""
+        ctx = self._pool.acquire()
+        pins = _Pins()
+        try:
+            ct = pins.fixed(ciphertext, ctx.length_ciphertext, "ciphertext")
+            sk = pins.fixed(secret_key, ctx.length_secret_key, "secret key")
+            self._decaps(ctx, ctx.shared_secret, ct, sk)
+            return bytes(ctx.shared_secret)
+        finally:
+            pins.release()
+            self._pool.release(ctx)
+
+    def decaps_into(
+        self, ciphertext: Buffer, secret_key: Buffer, shared_secret_out: Buffer
+    ) -> None:
+        """Decapsulate ``ciphertext`` into ``shared_secret_out``."""
+        ctx = self._pool.acquire()
+        pins = _Pins()
+        try:
+            ct = pins.fixed(ciphertext, ctx.length_ciphertext, "ciphertext")
+            sk = pins.fixed(secret_key, ctx.length_secret_key, "secret key")
+            ss = _output(shared_secret_out, ctx.length_shared_secret, "shared secret")
+            self._decaps(ctx, ss, ct, sk)
+        finally:
+            pins.release()
+            self._pool.release(ctx)
+
+
+class Signature:
+    """Digital signatures backed by pooled, reusable liboqs contexts.
+
+    Instances are cheap and may be created per call; the native ``OQS_SIG``
+    handles and their output buffers live in a per-algorithm pool. Messages
+    and keys may be any :data:`Buffer` (a memory-mapped file is signed in
+    place); the ``*_into`` methods write into caller-supplied buffers.
+    """
+
+    def __init__(self, alg_name: str) -> None:
+        lib = _require_liboqs()
+        self.name = resolve_algorithm(alg_name)
+        self._pool = _get_pool(
+            _sig_pools, lambda: _SIGContext(lib, self.name), self.name
+        )
+        ctx = self._pool.acquire()
+        self.length_public_key = ctx.length_public_key
+        self.length_secret_key = ctx.length_secret_key
+        self.length_signature = ctx.length_signature
+        self._pool.release(ctx)
+
+    def _keypair(self, ctx: _SIGContext, pk: _Arg, sk: _Arg) -> None:
+        start = _clock() if metrics.enabled else 0
+        rc = ctx.lib.OQS_SIG_keypair(ctx.handle, pk, sk)
+        if start:
+            nbytes = ctx.length_public_key + ctx.length_secret_key
+            _record(self.name, "keypair", start, nbytes, rc != 0)
+        if rc != 0:
+            raise LibOQSError(f"{self.name} keypair generation failed")
+
+    def _sign(
+        self, ctx: _SIGContext, sig: _Arg, message: Buffer, secret_key: Buffer
+    ) -> int:
+        pins = _Pins()
+        try:
+            sk = pins.fixed(secret_key, ctx.length_secret_key, "secret key")
+            msg, msg_len = pins.input(message, "message")
+            start = _clock() if metrics.enabled else 0
+            rc = ctx.lib.OQS_SIG_sign(
+                ctx.handle, sig, ctypes.byref(ctx.signature_len), msg, msg_len, sk
+            )
+            if start:
+                nbytes = msg_len + ctx.signature_len.value
+                _record(self.name, "sign", start, nbytes, rc != 0)
+        finally:
+            pins.release()
+        if rc != 0:
+            raise LibOQSError(f"{self.name} signing failed")
+        return ctx.signature_len.value
+
+    def keypair(self) -> tuple[bytes, bytes]:
+        """Generate a keypair, returning ``(public_key, secret_key)``."""
+        ctx = self._pool.acquire()
+        try:
+            self._keypair(ctx, ctx.public_key, ctx.secret_key)
+            return bytes(ctx.public_key), bytes(ctx.secret_key)
+        finally:
+            self._pool.release(ctx)
+
+    def keypair_into(self, public_key_out: Buffer, secret_key_out: Buffer) -> None:
+        """Generate a keypair into the start of the two output buffers."""
+        ctx = self._pool.acquire()
+        try:
+            pk = _output(public_key_out, ctx.length_public_key, "public key")
+            sk = _output(secret_key_out, ctx.length_secret_key, "secret key")
+            self._keypair(ctx, pk, sk)
+        finally:
+            self._pool.release(ctx)
+
+    def sign(self, message: Buffer, secret_key: Buffer) -> bytes:
+        """Sign ``message`` with ``secret_key``."""
+        ctx = self._pool.acquire()
+        try:
+            length = self._sign(ctx, ctx.signature, message, secret_key)
+            return ctypes.string_at(ctx.signature, length)
+        finally:
+            self._pool.release(ctx)
+
+    def sign_into(
+        self, message: Buffer, secret_key: Buffer, signature_out: Buffer
+    ) -> int:
+        """Sign ``message`` into ``signature_out``, returning the signature length.
+
+        ``signature_out`` must hold :attr:`length_signature` bytes, the
+        longest signature the algorithm produces.
+        """
+        ctx = self._pool.acquire()
+        try:
+            sig = _output(signature_out, ctx.length_signature, "signature")
+            return self._sign(ctx, sig, message, secret_key)
+        finally:
+            self._pool.release(ctx)
+
+    def verify(self, message: Buffer, signature: Buffer, public_key: Buffer) -> bool:
+        """Check ``signature`` over ``message`` against ``public_key``."""
+        ctx = self._pool.acquire()
+        pins = _Pins()
+        try:
+            pk = pins.fixed(public_key, ctx.length_public_key, "public key")
+            msg, msg_len = pins.input(message, "message")
+            sig, sig_len = pins.input(signature, "signature")
+            start = _clock() if metrics.enabled else 0
+            rc = ctx.lib.OQS_SIG_verify(ctx.handle, msg, msg_len, sig, sig_len, pk)
+            if start:
+                _record(self.name, "verify", start, msg_len + sig_len, rc != 0)
+            return rc == 0
+        finally:
+            pins.release()
+            self._pool.release(ctx)
+
+
+# Batch operations
+#
+# Batches hold one pooled context for the whole loop and write results into a
+# single preallocated bytearray with a fixed stride per item; slice it with
+# ``memoryview(out)[i * stride : (i + 1) * stride]``. Packed inputs are read in
+# place; only a sequence of separate items is joined into one buffer first.
+
+BatchInput = Buffer | Sequence[Buffer]
+
+
+def _pack(items: BatchInput, stride: int, what: str) -> tuple[Buffer, int]:
+    """Lay ``items`` out contiguously, returning the buffer and item count.
+
+    A single buffer is used as is, without copying.
+    """
+    if isinstance(items, (bytes, bytearray, memoryview, mmap.mmap)):
+        buf = items
+    else:
+        if any(memoryview(item).nbytes != stride for item in items):
+            raise LibOQSError(f"Invalid {what} length: expected {stride}")
+        buf = bytearray().join(items)
+    size = memoryview(buf).nbytes
+    if stride == 0 or size % stride:
+        raise LibOQSError(f"Invalid {what} buffer length: {size}")
+    return buf, size // stride
+
+
+def _pin_keys(
+    pins: _Pins, keys: BatchInput, stride: int, count: int, what: str
+) -> tuple[int, int]:
+    """Pin one key shared by every item, or exactly one key per item.
+
+    Returns the address of the first key and the step between items.
+    """
+    buf, n = _pack(keys, stride, what)
+    if n != 1 and n != count:
+        raise LibOQSError(f"Expected 1 or {count} {what}s, got {n}")
+    return pins.address(buf, what)[0], stride if n > 1 else 0
+
+
+def kem_keypair_batch(alg_name: str, count: int) -> tuple[bytearray, bytearray]:
+    """Generate ``count`` keypairs into packed public and secret key buffers."""
+    pool = KEM(alg_name)._pool
+    ctx = pool.acquire()
+    try:
+        pk_len, sk_len = ctx.length_public_key, ctx.length_secret_key
+        public_keys = bytearray(count * pk_len)
+        secret_keys = bytearray(count * sk_len)
+        pk_t, sk_t = ctypes.c_uint8 * pk_len, ctypes.c_uint8 * sk_len
+        keypair, handle = ctx.lib.OQS_KEM_keypair, ctx.handle
+        start = _clock() if metrics.enabled else 0
+        for i in range(count):
+            pk = pk_t.from_buffer(public_keys, i * pk_len)
+            sk = sk_t.from_buffer(secret_keys, i * sk_len)
+            if keypair(handle, pk, sk) != 0:
+                if start:
+                    _record(alg_name, "keypair", start, i * (pk_len + sk_len), 1, i + 1)
+                raise LibOQSError(f"{alg_name} keypair generation failed at {i}")
+        if start:
+            _record(alg_name, "keypair", start, count * (pk_len + sk_len), 0, count)
+        return public_keys, secret_keys
+    finally:
+        pool.release(ctx)
+
+
+def kem_encaps_batch(
+    alg_name: str, public_keys: BatchInput
+) -> tuple[bytearray, bytearray]:
+    """Encapsulate to each public key, returning packed ciphertexts and secrets."""
+    pool = KEM(alg_name)._pool
+    ctx = pool.acquire()
+    pins = _Pins()
+    try:
+        pk_len, ct_len = ctx.length_public_key, ctx.length_ciphertext
+        ss_len = ctx.length_shared_secret
+        pks, count = _pack(public_keys, pk_len, "public key")
+        pk_base = pins.address(pks, "public key")[0]
+        ciphertexts = bytearray(count * ct_len)
+        shared_secrets = bytearray(count * ss_len)
+        pk_t = ctypes.c_uint8 * pk_len
+        ct_t, ss_t = ctypes.c_uint8 * ct_len, ctypes.c_uint8 * ss_len
+        encaps, handle = ctx.lib.OQS_KEM_encaps, ctx.handle
+        item_bytes = pk_len + ct_len + ss_len
+        start = _clock() if metrics.enabled else 0
+        for i in range(count):
+            rc = encaps(
+                handle,
+                ct_t.from_buffer(ciphertexts, i * ct_len),
+                ss_t.from_buffer(shared_secrets, i * ss_len),
+                pk_t.from_address(pk_base + i * pk_len),
+            )
+            if rc != 0:
+                if start:
+                    _record(alg_name, "encaps", start, i * item_bytes, 1, i + 1)
+                raise LibOQSError(f"{alg_name} encapsulation failed at {i}")
+        if start:
+            _record(alg_name, "encaps", start, count * item_bytes, 0, count)
+        return ciphertexts, shared_secrets
+    finally:
+        pins.release()
+        pool.release(ctx)
+
+
+def kem_decaps_batch(
+    alg_name: str, ciphertexts: BatchInput, secret_keys: BatchInput
+) -> bytearray:
+    """Decapsulate each ciphertext with one shared or per-item secret key."""
+    pool = KEM(alg_name)._pool
+    ctx = pool.acquire()
+    pins = _Pins()
+    try:
+        ct_len, sk_len = ctx.length_ciphertext, ctx.length_secret_key
+        ss_len = ctx.length_shared_secret
+        cts, count = _pack(ciphertexts, ct_len, "ciphertext")
+        ct_base = pins.address(cts, "ciphertext")[0]
+        sk_base, sk_step = _pin_keys(pins, secret_keys, sk_len, count, "secret key")
+        shared_secrets = bytearray(count * ss_len)
+        ct_t, sk_t = ctypes.c_uint8 * ct_len, ctypes.c_uint8 * sk_len
+        ss_t = ctypes.c_uint8 * ss_len
+        decaps, handle = ctx.lib.OQS_KEM_decaps, ctx.handle
+        item_bytes = ct_len + sk_len + ss_len
+        start = _clock() if metrics.enabled else 0
+        for i in range(count):
+            rc = decaps(
+                handle,
+                ss_t.from_buffer(shared_secrets, i * ss_len),
+                ct_t.from_address(ct_base + i * ct_len),
+                sk_t.from_address(sk_base + i * sk_step),
+            )
+            if rc != 0:
+                if start:
+                    _record(alg_name, "decaps", start, i * item_bytes, 1, i + 1)
+                raise LibOQSError(f"{alg_name} decapsulation failed at {i}")
+        if start:
+            _record(alg_name, "decaps", start, count * item_bytes, 0, count)
+        return shared_secrets
+    finally:
+        pins.release()
+        pool.release(ctx)
+
+
+def sig_keypair_batch(alg_name: str, count: int) -> tuple[bytearray, bytearray]:
+    """Generate ``count`` keypairs into packed public and secret key buffers."""
+    pool = Signature(alg_name)._pool
+    ctx = pool.acquire()
+    try:
+        pk_len, sk_len = ctx.length_public_key, ctx.length_secret_key
+        public_keys = bytearray(count * pk_len)
+        secret_keys = bytearray(count * sk_len)
+        pk_t, sk_t = ctypes.c_uint8 * pk_len, ctypes.c_uint8 * sk_len
+        keypair, handle = ctx.lib.OQS_SIG_keypair, ctx.handle
+        start = _clock() if metrics.enabled else 0
+        for i in range(count):
+            pk = pk_t.from_buffer(public_keys, i * pk_len)
+            sk = sk_t.from_buffer(secret_keys, i * sk_len)
+            if keypair(handle, pk, sk) != 0:
+                if start:
+                    _record(alg_name, "keypair", start, i * (pk_len + sk_len), 1, i + 1)
+                raise LibOQSError(f"{alg_name} keypair generation failed at {i}")
+        if start:
+            _record(alg_name, "keypair", start, count * (pk_len + sk_len), 0, count)
+        return public_keys, secret_keys
+    finally:
+        pool.release(ctx)
+
+
+def sig_sign_batch(
+    alg_name: str, messages: Sequence[Buffer], secret_key: Buffer
+) -> tuple[bytearray, "array[int]"]:
+    """Sign each message with one secret key.
+
+    Returns the signatures packed at a stride of the algorithm's maximum
+    signature length, and the actual length of each signature.
+    """
+    pool = Signature(alg_name)._pool
+    ctx = pool.acquire()
+    pins = _Pins()
+    try:
+        sig_len = ctx.length_signature
+        sk = pins.fixed(secret_key, ctx.length_secret_key, "secret key")
+        count = len(messages)
+        signatures = bytearray(count * sig_len)
+        lengths = array("Q", bytes(8 * count))
+        sig_t = ctypes.c_uint8 * sig_len
+        out_len = ctx.signature_len
+        out_len_ref = ctypes.byref(out_len)
+        sign, handle = ctx.lib.OQS_SIG_sign, ctx.handle
+        message_bytes = 0
+        start = _clock() if metrics.enabled else 0
+        for i, message in enumerate(messages):
+            msg, msg_len = pins.input(message, "message")
+            message_bytes += msg_len
+            rc = sign(
+                handle,
+                sig_t.from_buffer(signatures, i * sig_len),
+                out_len_ref,
+                msg,
+                msg_len,
+                sk,
+            )
+            if rc != 0:
+                if start:
+                    _record(alg_name, "sign", start, 0, 1, i + 1)
+                raise LibOQSError(f"{alg_name} signing failed at {i}")
+            lengths[i] = out_len.value
+        if start:
+            _record(alg_name, "sign", start, message_bytes + sum(lengths), 0, count)
+        return signatures, lengths
+    finally:
+        pins.release()
+        pool.release(ctx)
+
+
+def sig_verify_batch(
+    alg_name: str, items: Iterable[tuple[Buffer, Buffer, Buffer]]
+) -> bytearray:
+    """Verify ``(message, signature, public_key)`` items.
+
+    Returns one byte per item: 1 if the signature is valid, 0 otherwise.
+    """
+    pool = Signature(alg_name)._pool
+    ctx = pool.acquire()
+    pins = _Pins()
+    try:
+        pk_len = ctx.length_public_key
+        items = list(items)
+        results = bytearray(len(items))
+        verify, handle = ctx.lib.OQS_SIG_verify, ctx.handle
+        nbytes = 0
+        start = _clock() if metrics.enabled else 0
+        for i, (message, signature, public_key) in enumerate(items):
+            msg, msg_len = pins.input(message, "message")
+            sig, sig_len = pins.input(signature, "signature")
+            pk, size = pins.input(public_key, "public key")
+            nbytes += msg_len + sig_len
+            if size != pk_len:
+                continue
+            results[i] = verify(handle, msg, msg_len, sig, sig_len, pk) == 0
+        if start:
+            rejected = len(items) - sum(results)
+            _record(alg_name, "verify", start, nbytes, rejected, len(items))
+        return results
+    finally:
+        pins.release()
+        pool.release(ctx)
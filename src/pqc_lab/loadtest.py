@@ -0,0 +1,185 @@
+"""Handshake load generator for PQC Readiness Lab.
+
+Drives many concurrent client handshakes against a running server for a
+fixed duration, optionally paced to a target rate, and summarises
+connect/first-byte/handshake latencies in the benchmark result formats.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import time
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+from . import bench, config, handshake, lib
+
+# Latencies recorded for every successful handshake
+LOAD_OPERATIONS = ("connect", "first_byte", "handshake")
+
+
+class LoadTestResult(BaseModel):
+    """Throughput, latency and error summary of one load test."""
+
+    algorithm: str
+    concurrency: int
+    duration_s: float
+    elapsed_s: float
+    target_rate: float | None = None
+    timestamp: str
+    completed: int = 0
+    failed: int = 0
+    errors: dict[str, int] = Field(default_factory=dict)
+    handshakes_per_sec: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    operations: list[bench.OperationStats] = Field(default_factory=list)
+
+
+def _error_name(error: Exception) -> str:
+    """Short error category: the underlying exception type where there is one."""
+    return type(error.__cause__ or error).__name__
+
+
+async def run_load(
+    algorithm: str,
+    host: str | None = None,
+    port: int | None = None,
+    concurrency: int = 1,
+    duration: float = 10.0,
+    rate: float | None = None,
+    message: bytes = b"",
+    network: config.NetworkConfig | None = None,
+) -> LoadTestResult:
+    """Run handshakes from ``concurrency`` clients for ``duration`` seconds.
+
+    Without ``rate`` every client starts its next handshake as soon as the
+    previous one finishes (closed loop). With ``rate`` handshake starts are
+    scheduled at ``rate`` per second across all clients, and a client that
+    falls behind starts immediately rather than skipping its slot.
+    """
+    algorithm = lib.resolve_algorithm(algorithm)
+    samples: dict[str, list[int]] = {op: [] for op in LOAD_OPERATIONS}
+    errors: dict[str, int] = {}
+    totals = {"sent": 0, "received": 0}
+    clock = time.perf_counter
+    start = clock()
+    deadline = start + duration
+    scheduled = 0
+
+    async def next_start() -> bool:
+        """Wait for this client's next slot; ``False`` once time is up."""
+        nonlocal scheduled
+        if rate is None:
+            return clock() < deadline
+        slot = start + scheduled / rate
+        scheduled += 1
+        if slot >= deadline:
+            return False
+        await asyncio.sleep(max(0.0, slot - clock()))
+        return True
+
+    async def client() -> None:
+        while await next_start():
+            try:
+                result = await handshake.run_client(
+                    algorithm, host, port, message, network
+                )
+            except (handshake.HandshakeError, lib.LibOQSError) as e:
+                name = _error_name(e)
+                errors[name] = errors.get(name, 0) + 1
+                continue
+            samples["connect"].append(result.connect_ns)
+            samples["first_byte"].append(result.first_byte_ns)
+            samples["handshake"].append(result.handshake_ns)
+            totals["sent"] += result.bytes_sent
+            totals["received"] += result.bytes_received
+
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = clock() - start
+    completed = len(samples["handshake"])
+
+    return LoadTestResult(
+        algorithm=algorithm,
+        concurrency=concurrency,
+        duration_s=duration,
+        elapsed_s=elapsed,
+        target_rate=rate,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        completed=completed,
+        failed=sum(errors.values()),
+        errors=errors,
+        handshakes_per_sec=completed / elapsed if elapsed else 0.0,
+        bytes_sent=totals["sent"],
+        bytes_received=totals["received"],
+        operations=[bench.summarize(op, samples[op]) for op in LOAD_OPERATIONS],
+    )
+
+
+LOAD_CSV_FIELDS = [
+    "algorithm",
+    "concurrency",
+    "handshakes_per_sec",
+    "completed",
+    "failed",
+    "bytes_sent",
+    "bytes_received",
+    *bench.CSV_FIELDS[1:],
+]
+
+
+def _format_text(result: LoadTestResult) -> str:
+    """Render the summary line, error counts and a latency table."""
+    per_handshake = (result.bytes_sent + result.bytes_received) / (
+        result.completed or 1
+    )
+    lines = [
+        (
+            f"{result.algorithm}: {result.completed} handshakes in "
+            f"{result.elapsed_s:.1f} s from {result.concurrency} clients "
+            f"({result.handshakes_per_sec:.1f}/s)"
+        ),
+        (
+            f"Bytes: {result.bytes_sent} sent, {result.bytes_received} received "
+            f"({per_handshake:.0f} per handshake)"
+        ),
+        f"Errors: {result.failed}"
+        + "".join(f", {name}={n}" for name, n in sorted(result.errors.items())),
+        "",
+        (
+            f"{'latency':<10} {'count':>8} {'min':>10} {'median':>10} "
+            f"{'p90':>10} {'p99':>10} {'max':>10}  (µs)"
+        ),
+    ]
+    for op in result.operations:
+        lines.append(
+            f"{op.operation:<10} {op.iterations:>8} {op.min_ns / 1e3:>10.1f} "
+            f"{op.median_ns / 1e3:>10.1f} {op.p90_ns / 1e3:>10.1f} "
+            f"{op.p99_ns / 1e3:>10.1f} {op.max_ns / 1e3:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _format_csv(results: list[LoadTestResult]) -> str:
+    """Render one CSV row per algorithm and latency, with the run totals."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=LOAD_CSV_FIELDS, lineterminator="\n")
+    writer.writeheader()
+    for result in results:
+        totals = result.model_dump(include=set(LOAD_CSV_FIELDS))
+        for op in result.operations:
+            writer.writerow({**totals, **op.model_dump(include=set(LOAD_CSV_FIELDS))})
+    return buffer.getvalue()
+
+
+def format_load(results: list[LoadTestResult], output_format: str) -> str:
+    """Render load test results as ``json``, ``text`` or ``csv``."""
+    if output_format == "json":
+        return json.dumps([r.model_dump() for r in results], indent=2)
+    if output_format == "csv":
+        return _format_csv(results)
+    if output_format == "text":
+        return "\n\n".join(_format_text(r) for r in results)
+    raise ValueError(f"Unknown output format: {output_format}")
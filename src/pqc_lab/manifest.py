@@ -0,0 +1,169 @@
+"""Signed directory manifests for PQC Readiness Lab.
+
+A directory is signed by hashing every file in a process pool, writing a
+manifest of ``digest  size  path`` lines and signing that manifest once
+with ML-DSA. Verification re-hashes the tree in parallel and reports every
+file that no longer matches.
+"""
+
+import os
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from . import signing
+
+MANIFEST_HEADER = "# pqc-lab manifest v1"
+
+# Files handed to a worker per task; amortizes IPC for trees of small files
+_HASH_BATCH = 64
+
+
+class ManifestEntry(BaseModel):
+    """Digest of one file, keyed by its path relative to the tree root."""
+
+    path: str
+    size: int
+    digest: str
+
+
+class Manifest(BaseModel):
+    """Digests of every regular file under a directory."""
+
+    prehash: str = signing.DEFAULT_PREHASH
+    entries: list[ManifestEntry] = Field(default_factory=list)
+
+    def dumps(self) -> str:
+        """Serialize as a header followed by one ``digest  size  path`` line each."""
+        lines = [MANIFEST_HEADER, f"# prehash: {self.prehash}"]
+        lines += [f"{e.digest}  {e.size}  {e.path}" for e in self.entries]
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def loads(cls, text: str) -> "Manifest":
+        """Parse a manifest written by :meth:`dumps`."""
+        lines = text.splitlines()
+        if not lines or lines[0] != MANIFEST_HEADER:
+            raise ValueError("Not a pqc-lab manifest")
+        manifest = cls()
+        for line in lines[1:]:
+            if line.startswith("# prehash: "):
+                manifest.prehash = line.split(": ", 1)[1]
+            elif line and not line.startswith("#"):
+                digest, size, path = line.split("  ", 2)
+                manifest.entries.append(
+                    ManifestEntry(path=path, size=int(size), digest=digest)
+                )
+        if manifest.prehash not in signing.PREHASH_ALGORITHMS:
+            raise ValueError(f"Unknown pre-hash algorithm: {manifest.prehash}")
+        return manifest
+
+
+class ManifestDiff(BaseModel):
+    """Differences between a manifest and the files currently on disk."""
+
+    mismatched: list[str] = Field(default_factory=list)
+    missing: list[str] = Field(default_factory=list)
+    extra: list[str] = Field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the tree matches the manifest exactly."""
+        return not (self.mismatched or self.missing or self.extra)
+
+
+def walk_files(root: str | Path) -> list[str]:
+    """Relative POSIX paths of all regular files under ``root``, sorted."""
+    root = Path(root)
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        base = Path(dirpath)
+        for name in filenames:
+            path = base / name
+            if path.is_file() and not path.is_symlink():
+                relative = path.relative_to(root).as_posix()
+                if "\n" in relative:
+                    raise ValueError(f"Unsupported file name: {relative!r}")
+                found.append(relative)
+    return sorted(found)
+
+
+def _hash_batch(
+    root: str, paths: list[str], prehash: str, chunk_size: int
+) -> list[ManifestEntry]:
+    """Hash a batch of files in a worker process."""
+    entries = []
+    for path in paths:
+        digest, size = signing.hash_file(Path(root, path), prehash, chunk_size)
+        entries.append(ManifestEntry(path=path, size=size, digest=digest.hex()))
+    return entries
+
+
+def hash_files(
+    root: str | Path,
+    paths: Iterable[str],
+    prehash: str = signing.DEFAULT_PREHASH,
+    chunk_size: int = signing.DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+) -> list[ManifestEntry]:
+    """Hash ``paths`` under ``root`` on ``workers`` processes, keeping order."""
+    paths = list(paths)
+    batches = [paths[i : i + _HASH_BATCH] for i in range(0, len(paths), _HASH_BATCH)]
+    if workers == 1 or len(batches) <= 1:
+        return [
+            e for b in batches for e in _hash_batch(str(root), b, prehash, chunk_size)
+        ]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(
+            _hash_batch,
+            [str(root)] * len(batches),
+            batches,
+            [prehash] * len(batches),
+            [chunk_size] * len(batches),
+        )
+        return [entry for batch in results for entry in batch]
+
+
+def build_manifest(
+    root: str | Path,
+    prehash: str = signing.DEFAULT_PREHASH,
+    chunk_size: int = signing.DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+) -> Manifest:
+    """Hash every file under ``root`` into a manifest."""
+    entries = hash_files(root, walk_files(root), prehash, chunk_size, workers)
+    return Manifest(prehash=prehash, entries=entries)
+
+
+def check_manifest(
+    root: str | Path,
+    manifest: Manifest,
+    chunk_size: int = signing.DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+) -> ManifestDiff:
+    """Re-hash the tree under ``root`` and compare it with ``manifest``."""
+    root = Path(root)
+    expected = {e.path: e for e in manifest.entries}
+    on_disk = set(walk_files(root))
+    diff = ManifestDiff(
+        missing=sorted(set(expected) - on_disk),
+        extra=sorted(on_disk - set(expected)),
+    )
+
+    # Size changes are mismatches without needing a rehash
+    to_hash = []
+    for path in sorted(on_disk & set(expected)):
+        if (root / path).stat().st_size != expected[path].size:
+            diff.mismatched.append(path)
+        else:
+            to_hash.append(path)
+
+    for entry in hash_files(root, to_hash, manifest.prehash, chunk_size, workers):
+        if entry.digest != expected[entry.path].digest:
+            diff.mismatched.append(entry.path)
+    diff.mismatched.sort()
+    return diff
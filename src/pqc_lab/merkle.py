@@ -0,0 +1,389 @@
+"""Incremental Merkle-tree signing of directory trees.
+
+Every file under a tree becomes a leaf (path, size and content digest) of a
+binary Merkle tree whose root is signed with ML-DSA. The tree and a
+``(path, size, mtime)`` keyed digest cache are persisted in the artifacts
+directory, so re-signing only rehashes files that changed and recomputes
+the O(log n) interior nodes above them. A single file can be checked
+against the signed root with an inclusion proof.
+"""
+
+import hashlib
+import struct
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from . import config, keys, lib, manifest, signing
+
+SIGNATURE_LABEL = "PQC-LAB MERKLE SIGNATURE"
+PROOF_LABEL = "PQC-LAB MERKLE PROOF"
+_ROOT_CONTEXT = b"PQC-LAB-MERKLE-V1\x00"
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+NODE_SIZE = 32
+
+
+def leaf_hash(path: str, size: int, digest: bytes) -> bytes:
+    """Hash of a leaf, binding the file's path and size to its digest."""
+    encoded = path.encode("utf-8")
+    return hashlib.sha3_256(
+        _LEAF_PREFIX
+        + struct.pack(">I", len(encoded))
+        + encoded
+        + struct.pack(">Q", size)
+        + digest
+    ).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    """Hash of an interior node."""
+    return hashlib.sha3_256(_NODE_PREFIX + left + right).digest()
+
+
+class MerkleTree:
+    """Binary Merkle tree stored level by level, leaves first.
+
+    A node without a sibling is promoted unchanged to the next level.
+    """
+
+    def __init__(self, levels: list[list[bytes]]) -> None:
+        self.levels = levels
+
+    @classmethod
+    def build(cls, leaves: list[bytes]) -> "MerkleTree":
+        """Build every level above ``leaves``."""
+        levels = [list(leaves)]
+        while len(levels[-1]) > 1:
+            below = levels[-1]
+            above = [
+                node_hash(below[i], below[i + 1]) for i in range(0, len(below) - 1, 2)
+            ]
+            if len(below) % 2:
+                above.append(below[-1])
+            levels.append(above)
+        return cls(levels)
+
+    @property
+    def root(self) -> bytes:
+        """The root hash (all zeros for an empty tree)."""
+        return self.levels[-1][0] if self.levels[-1] else bytes(NODE_SIZE)
+
+    def __len__(self) -> int:
+        return len(self.levels[0])
+
+    def update(self, index: int, leaf: bytes) -> None:
+        """Replace one leaf and recompute only the nodes above it."""
+        self.levels[0][index] = leaf
+        for depth in range(len(self.levels) - 1):
+            below = self.levels[depth]
+            parent = index // 2
+            if index ^ 1 < len(below):
+                left, right = below[index & ~1], below[index | 1]
+                self.levels[depth + 1][parent] = node_hash(left, right)
+            else:
+                self.levels[depth + 1][parent] = below[index]
+            index = parent
+
+    def proof(self, index: int) -> list[bytes]:
+        """Sibling hashes from leaf ``index`` up to the root."""
+        siblings = []
+        for level in self.levels[:-1]:
+            if index ^ 1 < len(level):
+                siblings.append(level[index ^ 1])
+            index //= 2
+        return siblings
+
+
+def root_from_proof(
+    leaf: bytes, index: int, leaves: int, siblings: list[bytes]
+) -> bytes:
+    """Fold an inclusion proof into the root it implies."""
+    node, width = leaf, leaves
+    remaining = iter(siblings)
+    while width > 1:
+        if index ^ 1 < width:
+            sibling = next(remaining)
+            node = node_hash(sibling, node) if index & 1 else node_hash(node, sibling)
+        index //= 2
+        width = (width + 1) // 2
+    if next(remaining, None) is not None:
+        raise ValueError("Inclusion proof is too long")
+    return node
+
+
+class MerkleLeaf(BaseModel):
+    """Cached digest of one file and the stat data it is valid for."""
+
+    path: str
+    size: int
+    mtime_ns: int
+    digest: str
+
+
+class MerkleState(BaseModel):
+    """Persisted leaves and tree levels for one directory."""
+
+    root_dir: str
+    prehash: str
+    leaves: list[MerkleLeaf] = Field(default_factory=list)
+    levels: list[list[str]] = Field(default_factory=list)
+
+    def tree(self) -> MerkleTree:
+        """The stored tree levels as a :class:`MerkleTree`."""
+        return MerkleTree([[bytes.fromhex(n) for n in level] for level in self.levels])
+
+    def index_of(self, path: str) -> int:
+        """Leaf index of ``path``."""
+        for index, leaf in enumerate(self.leaves):
+            if leaf.path == path:
+                return index
+        raise KeyError(path)
+
+
+def state_path(root: str | Path) -> Path:
+    """Where the Merkle state of ``root`` lives in the artifacts directory."""
+    key = hashlib.sha256(str(Path(root).resolve()).encode()).hexdigest()[:16]
+    return config.get_artifacts_dir() / "merkle" / f"{key}.json"
+
+
+def load_state(root: str | Path) -> MerkleState | None:
+    """Load the persisted state of ``root``, if any."""
+    path = state_path(root)
+    try:
+        state = MerkleState.model_validate_json(path.read_text())
+    except (OSError, ValueError):
+        return None
+    return state if state.root_dir == str(Path(root).resolve()) else None
+
+
+def save_state(state: MerkleState) -> None:
+    """Persist a Merkle state."""
+    path = state_path(state.root_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(state.model_dump_json())
+    tmp.replace(path)
+
+
+def update_state(
+    root: str | Path,
+    prehash: str = signing.DEFAULT_PREHASH,
+    chunk_size: int = signing.DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+) -> tuple[MerkleState, int]:
+    """Bring the persisted tree for ``root`` up to date.
+
+    Files whose path, size and mtime match the cache keep their digest; only
+    the rest are rehashed. Returns the new state and the number rehashed.
+    """
+    root = Path(root)
+    previous = load_state(root)
+    if previous is not None and previous.prehash != prehash:
+        previous = None
+    cached = {leaf.path: leaf for leaf in previous.leaves} if previous else {}
+
+    leaves: list[MerkleLeaf] = []
+    stale: list[int] = []
+    for path in manifest.walk_files(root):
+        st = (root / path).stat()
+        hit = cached.get(path)
+        if hit and hit.size == st.st_size and hit.mtime_ns == st.st_mtime_ns:
+            leaves.append(hit)
+        else:
+            leaves.append(
+                MerkleLeaf(
+                    path=path, size=st.st_size, mtime_ns=st.st_mtime_ns, digest=""
+                )
+            )
+            stale.append(len(leaves) - 1)
+
+    entries = manifest.hash_files(
+        root, [leaves[i].path for i in stale], prehash, chunk_size, workers
+    )
+    for index, entry in zip(stale, entries):
+        leaves[index].digest = entry.digest
+        leaves[index].size = entry.size
+
+    def hashed(leaf: MerkleLeaf) -> bytes:
+        return leaf_hash(leaf.path, leaf.size, bytes.fromhex(leaf.digest))
+
+    paths = [leaf.path for leaf in leaves]
+    if previous is not None and [leaf.path for leaf in previous.leaves] == paths:
+        tree = previous.tree()
+        for index in stale:
+            tree.update(index, hashed(leaves[index]))
+    else:
+        tree = MerkleTree.build([hashed(leaf) for leaf in leaves])
+
+    state = MerkleState(
+        root_dir=str(root.resolve()),
+        prehash=prehash,
+        leaves=leaves,
+        levels=[[n.hex() for n in level] for level in tree.levels],
+    )
+    save_state(state)
+    return state, len(stale)
+
+
+def compute_root(
+    root: str | Path,
+    prehash: str = signing.DEFAULT_PREHASH,
+    chunk_size: int = signing.DEFAULT_CHUNK_SIZE,
+    workers: int | None = None,
+) -> tuple[bytes, int]:
+    """Rehash the whole tree from scratch, ignoring any cached state.
+
+    Returns the root and the number of leaves.
+    """
+    entries = manifest.build_manifest(root, prehash, chunk_size, workers).entries
+    tree = MerkleTree.build(
+        [leaf_hash(e.path, e.size, bytes.fromhex(e.digest)) for e in entries]
+    )
+    return tree.root, len(entries)
+
+
+def root_message(prehash: str, leaves: int, root: bytes) -> bytes:
+    """The message signed for a Merkle root."""
+    return b"".join(
+        (
+            _ROOT_CONTEXT,
+            prehash.encode("ascii"),
+            b"\x00",
+            struct.pack(">Q", leaves),
+            root,
+        )
+    )
+
+
+class MerkleSignature(BaseModel):
+    """A signed Merkle root."""
+
+    algorithm: str
+    prehash: str
+    leaves: int
+    root: bytes
+    signature: bytes
+
+    def dumps(self) -> str:
+        """Serialize to text armor with the tree parameters as headers."""
+        headers = {
+            "Algorithm": self.algorithm,
+            "Prehash": self.prehash,
+            "Leaves": str(self.leaves),
+            "Root": self.root.hex(),
+        }
+        return keys.armor(SIGNATURE_LABEL, self.signature, headers)
+
+    @classmethod
+    def loads(cls, text: str) -> "MerkleSignature":
+        """Parse a Merkle signature written by :meth:`dumps`."""
+        label, headers, signature = keys.dearmor(text)
+        if label != SIGNATURE_LABEL:
+            raise keys.KeyFileError(f"Not a Merkle signature: {label}")
+        try:
+            result = cls(
+                algorithm=headers["Algorithm"],
+                prehash=headers["Prehash"],
+                leaves=int(headers["Leaves"]),
+                root=bytes.fromhex(headers["Root"]),
+                signature=signature,
+            )
+        except (KeyError, ValueError) as e:
+            raise keys.KeyFileError(f"Invalid Merkle signature header: {e}") from e
+        if result.prehash not in signing.PREHASH_ALGORITHMS:
+            raise keys.KeyFileError(f"Unknown pre-hash algorithm: {result.prehash}")
+        return result
+
+    def verify(self, public_key: bytes) -> bool:
+        """Check the signature over the root."""
+        message = root_message(self.prehash, self.leaves, self.root)
+        return lib.Signature(self.algorithm).verify(message, self.signature, public_key)
+
+
+def sign_root(algorithm: str, secret_key: bytes, state: MerkleState) -> MerkleSignature:
+    """Sign the root of an up-to-date Merkle state."""
+    root = state.tree().root
+    signer = lib.Signature(algorithm)
+    signature = signer.sign(
+        root_message(state.prehash, len(state.leaves), root), secret_key
+    )
+    return MerkleSignature(
+        algorithm=signer.name,
+        prehash=state.prehash,
+        leaves=len(state.leaves),
+        root=root,
+        signature=signature,
+    )
+
+
+class MerkleProof(BaseModel):
+    """Inclusion proof for one file in a signed tree."""
+
+    path: str
+    size: int
+    index: int
+    leaves: int
+    siblings: list[bytes] = Field(default_factory=list)
+
+    def dumps(self) -> str:
+        """Serialize to text armor; the body is the concatenated siblings."""
+        headers = {
+            "Path": self.path,
+            "Size": str(self.size),
+            "Index": str(self.index),
+            "Leaves": str(self.leaves),
+        }
+        return keys.armor(PROOF_LABEL, b"".join(self.siblings), headers)
+
+    @classmethod
+    def loads(cls, text: str) -> "MerkleProof":
+        """Parse a proof written by :meth:`dumps`."""
+        label, headers, body = keys.dearmor(text)
+        if label != PROOF_LABEL or len(body) % NODE_SIZE:
+            raise keys.KeyFileError("Not a Merkle inclusion proof")
+        try:
+            return cls(
+                path=headers["Path"],
+                size=int(headers["Size"]),
+                index=int(headers["Index"]),
+                leaves=int(headers["Leaves"]),
+                siblings=[
+                    body[i : i + NODE_SIZE] for i in range(0, len(body), NODE_SIZE)
+                ],
+            )
+        except (KeyError, ValueError) as e:
+            raise keys.KeyFileError(f"Invalid Merkle proof header: {e}") from e
+
+
+def make_proof(state: MerkleState, path: str) -> MerkleProof:
+    """Build the inclusion proof for ``path`` from a persisted state."""
+    index = state.index_of(path)
+    return MerkleProof(
+        path=path,
+        size=state.leaves[index].size,
+        index=index,
+        leaves=len(state.leaves),
+        siblings=state.tree().proof(index),
+    )
+
+
+def verify_inclusion(
+    public_key: bytes,
+    file_path: str | Path,
+    proof: MerkleProof,
+    signed: MerkleSignature,
+    chunk_size: int = signing.DEFAULT_CHUNK_SIZE,
+) -> bool:
+    """Check one file against a signed root without touching the rest of the tree."""
+    if proof.leaves != signed.leaves or not 0 <= proof.index < proof.leaves:
+        return False
+    digest, size = signing.hash_file(file_path, signed.prehash, chunk_size)
+    if size != proof.size:
+        return False
+    leaf = leaf_hash(proof.path, size, digest)
+    try:
+        root = root_from_proof(leaf, proof.index, proof.leaves, proof.siblings)
+    except (StopIteration, ValueError):
+        return False
+    return root == signed.root and signed.verify(public_key)
@@ -0,0 +1,267 @@
+"""Native call instrumentation for PQC Readiness Lab.
+
+When enabled, every liboqs keypair/encaps/decaps/sign/verify call made
+through :mod:`pqc_lab.lib` (including the batch helpers) records a call
+count, an error count, the bytes passed in and out, and a latency histogram,
+keyed by algorithm and operation; for verify, an error is a rejected
+signature. When disabled each call site pays a single module attribute check.
+
+Instrumentation is off unless the ``PQC_LAB_METRICS`` environment variable is
+set to a non-zero value or :func:`enable` is called (the handshake server does
+so when it exports metrics). Snapshots render as JSON or Prometheus text, and
+:func:`start_http_server` serves both for scraping.
+"""
+
+import bisect
+import json
+import os
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import asyncio
+
+# Checked by lib before timing a call; use enable() to change it
+enabled = os.environ.get("PQC_LAB_METRICS", "0") not in ("", "0")
+
+# Histogram bucket upper bounds in nanoseconds (1 µs to 10 s); larger
+# observations land in the implicit +Inf bucket
+BUCKETS_NS = (
+    1_000,
+    2_500,
+    5_000,
+    10_000,
+    25_000,
+    50_000,
+    100_000,
+    250_000,
+    500_000,
+    1_000_000,
+    2_500_000,
+    5_000_000,
+    10_000_000,
+    100_000_000,
+    1_000_000_000,
+    10_000_000_000,
+)
+
+# Port ``pqc-lab stats`` queries when none is given
+DEFAULT_PORT = 9464
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class OperationMetrics:
+    """Counters and latency histogram for one algorithm and operation."""
+
+    __slots__ = ("buckets", "bytes", "calls", "errors", "total_ns")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.bytes = 0
+        self.total_ns = 0
+        self.buckets = [0] * (len(BUCKETS_NS) + 1)
+
+
+_operations: dict[tuple[str, str], OperationMetrics] = {}
+_lock = threading.Lock()
+
+
+def enable(on: bool = True) -> None:
+    """Turn instrumentation of native calls on or off."""
+    global enabled
+    enabled = on
+
+
+def record(
+    algorithm: str,
+    operation: str,
+    elapsed_ns: int,
+    nbytes: int = 0,
+    errors: int = 0,
+    calls: int = 1,
+) -> None:
+    """Record ``calls`` native calls that took ``elapsed_ns`` in total.
+
+    A batch is recorded once with its total time; each of its calls is
+    counted in the histogram bucket of the mean per-call latency.
+    """
+    bucket = bisect.bisect_left(BUCKETS_NS, elapsed_ns // calls) if calls else 0
+    key = (algorithm, operation)
+    with _lock:
+        op = _operations.get(key)
+        if op is None:
+            op = _operations[key] = OperationMetrics()
+        op.calls += calls
+        op.errors += errors
+        op.bytes += nbytes
+        op.total_ns += elapsed_ns
+        op.buckets[bucket] += calls
+
+
+def reset() -> None:
+    """Discard everything recorded so far."""
+    with _lock:
+        _operations.clear()
+
+
+def snapshot(extra: dict[str, float] | None = None) -> dict[str, Any]:
+    """JSON-ready copy of the recorded metrics.
+
+    ``extra`` adds application counters (e.g. handshake server totals) that
+    are exported alongside the per-operation data.
+    """
+    with _lock:
+        operations = [
+            {
+                "algorithm": algorithm,
+                "operation": operation,
+                "calls": op.calls,
+                "errors": op.errors,
+                "bytes": op.bytes,
+                "total_ns": op.total_ns,
+                "buckets": list(op.buckets),
+            }
+            for (algorithm, operation), op in sorted(_operations.items())
+        ]
+    return {
+        "enabled": enabled,
+        "bucket_bounds_ns": list(BUCKETS_NS),
+        "operations": operations,
+        "counters": dict(extra or {}),
+    }
+
+
+def quantile_ns(buckets: list[int], q: float) -> float:
+    """Upper bound of the bucket holding quantile ``q`` (``inf`` past 10 s)."""
+    total = sum(buckets)
+    if not total:
+        return 0.0
+    rank = q * total
+    seen = 0
+    for bound, count in zip([*BUCKETS_NS, float("inf")], buckets):
+        seen += count
+        if seen >= rank:
+            return float(bound)
+    return float("inf")
+
+
+def format_json(data: dict[str, Any]) -> str:
+    """Render a snapshot as JSON."""
+    return json.dumps(data, indent=2)
+
+
+def _labels(**labels: str) -> str:
+    """Prometheus label set, escaping backslashes and quotes in values."""
+    pairs = []
+    for name, value in labels.items():
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_prometheus(data: dict[str, Any]) -> str:
+    """Render a snapshot in the Prometheus text exposition format."""
+    ops = data["operations"]
+    lines = []
+    for metric, field, kind, help_text in (
+        ("pqc_lab_native_calls_total", "calls", "counter", "liboqs calls"),
+        ("pqc_lab_native_errors_total", "errors", "counter", "Failed liboqs calls"),
+        ("pqc_lab_native_bytes_total", "bytes", "counter", "Bytes in and out"),
+    ):
+        lines += [f"# HELP {metric} {help_text}.", f"# TYPE {metric} {kind}"]
+        for op in ops:
+            labels = _labels(algorithm=op["algorithm"], operation=op["operation"])
+            lines.append(f"{metric}{labels} {op[field]}")
+
+    metric = "pqc_lab_native_duration_seconds"
+    lines += [f"# HELP {metric} liboqs call latency.", f"# TYPE {metric} histogram"]
+    bounds = [f"{b / 1e9:g}" for b in data["bucket_bounds_ns"]] + ["+Inf"]
+    for op in ops:
+        cumulative = 0
+        for le, count in zip(bounds, op["buckets"]):
+            cumulative += count
+            labels = _labels(
+                algorithm=op["algorithm"], operation=op["operation"], le=le
+            )
+            lines.append(f"{metric}_bucket{labels} {cumulative}")
+        labels = _labels(algorithm=op["algorithm"], operation=op["operation"])
+        lines.append(f"{metric}_sum{labels} {op['total_ns'] / 1e9:g}")
+        lines.append(f"{metric}_count{labels} {op['calls']}")
+
+    for name, value in sorted(data["counters"].items()):
+        lines += [f"# TYPE pqc_lab_{name} gauge", f"pqc_lab_{name} {value:g}"]
+    return "\n".join(lines) + "\n"
+
+
+def format_text(data: dict[str, Any]) -> str:
+    """Render a snapshot as a table of per-operation totals and latencies."""
+    lines = [
+        (
+            f"{'algorithm':<12} {'operation':<8} {'calls':>10} {'errors':>7} "
+            f"{'MiB':>9} {'mean':>9} {'p50≤':>9} {'p99≤':>9}  (µs)"
+        )
+    ]
+    for op in data["operations"]:
+        mean = op["total_ns"] / op["calls"] / 1e3 if op["calls"] else 0.0
+        p50 = quantile_ns(op["buckets"], 0.5) / 1e3
+        p99 = quantile_ns(op["buckets"], 0.99) / 1e3
+        lines.append(
+            f"{op['algorithm']:<12} {op['operation']:<8} {op['calls']:>10} "
+            f"{op['errors']:>7} {op['bytes'] / 2**20:>9.2f} {mean:>9.1f} "
+            f"{p50:>9g} {p99:>9g}"
+        )
+    if not data["operations"]:
+        state = "enabled" if data["enabled"] else "disabled"
+        lines.append(f"(no native calls recorded; instrumentation {state})")
+    for name, value in sorted(data["counters"].items()):
+        lines.append(f"{name}: {value:g}")
+    return "\n".join(lines)
+
+
+async def start_http_server(
+    host: str, port: int, counters: Callable[[], dict[str, float]] | None = None
+) -> "asyncio.Server":
+    """Serve ``/metrics`` (Prometheus) and ``/metrics.json`` over HTTP/1.0.
+
+    ``counters`` is called per request for application counters to include.
+    """
+    import asyncio
+
+    async def respond(
+        reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            request = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 10)
+            method, _, rest = request.decode("latin-1").partition(" ")
+            path = rest.split(" ", 1)[0].split("?", 1)[0]
+            data = snapshot(counters() if counters else None)
+            if method != "GET":
+                status, ctype, body = "405 Method Not Allowed", "text/plain", ""
+            elif path == "/metrics":
+                status, ctype = "200 OK", PROMETHEUS_CONTENT_TYPE
+                body = format_prometheus(data)
+            elif path == "/metrics.json":
+                status, ctype, body = "200 OK", "application/json", format_json(data)
+            else:
+                status, ctype, body = "404 Not Found", "text/plain", ""
+            payload = body.encode()
+            writer.write(
+                f"HTTP/1.0 {status}\r\nContent-Type: {ctype}\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode()
+                + payload
+            )
+            await writer.drain()
+        except (
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            OSError,
+        ):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(respond, host, port)
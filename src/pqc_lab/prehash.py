@@ -0,0 +1,73 @@
+"""Streaming pre-hash for PQC Readiness Lab signatures.
+
+Files are read in fixed-size chunks into one reusable buffer and fed to a
+SHA3/SHAKE hash; the signed message binds that digest to the hash name and
+input size. Only the standard library is used, so CLI options can be built
+from these definitions without loading pydantic or liboqs, which the
+``--socket`` clients of ``sign`` and ``verify`` never need.
+"""
+
+import hashlib
+import struct
+from pathlib import Path
+
+# Pre-hash functions and their digest sizes in bytes
+PREHASH_ALGORITHMS: dict[str, int] = {
+    "sha3-256": 32,
+    "sha3-512": 64,
+    "shake128": 32,
+    "shake256": 64,
+}
+DEFAULT_PREHASH = "shake256"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MAX_CHUNK_SIZE = 64 * 1024 * 1024
+
+_PREHASH_CONTEXT = b"PQC-LAB-PREHASH-V1\x00"
+
+
+def new_hasher(prehash: str) -> "hashlib._Hash":
+    """Create a pre-hash object by name."""
+    if prehash not in PREHASH_ALGORITHMS:
+        raise ValueError(f"Unknown pre-hash algorithm: {prehash}")
+    return hashlib.new(prehash.replace("-", "_"))
+
+
+def finish_digest(hasher: "hashlib._Hash", prehash: str) -> bytes:
+    """Finalize a pre-hash, fixing the output length of SHAKE functions."""
+    if prehash.startswith("shake"):
+        return hasher.digest(PREHASH_ALGORITHMS[prehash])  # type: ignore[call-arg]
+    return hasher.digest()
+
+
+def hash_file(
+    path: str | Path,
+    prehash: str = DEFAULT_PREHASH,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> tuple[bytes, int]:
+    """Stream ``path`` through the pre-hash, returning ``(digest, size)``."""
+    hasher = new_hasher(prehash)
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    size = 0
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buffer):
+            hasher.update(view[:n])
+            size += n
+    return finish_digest(hasher, prehash), size
+
+
+def prehash_message(prehash: str, size: int, digest: bytes) -> bytes:
+    """The message actually signed: a context label, hash name, size and digest.
+
+    Binding the hash name and input size keeps signatures made with one
+    pre-hash from being reinterpreted under another.
+    """
+    return b"".join(
+        (
+            _PREHASH_CONTEXT,
+            prehash.encode("ascii"),
+            b"\x00",
+            struct.pack(">Q", size),
+            digest,
+        )
+    )
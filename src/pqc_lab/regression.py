@@ -0,0 +1,243 @@
+"""Benchmark baselines and regression comparison for PQC Readiness Lab.
+
+A baseline is a named set of raw benchmark timings (one
+:class:`~pqc_lab.bench.SampleRun` per algorithm) stored as
+``<artifacts>/baselines/<name>.json``. Comparing a new run against it tests
+each operation with a two-sided Mann-Whitney U test, which makes no
+normality assumption about skewed latency distributions, and reports the
+relative change in median latency with a bootstrap confidence interval.
+
+An operation regresses when the difference is significant at the configured
+confidence level and the median slowdown exceeds the threshold.
+"""
+
+import json
+import math
+import random
+import re
+import statistics
+from pathlib import Path
+
+from pydantic import BaseModel, Field, ValidationError
+
+from . import bench, config
+
+_NAME = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]*")
+
+
+class BaselineError(Exception):
+    """A baseline is missing, unreadable or badly named."""
+
+
+class Baseline(BaseModel):
+    """Named raw benchmark timings, keyed by algorithm."""
+
+    name: str
+    runs: dict[str, bench.SampleRun] = Field(default_factory=dict)
+
+
+def baselines_dir() -> Path:
+    """Directory holding saved baselines."""
+    return config.get_artifacts_dir() / "baselines"
+
+
+def baseline_path(name: str) -> Path:
+    """File of baseline ``name``, which must be a plain file name."""
+    if not _NAME.fullmatch(name):
+        raise BaselineError(f"Invalid baseline name: {name!r}")
+    return baselines_dir() / f"{name}.json"
+
+
+def load_baseline(name: str) -> Baseline:
+    """Read baseline ``name``."""
+    path = baseline_path(name)
+    try:
+        return Baseline.model_validate_json(path.read_text())
+    except FileNotFoundError as e:
+        raise BaselineError(f"No baseline named {name!r} ({path})") from e
+    except (OSError, ValidationError) as e:
+        raise BaselineError(f"Cannot read baseline {path}: {e}") from e
+
+
+def save_run(name: str, run: bench.SampleRun) -> Path:
+    """Add ``run`` to baseline ``name``, replacing its algorithm's entry."""
+    path = baseline_path(name)
+    try:
+        baseline = load_baseline(name)
+    except BaselineError:
+        if path.exists():
+            raise
+        baseline = Baseline(name=name)
+    baseline.runs[run.algorithm] = run
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_text(baseline.model_dump_json())
+    tmp.replace(path)
+    return path
+
+
+def list_baselines() -> list[str]:
+    """Names of the saved baselines."""
+    return sorted(p.stem for p in baselines_dir().glob("*.json"))
+
+
+# Statistics
+def mann_whitney_u(a: list[int], b: list[int]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test for ``a`` vs ``b``.
+
+    Uses the normal approximation with tie and continuity corrections,
+    which is accurate for the sample counts benchmarks collect (n >= 20).
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return 1.0
+    pooled = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    n = n1 + n2
+    rank_sum_a = 0.0
+    tie_term = 0
+    i = 0
+    while i < n:
+        j = i
+        while j + 1 < n and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        # Tied values share the mean of ranks i+1 .. j+1
+        rank = (i + j) / 2 + 1
+        rank_sum_a += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        ties = j - i + 1
+        tie_term += ties**3 - ties
+        i = j + 1
+
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def median_change_ci(
+    baseline: list[int],
+    current: list[int],
+    confidence: float,
+    resamples: int,
+    seed: int = 0,
+) -> tuple[float, float]:
+    """Percentile bootstrap interval for the relative change in median.
+
+    The change is ``median(current) / median(baseline) - 1``; resampling
+    is seeded so repeated comparisons of the same data agree.
+    """
+    rng = random.Random(seed)
+    changes = []
+    for _ in range(resamples):
+        base = statistics.median(rng.choices(baseline, k=len(baseline)))
+        cur = statistics.median(rng.choices(current, k=len(current)))
+        changes.append(cur / base - 1 if base else 0.0)
+    changes.sort()
+    tail = round((1 - confidence) / 2 * (resamples - 1))
+    return changes[tail], changes[resamples - 1 - tail]
+
+
+class Comparison(BaseModel):
+    """Baseline vs current timings of one algorithm and operation."""
+
+    algorithm: str
+    operation: str
+    baseline_median_ns: float
+    current_median_ns: float
+    change: float
+    ci_low: float
+    ci_high: float
+    p_value: float
+    significant: bool
+    regression: bool
+
+
+def compare_samples(
+    algorithm: str,
+    operation: str,
+    baseline: list[int],
+    current: list[int],
+    threshold: float,
+    confidence: float,
+    resamples: int,
+) -> Comparison:
+    """Compare one operation's timings; ``threshold`` is a percentage."""
+    base_median = statistics.median(baseline)
+    cur_median = statistics.median(current)
+    change = cur_median / base_median - 1 if base_median else 0.0
+    ci_low, ci_high = median_change_ci(baseline, current, confidence, resamples)
+    p_value = mann_whitney_u(baseline, current)
+    significant = p_value < 1 - confidence
+    return Comparison(
+        algorithm=algorithm,
+        operation=operation,
+        baseline_median_ns=base_median,
+        current_median_ns=cur_median,
+        change=change,
+        ci_low=ci_low,
+        ci_high=ci_high,
+        p_value=p_value,
+        significant=significant,
+        regression=significant and change * 100 > threshold,
+    )
+
+
+def compare_runs(
+    baseline: bench.SampleRun,
+    current: bench.SampleRun,
+    threshold: float | None = None,
+    confidence: float | None = None,
+    resamples: int | None = None,
+) -> list[Comparison]:
+    """Compare every operation the two runs share.
+
+    Threshold, confidence and resample count default to the benchmark
+    configuration.
+    """
+    bench_config = config.get_benchmark_config()
+    return [
+        compare_samples(
+            current.algorithm,
+            operation,
+            baseline.samples_ns[operation],
+            samples,
+            bench_config.regression_threshold if threshold is None else threshold,
+            confidence or bench_config.confidence,
+            resamples or bench_config.bootstrap_resamples,
+        )
+        for operation, samples in current.samples_ns.items()
+        if baseline.samples_ns.get(operation) and samples
+    ]
+
+
+def _format_text(comparisons: list[Comparison], confidence: float) -> str:
+    """Render comparisons as a table, flagging regressions."""
+    ci = f"{confidence:.0%} CI"
+    lines = [
+        (
+            f"{'algorithm':<12} {'operation':<8} {'base µs':>10} {'now µs':>10} "
+            f"{'change':>8} {ci:>19} {'p':>8}"
+        ),
+    ]
+    for c in comparisons:
+        verdict = "REGRESSION" if c.regression else ("*" if c.significant else "")
+        lines.append(
+            f"{c.algorithm:<12} {c.operation:<8} "
+            f"{c.baseline_median_ns / 1e3:>10.1f} {c.current_median_ns / 1e3:>10.1f} "
+            f"{c.change:>+8.1%} [{c.ci_low:>+7.1%}, {c.ci_high:>+7.1%}] "
+            f"{c.p_value:>8.2g} {verdict}".rstrip()
+        )
+    return "\n".join(lines)
+
+
+def format_comparisons(
+    comparisons: list[Comparison], output_format: str, confidence: float
+) -> str:
+    """Render comparisons as ``json`` or ``text``."""
+    if output_format == "json":
+        return json.dumps([c.model_dump() for c in comparisons], indent=2)
+    if output_format == "text":
+        return _format_text(comparisons, confidence)
+    raise ValueError(f"Unknown output format: {output_format}")
@@ -0,0 +1,153 @@
+"""Streaming file signing and verification for PQC Readiness Lab.
+
+Files are never loaded whole: they are read in fixed-size chunks into one
+reusable buffer and fed to a SHA3/SHAKE pre-hash (see :mod:`pqc_lab.prehash`),
+and only that digest is signed with ML-DSA. Memory use is constant
+regardless of input size.
+"""
+
+from pathlib import Path
+
+from pydantic import BaseModel
+
+from . import config, keys, lib, verify_cache
+from .prehash import (
+    DEFAULT_CHUNK_SIZE,
+    DEFAULT_PREHASH,
+    MAX_CHUNK_SIZE,
+    PREHASH_ALGORITHMS,
+    finish_digest,
+    hash_file,
+    new_hasher,
+    prehash_message,
+)
+from .verify_cache import VerifyCache
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "DEFAULT_PREHASH",
+    "MAX_CHUNK_SIZE",
+    "PREHASH_ALGORITHMS",
+    "SIGNATURE_LABEL",
+    "SignatureFile",
+    "finish_digest",
+    "hash_file",
+    "new_hasher",
+    "prehash_message",
+    "sign_file",
+    "verify_file",
+]
+
+SIGNATURE_LABEL = "PQC-LAB SIGNATURE"
+
+
+class SignatureFile(BaseModel):
+    """A detached signature and the parameters needed to verify it."""
+
+    algorithm: str
+    prehash: str
+    chunk_size: int
+    size: int
+    signature: bytes
+
+    def dumps(self) -> str:
+        """Serialize to text armor with the parameters as headers."""
+        headers = {
+            "Algorithm": self.algorithm,
+            "Prehash": self.prehash,
+            "Chunk-Size": str(self.chunk_size),
+            "Size": str(self.size),
+        }
+        return keys.armor(SIGNATURE_LABEL, self.signature, headers)
+
+    @classmethod
+    def loads(cls, text: str) -> "SignatureFile":
+        """Parse a signature file written by :meth:`dumps`."""
+        label, headers, signature = keys.dearmor(text)
+        if label != SIGNATURE_LABEL:
+            raise keys.KeyFileError(f"Not a signature file: {label}")
+        try:
+            result = cls(
+                algorithm=headers["Algorithm"],
+                prehash=headers["Prehash"],
+                chunk_size=int(headers["Chunk-Size"]),
+                size=int(headers["Size"]),
+                signature=signature,
+            )
+        except (KeyError, ValueError) as e:
+            raise keys.KeyFileError(f"Invalid signature header: {e}") from e
+        if result.prehash not in PREHASH_ALGORITHMS:
+            raise keys.KeyFileError(f"Unknown pre-hash algorithm: {result.prehash}")
+        if not 0 < result.chunk_size <= MAX_CHUNK_SIZE:
+            raise keys.KeyFileError(f"Invalid chunk size: {result.chunk_size}")
+        return result
+
+
+def sign_file(
+    algorithm: str,
+    secret_key: bytes,
+    path: str | Path,
+    prehash: str = DEFAULT_PREHASH,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    public_key: bytes | None = None,
+) -> SignatureFile:
+    """Sign a file of any size in constant memory.
+
+    If ``public_key`` is given the new signature is checked against it, which
+    catches mismatched key files without hashing the input a second time.
+    """
+    digest, size = hash_file(path, prehash, chunk_size)
+    signer = lib.Signature(algorithm)
+    message = prehash_message(prehash, size, digest)
+    signature = signer.sign(message, secret_key)
+    if public_key is not None and not signer.verify(message, signature, public_key):
+        raise lib.LibOQSError("Public key does not match private key")
+    return SignatureFile(
+        algorithm=signer.name,
+        prehash=prehash,
+        chunk_size=chunk_size,
+        size=size,
+        signature=signature,
+    )
+
+
+def verify_file(
+    public_key: bytes,
+    path: str | Path,
+    signature_file: SignatureFile,
+    cache: VerifyCache | None = None,
+) -> bool:
+    """Verify a file against a detached signature, streaming the input.
+
+    With a ``cache``, a file whose size, mtimes and inode are unchanged reuses
+    its digest (if ``trust_mtime`` is configured), and a previously
+    successful verification is not repeated.
+    """
+    st = Path(path).stat()
+    if st.st_size != signature_file.size:
+        return False
+
+    prehash = signature_file.prehash
+    trust_mtime = cache is not None and config.get_cache_config().trust_mtime
+    key = verify_cache.file_key(path, st, prehash)
+    digest = cache.get_digest(key) if cache is not None and trust_mtime else None
+    if digest is None:
+        digest, size = hash_file(path, prehash, signature_file.chunk_size)
+        if size != st.st_size:
+            return False
+        if cache is not None:
+            cache.put_digest(key, digest)
+
+    message = prehash_message(prehash, st.st_size, digest)
+    algorithm, signature = signature_file.algorithm, signature_file.signature
+    if cache is not None:
+        verified = verify_cache.verification_key(
+            algorithm, public_key, message, signature
+        )
+        if cache.is_verified(verified):
+            return True
+
+    valid = lib.Signature(algorithm).verify(message, signature, public_key)
+    if valid and cache is not None:
+        cache.mark_verified(verified)
+    return valid
@@ -0,0 +1,173 @@
+"""Verification result cache for PQC Readiness Lab.
+
+Two bounded LRU maps, kept in memory and persisted to the artifacts
+directory:
+
+* file digests keyed by (path, size, mtime, ctime, inode, pre-hash), so
+  unchanged files need not be rehashed when ``trust_mtime`` is enabled.
+  The ctime catches files edited and then ``touch``-ed back to their old
+  mtime, since users cannot set it;
+* successful verifications keyed by (algorithm, public-key hash, signed
+  message hash, signature hash), so repeated checks skip ML-DSA verify.
+
+Only successful verifications are cached; a failure is always recomputed.
+Anyone who can write the cache file can make verification pass, so it must
+live somewhere only the verifying user can write.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+_VERSION = 1
+
+
+def _sha256(data: bytes) -> bytes:
+    return hashlib.sha256(data).digest()
+
+
+def file_key(path: str | Path, st: os.stat_result, prehash: str) -> str:
+    """Cache key for the digest of a file in its current on-disk state."""
+    return "|".join(
+        (
+            str(Path(path).resolve()),
+            str(st.st_size),
+            str(st.st_mtime_ns),
+            str(st.st_ctime_ns),
+            str(st.st_ino),
+            prehash,
+        )
+    )
+
+
+def verification_key(
+    algorithm: str, public_key: bytes, message: bytes, signature: bytes
+) -> str:
+    """Cache key for one (algorithm, key, message, signature) verification."""
+    return _sha256(
+        algorithm.encode()
+        + b"\x00"
+        + _sha256(public_key)
+        + _sha256(message)
+        + _sha256(signature)
+    ).hex()
+
+
+class VerifyCache:
+    """In-memory LRU of digests and verifications with an on-disk copy."""
+
+    def __init__(self, path: Path | None = None, max_entries: int = 4096) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._digests: OrderedDict[str, str] = OrderedDict()
+        self._verified: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path | None = None) -> "VerifyCache":
+        """Load the cache from disk; a missing or corrupt file starts empty."""
+        cache_config = config.get_cache_config()
+        if path is None:
+            path = config.get_artifacts_dir() / cache_config.filename
+        cache = cls(path, cache_config.max_entries)
+        try:
+            data = json.loads(path.read_text())
+            if data.get("version") == _VERSION:
+                for key, digest in data.get("digests", []):
+                    cache._digests[key] = digest
+                for key in data.get("verified", []):
+                    cache._verified[key] = None
+                cache._evict()
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, TypeError) as e:
+            logger.debug(f"Ignoring unreadable verification cache {path}: {e}")
+        return cache
+
+    def save(self) -> None:
+        """Write the cache to disk atomically if it changed.
+
+        Failing to persist is logged, never raised: the cache is advisory.
+        """
+        if self.path is None or not self._dirty:
+            return
+        with self._lock:
+            data = {
+                "version": _VERSION,
+                "digests": [[k, v] for k, v in self._digests.items()],
+                "verified": list(self._verified),
+            }
+            self._dirty = False
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not save verification cache {self.path}: {e}")
+
+    def _evict(self) -> None:
+        """Drop least recently used entries beyond ``max_entries``."""
+        for entries in (self._digests, self._verified):
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def get_digest(self, key: str) -> bytes | None:
+        """Cached digest for a file key, marking it recently used."""
+        with self._lock:
+            digest = self._digests.get(key)
+            if digest is None:
+                return None
+            self._digests.move_to_end(key)
+            return bytes.fromhex(digest)
+
+    def put_digest(self, key: str, digest: bytes) -> None:
+        """Remember a file digest."""
+        with self._lock:
+            self._digests[key] = digest.hex()
+            self._digests.move_to_end(key)
+            self._evict()
+            self._dirty = True
+
+    def is_verified(self, key: str) -> bool:
+        """Whether a verification key is known good, marking it recently used."""
+        with self._lock:
+            if key not in self._verified:
+                return False
+            self._verified.move_to_end(key)
+            return True
+
+    def mark_verified(self, key: str) -> None:
+        """Remember a successful verification."""
+        with self._lock:
+            self._verified[key] = None
+            self._verified.move_to_end(key)
+            self._evict()
+            self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._digests) + len(self._verified)
+
+
+_cache: VerifyCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_verify_cache() -> VerifyCache | None:
+    """The process-wide cache, loaded on first use; ``None`` when disabled."""
+    global _cache
+    if not config.get_cache_config().enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = VerifyCache.load()
+        return _cache
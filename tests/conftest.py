@@ -0,0 +1,17 @@
+"""Shared test fixtures."""
+
+from pathlib import Path
+
+import pytest
+
+from pqc_lab import config, lib
+
+requires_liboqs = pytest.mark.skipif(
+    not lib.is_available(), reason="liboqs library not available"
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_artifacts(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep caches and outputs written by library code out of the work tree."""
+    monkeypatch.setattr(config.config.file, "artifacts_dir", tmp_path / "artifacts")
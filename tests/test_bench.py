@@ -0,0 +1,164 @@
+"""Tests for the benchmark engine."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+from conftest import requires_liboqs
+
+from pqc_lab import bench, cli
+
+
+def test_percentile_interpolates() -> None:
+    """Test percentiles interpolate between sorted samples."""
+    samples = [10, 20, 30, 40, 50]
+    assert bench.percentile(samples, 0) == 10
+    assert bench.percentile(samples, 50) == 30
+    assert bench.percentile(samples, 90) == pytest.approx(46)
+    assert bench.percentile([], 50) == 0.0
+
+
+def test_histogram_covers_all_samples() -> None:
+    """Test every sample lands in exactly one histogram bin."""
+    samples = sorted([100, 120, 150, 400, 1000, 5000, 5000, 90000])
+    bins = bench.histogram(samples, bins=5)
+
+    assert len(bins) == 5
+    assert sum(b.count for b in bins) == len(samples)
+    assert bins[0].lower_ns == 100
+    assert bins[-1].upper_ns > 90000
+
+
+def test_format_results() -> None:
+    """Test json and csv rendering of a summarised result."""
+    result = bench.BenchmarkResult(
+        algorithm="ML-KEM-768",
+        iterations=3,
+        warmup_iterations=0,
+        timestamp="2024-01-01T00:00:00+00:00",
+        operations=[bench.summarize("encaps", [1000, 2000, 3000])],
+    )
+
+    data = json.loads(bench.format_results([result], "json"))
+    assert data[0]["operations"][0]["median_ns"] == 2000
+
+    rows = bench.format_results([result], "csv").splitlines()
+    assert rows[0].startswith("algorithm,operation")
+    assert rows[1].startswith("ML-KEM-768,encaps,3,")
+
+
+@requires_liboqs
+def test_run_benchmark() -> None:
+    """Test a small KEM benchmark reports all three operations."""
+    result = bench.run_benchmark("mlkem512", iterations=5, warmup=1)
+
+    assert [op.operation for op in result.operations] == list(bench.KEM_OPERATIONS)
+    assert all(op.iterations == 5 for op in result.operations)
+
+
+def test_format_scaling_csv() -> None:
+    """Test scaling csv has aggregate and per-worker rows."""
+    stats = [bench.summarize("sign", [1000, 2000])]
+    result = bench.ScalingResult(
+        algorithm="ML-DSA-65",
+        iterations=2,
+        warmup_iterations=0,
+        timestamp="2024-01-01T00:00:00+00:00",
+        points=[
+            bench.ScalingPoint(
+                workers=2,
+                wall_ns=4000,
+                cycles_per_sec=1e6,
+                operations=stats,
+                per_worker=[stats, stats],
+            )
+        ],
+    )
+
+    rows = bench.format_scaling(result, "csv").splitlines()
+    assert rows[0].startswith("algorithm,workers,worker,operation")
+    assert [row.split(",")[2] for row in rows[1:]] == ["", "0", "1"]
+
+
+@requires_liboqs
+def test_run_scaling_benchmark() -> None:
+    """Test the scaling mode reports one point per worker count."""
+    result = bench.run_scaling_benchmark("mlkem512", 2, iterations=5, warmup=1)
+
+    assert [p.workers for p in result.points] == [1, 2]
+    assert len(result.points[1].per_worker) == 2
+    assert result.points[0].efficiency == 1.0
+
+
+@requires_liboqs
+def test_run_threaded_scaling_benchmark() -> None:
+    """Test the threaded scaling mode runs every worker in this process."""
+    result = bench.run_scaling_benchmark(
+        "mldsa44", 3, iterations=5, warmup=1, mode="threads"
+    )
+
+    assert result.mode == "threads"
+    assert [len(p.per_worker) for p in result.points] == [1, 2, 3]
+    assert all(op.iterations == 15 for op in result.points[2].operations)
+    assert "threads (GIL" in bench.format_scaling(result, "text")
+
+
+def test_sweep_sizes_and_crossover() -> None:
+    """Test sweep sizes are geometric and the crossover must persist."""
+    assert bench.sweep_sizes(32, 2048) == [32, 128, 512, 2048]
+    assert bench.sweep_sizes(32, 1000, factor=10) == [32, 320, 1000]
+
+    sizes = [1, 2, 3, 4]
+    assert bench._crossover([5, 5, 5, 5], [9, 4, 6, 4], sizes) == 4
+    assert bench._crossover([5, 5, 5, 5], [9, 4, 4, 4], sizes) == 2
+    assert bench._crossover([5, 5, 5, 5], [9, 9, 9, 9], sizes) is None
+
+
+@requires_liboqs
+def test_size_sweep() -> None:
+    """Test a small sweep times both modes at every size."""
+    result = bench.run_size_sweep("mldsa44", [32, 4096], iterations=3, warmup=1)
+
+    assert [(p.size, p.mode) for p in result.points] == [
+        (32, "direct"),
+        (32, "prehash"),
+        (4096, "direct"),
+        (4096, "prehash"),
+    ]
+    assert all(p.sign_mb_per_sec > 0 for p in result.points)
+    assert all(p.hash_median_ns > 0 for p in result.points if p.mode == "prehash")
+    rows = bench.format_sweep(result, "csv").splitlines()
+    assert len(rows) == 5 and rows[1].startswith("ML-DSA-44,32,direct,3,")
+
+
+def test_classical_benchmarks_share_the_harness() -> None:
+    """Test classical algorithms run without liboqs and report sizes."""
+    x25519 = bench.run_benchmark("x25519", iterations=5, warmup=1)
+    ecdsa = bench.run_benchmark("ecdsa-p256", iterations=5, warmup=1)
+
+    assert x25519.algorithm == "X25519"
+    assert [op.operation for op in x25519.operations] == list(bench.KEM_OPERATIONS)
+    assert x25519.sizes["ciphertext"] == 32
+    assert [op.operation for op in ecdsa.operations] == list(bench.SIG_OPERATIONS)
+    assert bench.is_kem("X25519") and not bench.is_kem("ECDSA-P256")
+
+    text = bench.format_suite([x25519, ecdsa], "text", ("ML-KEM-768",))
+    assert "Key establishment:" in text and "Signatures:" in text
+    assert "vs X25519" in text and "vs ECDSA-P256" in text
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--count", "0"],
+        ["--warmup", "-1"],
+        ["sweep", "--count", "-5"],
+        ["classical", "--count", "0"],
+        ["compare", "old", "--warmup", "-1"],
+    ],
+)
+def test_rejects_empty_runs(args: list[str]) -> None:
+    """Test iteration counts that leave nothing to measure are usage errors."""
+    result = CliRunner().invoke(cli.main, ["bench", *args])
+    assert result.exit_code == 2
+    assert "Invalid value" in result.output
@@ -0,0 +1,137 @@
+"""Tests for the cached liboqs capability probe."""
+
+from pathlib import Path
+
+import pytest
+from conftest import requires_liboqs
+
+from pqc_lab import capabilities, lib
+
+
+def _caps(version: str = "0.10.0") -> capabilities.Capabilities:
+    return capabilities.Capabilities(
+        library_path="/opt/liboqs.so",
+        library_mtime_ns=1,
+        liboqs_version=version,
+        kems={
+            "ML-KEM-768": capabilities.AlgorithmDetails(
+                name="ML-KEM-768",
+                type="KEM",
+                claimed_nist_level=3,
+                length_public_key=1184,
+                length_secret_key=2400,
+            )
+        },
+    )
+
+
+class FakeLibrary:
+    """Stands in for a loaded liboqs build whose version can change."""
+
+    def __init__(self) -> None:
+        self.version = "0.10.0"
+        self.probes: list[str] = []
+
+    def identity(self) -> tuple[str, int, str]:
+        return "/opt/liboqs.so", 1, self.version
+
+    def probe(self) -> capabilities.Capabilities:
+        self.probes.append(self.version)
+        return _caps(self.version)
+
+
+@pytest.fixture
+def fake_library(monkeypatch: pytest.MonkeyPatch) -> FakeLibrary:
+    """Route capability discovery to a :class:`FakeLibrary`."""
+    fake = FakeLibrary()
+    monkeypatch.setattr(capabilities, "_capabilities", None)
+    monkeypatch.setattr(capabilities, "_library_identity", fake.identity)
+    monkeypatch.setattr(capabilities, "probe", fake.probe)
+    return fake
+
+
+def test_cache_reused_across_processes(
+    tmp_path: Path, fake_library: FakeLibrary, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a second process loads the disk cache instead of probing."""
+    path = tmp_path / "capabilities.json"
+    first = capabilities.get_capabilities(path)
+    assert fake_library.probes == ["0.10.0"] and path.exists()
+
+    monkeypatch.setattr(capabilities, "_capabilities", None)
+    assert capabilities.get_capabilities(path) == first
+    assert fake_library.probes == ["0.10.0"]
+
+
+def test_cache_invalidated_by_new_library(
+    tmp_path: Path, fake_library: FakeLibrary
+) -> None:
+    """Test a different liboqs version re-probes and rewrites the cache."""
+    path = tmp_path / "capabilities.json"
+    capabilities.get_capabilities(path)
+    fake_library.version = "0.11.0"
+
+    caps = capabilities.get_capabilities(path)
+    assert caps is not None and caps.liboqs_version == "0.11.0"
+    assert fake_library.probes == ["0.10.0", "0.11.0"]
+    assert "0.11.0" in path.read_text()
+
+
+def test_corrupt_cache_is_reprobed(tmp_path: Path, fake_library: FakeLibrary) -> None:
+    """Test an unreadable cache file is replaced by a fresh probe."""
+    path = tmp_path / "capabilities.json"
+    path.write_text("{not json")
+
+    assert capabilities.get_capabilities(path) is not None
+    assert fake_library.probes == ["0.10.0"]
+    assert capabilities.Capabilities.model_validate_json(path.read_text())
+
+
+@requires_liboqs
+def test_probe_reports_exact_sizes() -> None:
+    """Test probed sizes agree with the instantiated algorithms."""
+    caps = capabilities.probe()
+    assert caps is not None
+    assert "ML-KEM-768" in caps.kems and "ML-DSA-65" in caps.sigs
+
+    kem = lib.KEM("ML-KEM-768")
+    details = caps.kems["ML-KEM-768"]
+    assert details.length_public_key == kem.length_public_key
+    assert details.length_ciphertext == kem.length_ciphertext
+    assert lib.get_kem_details("mlkem768") == details.model_dump()
+
+
+class _FrozenFunction:
+    """A native function whose prototype must not be touched after load."""
+
+    __slots__ = ("_result",)
+
+    def __init__(self, result: object) -> None:
+        self._result = result
+
+    def __call__(self, *args: object) -> object:
+        return self._result(*args) if callable(self._result) else self._result
+
+
+def test_enumeration_leaves_prototypes_alone() -> None:
+    """Test enumerating algorithms only calls the functions lib declared."""
+    names = [b"ML-KEM-512", b"ML-KEM-768"]
+    oqs = type(
+        "FrozenLibrary",
+        (),
+        {
+            "OQS_KEM_alg_count": _FrozenFunction(len(names)),
+            "OQS_KEM_alg_identifier": _FrozenFunction(names.__getitem__),
+            "OQS_KEM_alg_is_enabled": _FrozenFunction(lambda name: name != names[0]),
+        },
+    )()
+
+    # Assigning argtypes/restype on a _FrozenFunction raises AttributeError
+    assert capabilities._enabled(oqs, "KEM") == ["ML-KEM-768"]  # type: ignore[arg-type]
+
+
+def test_enumeration_without_symbols_lists_nothing() -> None:
+    """Test a liboqs build lacking the enumeration functions lists no algorithms."""
+    oqs = type("OldLibOQS", (), {"OQS_SIG_alg_count": _FrozenFunction(1)})()
+    assert capabilities._enabled(oqs, "KEM") == []  # type: ignore[arg-type]
+    assert capabilities._enabled(oqs, "SIG") == []  # type: ignore[arg-type]
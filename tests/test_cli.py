@@ -0,0 +1,103 @@
+"""Tests for CLI startup cost and lazy command loading."""
+
+import ctypes.util
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+
+import click
+import pytest
+
+from pqc_lab import cli, config, lib
+
+# Modules a ``--help``/``--version`` run must not import
+HEAVY_MODULES = (
+    "pydantic",
+    "ctypes",
+    "asyncio",
+    "oqs",
+    "pqc_lab.lib",
+    "pqc_lab.commands",
+)
+
+# A ``--version`` run may take this many bare interpreter starts: importing
+# click costs a few, pydantic and liboqs would add several more
+STARTUP_MARGIN = 8
+
+
+def _run(code: str) -> str:
+    """Run ``code`` in a fresh interpreter and return its stdout."""
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+
+
+def _run_cli(option: str) -> tuple[str, list[str]]:
+    """Output of ``pqc-lab <option>`` and the modules it imported."""
+    out = _run(
+        "import sys\n"
+        "from pqc_lab.cli import main\n"
+        "try:\n"
+        f"    main([{option!r}])\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(' '.join(sys.modules))\n"
+    )
+    return out.rsplit("\n", 2)[0], out.split()
+
+
+def _best_time(args: list[str], runs: int = 5) -> float:
+    """Fastest wall time of ``runs`` executions of ``args``."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, capture_output=True, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def test_help_imports_nothing_heavy() -> None:
+    """Test --help lists every command without importing command modules."""
+    help_text, loaded = _run_cli("--help")
+    for name in cli.COMMANDS:
+        assert f"  {name} " in help_text
+    assert not [m for m in loaded if m.startswith(HEAVY_MODULES)]
+
+
+def test_version_imports_nothing_heavy() -> None:
+    """Test --version loads neither pydantic nor the liboqs binding."""
+    version, loaded = _run_cli("--version")
+    assert version.startswith("pqc-lab, version ")
+    assert not [m for m in loaded if m.startswith(HEAVY_MODULES)]
+
+
+def test_startup_time(record_property: Callable[[str, object], None]) -> None:
+    """Benchmark ``pqc-lab --version`` against a bare interpreter start."""
+    baseline = _best_time([sys.executable, "-c", "pass"])
+    startup = _best_time([sys.executable, "-m", "pqc_lab.cli", "--version"])
+    record_property("startup_overhead_ms", round((startup - baseline) * 1000, 1))
+    # Relative to the interpreter, so slow machines scale both sides
+    assert startup < STARTUP_MARGIN * baseline
+
+
+def test_lazy_help_matches_commands() -> None:
+    """Test registered short help matches each command's own docstring."""
+    ctx = click.Context(cli.main)
+    for name, (_, short_help) in cli.COMMANDS.items():
+        command = cli.main.get_command(ctx, name)
+        assert command is not None
+        assert command.get_short_help_str(200) == short_help
+
+
+def test_liboqs_is_searched_for_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test a missing liboqs triggers a single system search."""
+    calls = []
+    monkeypatch.setattr(lib, "_liboqs_lib", None)
+    monkeypatch.setattr(lib, "_load_attempted", False)
+    monkeypatch.setattr(lib, "_LIB_CANDIDATES", ("/nonexistent/liboqs.so",))
+    monkeypatch.setattr(config.config, "liboqs_path", None)
+    monkeypatch.setattr(ctypes.util, "find_library", lambda n: calls.append(n))
+
+    assert not any(lib.is_available() for _ in range(3))
+    assert calls == ["oqs"]
@@ -0,0 +1,97 @@
+"""Tests for the serve signing daemon and its socket clients."""
+
+import asyncio
+import socket
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from conftest import requires_liboqs
+
+from pqc_lab import cli, daemon, daemon_client, keys, lib
+
+
+def test_protocol_fields_roundtrip() -> None:
+    """Test frames carry their fields and truncated payloads are rejected."""
+    frame = daemon_client.encode(daemon_client.SIGN, ["ML-DSA-65", "", "/tmp/é"])
+    version, kind, length = daemon_client.HEADER.unpack_from(frame)
+    payload = frame[daemon_client.HEADER.size :]
+
+    assert (version, kind, length) == (1, daemon_client.SIGN, len(payload))
+    assert daemon_client.decode_fields(payload) == ["ML-DSA-65", "", "/tmp/é"]
+    with pytest.raises(ValueError):
+        daemon_client.decode_fields(payload[:-1])
+
+
+def test_stale_socket_is_replaced(tmp_path: Path) -> None:
+    """Test a dead daemon's socket is removed but other files are kept."""
+    path = tmp_path / "dead.sock"
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.bind(str(path))
+    daemon.remove_stale_socket(path)
+    assert not path.exists()
+
+    path.write_text("not a socket")
+    with pytest.raises(FileExistsError):
+        daemon.remove_stale_socket(path)
+
+
+@pytest.fixture
+def served_key(tmp_path: Path) -> Iterator[tuple[Path, Path, Path]]:
+    """An ML-DSA-65 keypair and a daemon holding it: ``(socket, pub, priv)``."""
+    public, secret = lib.Signature("mldsa65").keypair()
+    pub, priv = tmp_path / "dsa.pub", tmp_path / "dsa.priv"
+    keys.write_key(pub, "mldsa65", keys.PUBLIC, public)
+    keys.write_key(priv, "mldsa65", keys.PRIVATE, secret)
+
+    signd = daemon.SigningDaemon(tmp_path / "signd.sock", (priv,), workers=2)
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(signd.start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        yield signd.socket_path, pub, priv
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.run_until_complete(signd.close())
+        loop.close()
+    assert not signd.socket_path.exists()
+
+
+@requires_liboqs
+def test_sign_and_verify_via_daemon(
+    tmp_path: Path, served_key: tuple[Path, Path, Path]
+) -> None:
+    """Test --socket signatures verify locally and tampering is detected."""
+    sock, pub, priv = (str(p) for p in served_key)
+    data = tmp_path / "data.bin"
+    data.write_bytes(b"daemon" * 1000)
+    sig = str(tmp_path / "data.sig")
+    common = ["--pub", pub, "--in", str(data), "--sig", sig]
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli.main, ["sign", "--priv", priv, *common, "--socket", sock]
+    )
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(cli.main, ["verify", *common])
+    assert result.exit_code == 0, result.output
+    result = runner.invoke(cli.main, ["verify", *common, "--socket", sock])
+    assert "Signature OK" in result.output
+
+    data.write_bytes(b"tampered" * 750)
+    result = runner.invoke(cli.main, ["verify", *common, "--socket", sock])
+    assert result.exit_code == 1
+    assert "FAILED" in result.output
+
+    # Only keys the daemon was started with can sign
+    other = tmp_path / "other.priv"
+    other.write_text(Path(priv).read_text())
+    result = runner.invoke(
+        cli.main, ["sign", "--priv", str(other), *common, "--socket", sock]
+    )
+    assert result.exit_code == 1
+    assert "not loaded" in result.output
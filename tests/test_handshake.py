@@ -0,0 +1,281 @@
+"""Tests for the asyncio ML-KEM handshake."""
+
+import asyncio
+
+import pytest
+from conftest import requires_liboqs
+
+from pqc_lab import config, handshake
+
+
+def _feed(conn: handshake.FrameConnection, data: bytes, chunk: int) -> None:
+    """Deliver ``data`` the way the event loop does, ``chunk`` bytes at a time."""
+    while data:
+        buffer = conn.get_buffer(chunk)
+        size = min(chunk, len(buffer), len(data))
+        buffer[:size] = data[:size]
+        conn.buffer_updated(size)
+        data = data[size:]
+
+
+def _frame(kind: int, alg: int, payload: bytes, version: int = 1) -> bytes:
+    return handshake._HEADER.pack(version, kind, alg, len(payload)) + payload
+
+
+def test_frame_parsing_in_place() -> None:
+    """Test frames split across reads and larger than the buffer are parsed."""
+
+    async def run() -> None:
+        conn = handshake.FrameConnection(buffer_size=16)
+        stream = (
+            _frame(handshake.CLIENT_HELLO, 2, b"")
+            + _frame(handshake.CLIENT_KEY, 2, bytes(range(100)))
+            + _frame(handshake.DATA, 2, b"abc")
+        )
+        _feed(conn, stream, 5)
+
+        assert await conn.read_frame() == (handshake.CLIENT_HELLO, 2, b"")
+        assert await conn.read_frame() == (handshake.CLIENT_KEY, 2, bytes(range(100)))
+        assert await conn.read_frame() == (handshake.DATA, 2, b"abc")
+        assert conn.bytes_received == len(stream)
+        assert len(conn.get_buffer(-1)) == 16
+
+    asyncio.run(run())
+
+
+def test_frame_rejects_bad_header() -> None:
+    """Test an unknown version or oversize length fails the connection."""
+
+    async def run() -> None:
+        for header in (
+            _frame(handshake.DATA, 2, b"x", version=9),
+            handshake._HEADER.pack(1, handshake.DATA, 2, handshake.MAX_FRAME_SIZE + 1),
+        ):
+            conn = handshake.FrameConnection()
+            _feed(conn, header, len(header))
+            with pytest.raises(handshake.HandshakeError):
+                await conn.read_frame()
+
+    asyncio.run(run())
+
+
+def test_derive_keys_binds_transcript() -> None:
+    """Test key derivation is deterministic and bound to the transcript."""
+    transcript = handshake.transcript_hash("ML-KEM-768", b"pk", b"ct")
+    keys = handshake.derive_keys(b"\x01" * 32, transcript)
+
+    assert keys == handshake.derive_keys(b"\x01" * 32, transcript)
+    assert keys.client_key != keys.server_key
+    other = handshake.derive_keys(
+        b"\x01" * 32, handshake.transcript_hash("ML-KEM-768", b"pk", b"cu")
+    )
+    assert other.server_finished() != keys.server_finished()
+
+
+def test_ticket_store_single_use_and_expiry() -> None:
+    """Test tickets redeem once, only for their algorithm, and expire."""
+    now = [1000.0]
+    store = handshake.TicketStore(60, 16, clock=lambda: now[0])
+    ticket = store.issue("ML-KEM-768", b"\x07" * 32)
+
+    assert store.redeem("ML-KEM-512", ticket) is None
+    assert store.redeem("ML-KEM-768", ticket[:-1] + b"\x00") is None
+    assert store.redeem("ML-KEM-768", ticket) == b"\x07" * 32
+    assert store.redeem("ML-KEM-768", ticket) is None
+
+    # Survives one key rotation, but not past its lifetime
+    now[0] += 30
+    fresh = store.issue("ML-KEM-768", b"\x08" * 32)
+    now[0] += 40
+    store.issue("ML-KEM-768", b"\x09" * 32)
+    assert store.redeem("ML-KEM-768", fresh) == b"\x08" * 32
+    stale = store.issue("ML-KEM-768", b"\x0a" * 32)
+    now[0] += 61
+    assert store.redeem("ML-KEM-768", stale) is None
+
+
+def test_ticket_replay_cache_prunes_by_expiry() -> None:
+    """Test expired tickets leave the replay cache whatever order they came in."""
+    now = [1000.0]
+    store = handshake.TicketStore(60, 2, clock=lambda: now[0])
+    old = store.issue("ML-KEM-768", b"\x01" * 32)
+    now[0] += 50
+    new = store.issue("ML-KEM-768", b"\x02" * 32)
+    # Redeemed newest first: the longer-lived entry is ahead of the other
+    assert store.redeem("ML-KEM-768", new) == b"\x02" * 32
+    assert store.redeem("ML-KEM-768", old) == b"\x01" * 32
+
+    now[0] += 20
+    ticket = store.issue("ML-KEM-768", b"\x03" * 32)
+    assert store.redeem("ML-KEM-768", ticket) == b"\x03" * 32
+    assert store.redeem("ML-KEM-768", new) is None
+
+
+def test_session_ticket_file_roundtrip() -> None:
+    """Test a client ticket survives a text round-trip."""
+    ticket = handshake.SessionTicket("ML-KEM-768", b"t" * 60, b"s" * 32, 2e9)
+    assert handshake.SessionTicket.loads(ticket.dumps()) == ticket
+
+
+@requires_liboqs
+def test_concurrent_handshakes() -> None:
+    """Test many clients complete handshakes against one server."""
+    network = config.NetworkConfig(crypto_workers=2, max_pending_crypto=4)
+
+    async def run() -> list[handshake.HandshakeResult]:
+        server = handshake.HandshakeServer("mlkem768", "127.0.0.1", 0, network)
+        await server.start()
+        try:
+            results = await asyncio.gather(
+                *(
+                    handshake.run_client(
+                        "mlkem768", "127.0.0.1", server.port, f"msg {i}".encode()
+                    )
+                    for i in range(20)
+                )
+            )
+            assert server.stats.accepted == 20
+            return results
+        finally:
+            await server.close()
+
+    results = asyncio.run(run())
+    assert [r.reply for r in results] == [f"msg {i}".encode() for i in range(20)]
+
+
+@requires_liboqs
+def test_keypair_pool_hands_out_each_pair_once() -> None:
+    """Test the pool counts hits and misses, refills, and never reuses a pair."""
+
+    async def run() -> None:
+        pool = handshake.KeypairPool("mlkem512", size=4, low_water=2)
+        first = await pool.take()
+        assert (pool.hits, pool.misses) == (0, 1)
+
+        await pool.fill()
+        taken = [await pool.take() for _ in range(4)]
+        assert pool.hits == 4
+        assert len({pk for pk, _ in [first, *taken]}) == 5
+
+        # Falling to the low-water mark scheduled a background refill
+        while len(pool) < pool.size:
+            await asyncio.sleep(0.01)
+        await pool.close()
+        assert len(pool) == 0
+
+    asyncio.run(run())
+
+
+@requires_liboqs
+def test_session_resumption() -> None:
+    """Test a ticket resumes once and a replay falls back to a full handshake."""
+
+    async def run() -> None:
+        server = handshake.HandshakeServer("mlkem768", "127.0.0.1", 0)
+        await server.start()
+        try:
+            full = await handshake.run_client("mlkem768", "127.0.0.1", server.port)
+            assert not full.resumed and full.ticket is not None
+
+            resumed = await handshake.run_client(
+                "mlkem768", "127.0.0.1", server.port, b"again", ticket=full.ticket
+            )
+            assert resumed.resumed and resumed.reply == b"again"
+            assert resumed.bytes_sent < full.bytes_sent
+            assert resumed.ticket is not None
+            assert resumed.ticket.ticket != full.ticket.ticket
+
+            replayed = await handshake.run_client(
+                "mlkem768", "127.0.0.1", server.port, ticket=full.ticket
+            )
+            assert not replayed.resumed
+            assert server.stats.resumed == 1
+            assert server.stats.resume_rejected == 1
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+@requires_liboqs
+def test_hybrid_handshake() -> None:
+    """Test a full handshake and resumption over the hybrid KEM."""
+
+    async def run() -> None:
+        server = handshake.HandshakeServer("x25519-mlkem768", "127.0.0.1", 0)
+        await server.start()
+        try:
+            full = await handshake.run_client(
+                "x25519-mlkem768", "127.0.0.1", server.port, b"hybrid"
+            )
+            assert full.reply == b"hybrid" and full.ticket is not None
+            assert full.ticket.algorithm == "X25519-ML-KEM-768"
+
+            resumed = await handshake.run_client(
+                "x25519-mlkem768", "127.0.0.1", server.port, ticket=full.ticket
+            )
+            assert resumed.resumed
+        finally:
+            await server.close()
+
+    asyncio.run(run())
+
+
+def test_record_protection_rejects_tampering() -> None:
+    """Test records open in order and fail on a changed header or payload."""
+    keys = handshake.derive_keys(b"\x02" * 32, b"transcript")
+    header = b"\x01\x05\x02\x00\x00\x00\x15"
+
+    for cipher in handshake.CIPHER_IDS:
+        sender = handshake.RecordProtection(cipher, keys.client_key, b"t", b"client")
+        receiver = handshake.RecordProtection(cipher, keys.client_key, b"t", b"client")
+        first, second = sender.seal(header, b"hello"), sender.seal(header, b"hello")
+        assert first != second
+        assert bytes(receiver.open(header, first)) == b"hello"
+
+        with pytest.raises(handshake.HandshakeError):
+            receiver.open(b"\x01\x0a" + header[2:], second)
+        # A failed record still consumes its sequence number
+        tampered = bytearray(second)
+        tampered[0] ^= 1
+        with pytest.raises(handshake.HandshakeError):
+            receiver.open(header, bytes(tampered))
+
+
+@requires_liboqs
+@pytest.mark.parametrize("cipher", ["aes-256-gcm", "chacha20-poly1305"])
+def test_throughput_transfer(cipher: str) -> None:
+    """Test a multi-record transfer is echoed in full over each cipher."""
+    network = config.NetworkConfig(record_size=1000)
+
+    async def run() -> handshake.HandshakeResult:
+        server = handshake.HandshakeServer("mlkem512", "127.0.0.1", 0)
+        await server.start()
+        try:
+            message = await handshake.run_client(
+                "mlkem512",
+                "127.0.0.1",
+                server.port,
+                b"x" * 2500,
+                network,
+                cipher=cipher,
+            )
+            assert message.reply == b"x" * 2500 and message.records == 3
+
+            return await handshake.run_client(
+                "mlkem512",
+                "127.0.0.1",
+                server.port,
+                b"0123456789",
+                network,
+                cipher=cipher,
+                size=100_000,
+            )
+        finally:
+            await server.close()
+
+    result = asyncio.run(run())
+    assert result.cipher == cipher
+    assert result.payload_bytes == 100_000 and result.reply == b""
+    assert result.records == 10_000
+    assert result.throughput > 0
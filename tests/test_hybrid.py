@@ -0,0 +1,44 @@
+"""Tests for the hybrid X25519 + ML-KEM KEM."""
+
+import pytest
+from conftest import requires_liboqs
+
+from pqc_lab import hybrid, lib
+
+pytestmark = requires_liboqs
+
+
+@pytest.mark.parametrize("concurrent", [True, False])
+def test_hybrid_roundtrip(concurrent: bool) -> None:
+    """Test both sides derive the same secret, run concurrently or not."""
+    kem = hybrid.HybridKEM("x25519-mlkem768", concurrent=concurrent)
+    public_key, secret_key = kem.keypair()
+    assert len(public_key) == kem.length_public_key
+    assert len(secret_key) == kem.length_secret_key
+
+    ciphertext, shared_secret = kem.encaps(public_key)
+    assert len(ciphertext) == kem.length_ciphertext
+    assert kem.decaps(ciphertext, secret_key) == shared_secret
+
+
+def test_hybrid_binds_both_legs() -> None:
+    """Test tampering with either leg of the ciphertext changes the secret."""
+    kem = hybrid.HybridKEM("X25519-ML-KEM-768")
+    public_key, secret_key = kem.keypair()
+    ciphertext, shared_secret = kem.encaps(public_key)
+
+    for offset in (0, kem.mlkem.length_ciphertext):
+        tampered = bytearray(ciphertext)
+        tampered[offset] ^= 1
+        assert kem.decaps(bytes(tampered), secret_key) != shared_secret
+
+    with pytest.raises(lib.LibOQSError):
+        kem.decaps(ciphertext[:-1], secret_key)
+
+
+def test_keypair_batch_packs_hybrid_keys() -> None:
+    """Test hybrid keypairs are packed like liboqs batches."""
+    public_keys, secret_keys = hybrid.keypair_batch("x25519-mlkem768", 3)
+    kem = hybrid.new_kem("x25519-mlkem768")
+    assert len(public_keys) == 3 * kem.length_public_key
+    assert len(secret_keys) == 3 * kem.length_secret_key
@@ -0,0 +1,129 @@
+"""Tests for binary key rings and bulk key generation."""
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from conftest import requires_liboqs
+
+from pqc_lab import cli, keyring, keys, lib
+
+
+class _CountingScheme:
+    """Deterministic keypairs: key ``n`` is filled with byte ``n % 256``."""
+
+    def __init__(self, name: str, pk_len: int, sk_len: int) -> None:
+        self.name = name
+        self.length_public_key = pk_len
+        self.length_secret_key = sk_len
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def keypair_into(
+        self, public_key_out: lib.Buffer, secret_key_out: lib.Buffer
+    ) -> None:
+        with self._lock:
+            n = next(self._counter) % 256
+        memoryview(public_key_out)[:] = bytes([n]) * self.length_public_key
+        memoryview(secret_key_out)[:] = bytes([255 - n]) * self.length_secret_key
+
+
+def test_append_and_lookup(tmp_path: Path) -> None:
+    """Test sections append with running IDs and keys are found in place."""
+    path = tmp_path / "ring.bin"
+    first = keyring.append_keys(path, _CountingScheme("A", 3, 5), 600, workers=3)
+    second = keyring.append_keys(path, _CountingScheme("B-LONGER", 7, 2), 10)
+
+    assert (first.first_id, second.first_id, second.count) == (0, 600, 10)
+    assert path.stat().st_mode & 0o777 == 0o600
+    with keyring.Keyring(path) as ring:
+        assert len(ring) == 610
+        assert [s.algorithm for s in ring.sections] == ["A", "B-LONGER"]
+        # Every key made by the parallel workers lands in the file
+        values = {bytes(ring.get(i).public_key)[0] for i in range(600)}
+        assert values == set(range(256))
+        key = ring.get(603)
+        assert (key.algorithm, bytes(key.public_key)) == ("B-LONGER", b"\x03" * 7)
+        assert bytes(key.secret_key) == b"\xfc" * 2
+        del key
+        with pytest.raises(keyring.KeyringError):
+            ring.get(610)
+        with pytest.raises(keyring.KeyringError):
+            ring.get(-1)
+
+
+class _SlowScheme(_CountingScheme):
+    """Counting keypairs slow enough for concurrent appends to overlap."""
+
+    def keypair_into(
+        self, public_key_out: lib.Buffer, secret_key_out: lib.Buffer
+    ) -> None:
+        time.sleep(0.001)
+        super().keypair_into(public_key_out, secret_key_out)
+
+
+def test_concurrent_appends_take_turns(tmp_path: Path) -> None:
+    """Test two appends racing on one key ring both keep all their keys."""
+    path = tmp_path / "ring.bin"
+    schemes = [_SlowScheme("A", 3, 5), _SlowScheme("B", 4, 4)]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(keyring.append_keys, path, s, 100, 1) for s in schemes]
+        sections = sorted((f.result() for f in futures), key=lambda s: s.first_id)
+
+    assert [(s.first_id, s.count) for s in sections] == [(0, 100), (100, 100)]
+    with keyring.Keyring(path) as ring:
+        assert len(ring) == 200
+        for key_id in range(200):
+            key = ring.get(key_id)
+            n = bytes(key.public_key)[0]
+            assert bytes(key.public_key) == bytes([n]) * len(key.public_key)
+            assert bytes(key.secret_key) == bytes([255 - n]) * len(key.secret_key)
+        del key
+
+
+def test_rejects_malformed_files(tmp_path: Path) -> None:
+    """Test files that are not whole key rings fail to open."""
+    path = tmp_path / "ring.bin"
+    keyring.append_keys(path, _CountingScheme("A", 3, 5), 4)
+    data = path.read_bytes()
+
+    for broken in (b"", b"not a key ring at all, nope!!!!!!", data[:-1]):
+        path.write_bytes(broken)
+        with pytest.raises(keyring.KeyringError):
+            keyring.Keyring(path)
+    # An unfinished append (records but no new header) keeps the old ring
+    path.write_bytes(data + b"\x00" * 100)
+    with keyring.Keyring(path) as ring:
+        assert len(ring) == 4
+
+
+@requires_liboqs
+def test_keygen_keyring_and_export(tmp_path: Path) -> None:
+    """Test ``keygen --keyring`` keys export to files that sign and verify."""
+    ring = tmp_path / "devices.ring"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli.main,
+        ["keygen", "--alg", "mldsa44", "--count", "300", "--keyring", str(ring)],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Added keys 0-299" in result.output
+
+    pub, priv = tmp_path / "k.pub", tmp_path / "k.priv"
+    result = runner.invoke(
+        cli.main,
+        ["keyring", "export", str(ring), "299", "--pub", str(pub), "--priv", str(priv)],
+    )
+    assert result.exit_code == 0, result.output
+    sig = lib.Signature("mldsa44")
+    secret_key = keys.read_key(priv, "mldsa44", keys.PRIVATE)
+    public_key = keys.read_key(pub, "mldsa44", keys.PUBLIC)
+    assert sig.verify(b"m", sig.sign(b"m", secret_key), public_key)
+
+    result = runner.invoke(cli.main, ["keygen", "--count", "2"])
+    assert result.exit_code != 0
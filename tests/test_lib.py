@@ -0,0 +1,207 @@
+"""Tests for the liboqs wrapper layer."""
+
+import mmap
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from conftest import requires_liboqs
+
+from pqc_lab import lib
+
+
+class _FakeContext:
+    """Stand-in for a native context that records when it is freed."""
+
+    def __init__(self) -> None:
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_resolve_algorithm() -> None:
+    """Test CLI names map to liboqs names and others pass through."""
+    assert lib.resolve_algorithm("mlkem768") == "ML-KEM-768"
+    assert lib.resolve_algorithm("MLDSA65") == "ML-DSA-65"
+    assert lib.resolve_algorithm("ML-KEM-512") == "ML-KEM-512"
+
+
+def test_context_pool_reuses_and_bounds() -> None:
+    """Test the pool reuses released contexts and frees any overflow."""
+    pool = lib._ContextPool(_FakeContext, max_idle=1)  # type: ignore[type-var]
+    first, second, third = pool.acquire(), pool.acquire(), pool.acquire()
+    for ctx in (first, second, third):
+        pool.release(ctx)
+
+    # One context cached for this thread, one in the shared free-list
+    assert len(pool) == 1
+    assert third.closed and not first.closed and not second.closed
+    assert pool.acquire() is first
+    assert pool.acquire() is second
+
+    pool.release(first)
+    pool.release(second)
+    pool.close()
+    assert first.closed and second.closed
+    fourth = pool.acquire()
+    pool.release(fourth)
+    assert fourth.closed
+
+
+def test_context_pool_is_per_thread() -> None:
+    """Test concurrent threads get distinct contexts and keep their own."""
+    pool = lib._ContextPool(_FakeContext, max_idle=4)  # type: ignore[type-var]
+    barrier = threading.Barrier(4)
+
+    def work(_: int) -> tuple[object, object]:
+        ctx = pool.acquire()
+        barrier.wait()
+        pool.release(ctx)
+        again = pool.acquire()
+        pool.release(again)
+        return ctx, again
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pairs = list(executor.map(work, range(4)))
+
+    assert len({id(ctx) for ctx, _ in pairs}) == 4
+    assert all(ctx is again for ctx, again in pairs)
+
+
+@requires_liboqs
+def test_concurrent_first_use(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test threads racing to load liboqs all see the configured handle."""
+    monkeypatch.setattr(lib, "_liboqs_lib", None)
+    monkeypatch.setattr(lib, "_load_attempted", False)
+    barrier = threading.Barrier(8)
+
+    def roundtrip(_: int) -> object:
+        barrier.wait()
+        handle = lib.get_liboqs()
+        kem = lib.KEM("mlkem512")
+        for _ in range(20):
+            public_key, secret_key = kem.keypair()
+            ciphertext, shared_secret = kem.encaps(public_key)
+            assert kem.decaps(ciphertext, secret_key) == shared_secret
+        return handle
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        handles = set(executor.map(roundtrip, range(8)))
+
+    assert handles == {lib.get_liboqs()} and None not in handles
+
+
+@requires_liboqs
+def test_kem_roundtrip() -> None:
+    """Test ML-KEM encapsulation and decapsulation agree."""
+    kem = lib.KEM("mlkem768")
+    public_key, secret_key = kem.keypair()
+    ciphertext, shared_secret = kem.encaps(public_key)
+
+    assert len(ciphertext) == kem.length_ciphertext
+    assert kem.decaps(ciphertext, secret_key) == shared_secret
+
+
+@requires_liboqs
+def test_signature_roundtrip() -> None:
+    """Test ML-DSA signatures verify and reject tampered messages."""
+    sig = lib.Signature("mldsa65")
+    public_key, secret_key = sig.keypair()
+    signature = sig.sign(b"message", secret_key)
+
+    assert sig.verify(b"message", signature, public_key)
+    assert not sig.verify(b"tampered", signature, public_key)
+
+
+@requires_liboqs
+def test_invalid_input_length() -> None:
+    """Test wrong-sized inputs are rejected before reaching liboqs."""
+    with pytest.raises(lib.LibOQSError):
+        lib.KEM("mlkem512").encaps(b"short")
+
+
+def test_pins_read_buffers_in_place() -> None:
+    """Test any contiguous buffer is pinned by address without copying."""
+    data = bytearray(b"abcdefgh")
+    pins = lib._Pins()
+    address, size = pins.address(memoryview(data)[2:], "message")
+    assert size == 6
+    assert address == pins.address(data, "message")[0] + 2
+    with pytest.raises(BufferError):
+        data.append(0)
+    pins.release()
+    data.append(0)
+
+    assert pins.address(memoryview(array("I", [1, 2])), "message")[1] == 8
+    with pytest.raises(lib.LibOQSError):
+        pins.address(memoryview(data)[::2], "message")
+    with pytest.raises(lib.LibOQSError):
+        lib._output(b"readonly", 4, "signature")
+    with pytest.raises(lib.LibOQSError):
+        lib._output(bytearray(3), 4, "signature")
+
+
+@requires_liboqs
+def test_buffer_inputs_and_outputs(tmp_path: Path) -> None:
+    """Test memoryview, bytearray and mmap inputs and caller-owned outputs."""
+    kem = lib.KEM("mlkem512")
+    public_key = bytearray(kem.length_public_key)
+    secret_key = bytearray(kem.length_secret_key)
+    kem.keypair_into(public_key, memoryview(secret_key))
+    ciphertext, shared_secret = kem.encaps(memoryview(public_key))
+    out = bytearray(kem.length_shared_secret)
+    kem.decaps_into(bytearray(ciphertext), secret_key, out)
+    assert out == shared_secret
+
+    sig = lib.Signature("mldsa44")
+    pk, sk = sig.keypair()
+    path = tmp_path / "message"
+    path.write_bytes(b"x" * 100_000)
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        signature = bytearray(sig.length_signature)
+        length = sig.sign_into(m, memoryview(sk), signature)
+        assert sig.verify(m, memoryview(signature)[:length], pk)
+        assert sig.verify(path.read_bytes(), sig.sign(m, sk), pk)
+
+
+def test_pack_batch_inputs() -> None:
+    """Test batch inputs are packed contiguously and length-checked."""
+    buf, count = lib._pack([b"ab", b"cd", b"ef"], 2, "key")
+    assert (bytes(buf), count) == (b"abcdef", 3)
+
+    data = bytearray(b"abcd")
+    assert lib._pack(data, 2, "key") == (data, 2)
+
+    with pytest.raises(lib.LibOQSError):
+        lib._pack(b"abc", 2, "key")
+
+
+@requires_liboqs
+def test_kem_batch_roundtrip() -> None:
+    """Test batched encaps/decaps agree item by item."""
+    public_keys, secret_keys = lib.kem_keypair_batch("mlkem512", 4)
+    ciphertexts, shared_secrets = lib.kem_encaps_batch(
+        "mlkem512", memoryview(public_keys)
+    )
+
+    assert lib.kem_decaps_batch("mlkem512", ciphertexts, secret_keys) == shared_secrets
+
+
+@requires_liboqs
+def test_sig_batch_roundtrip() -> None:
+    """Test batched signatures verify and report failures per item."""
+    sig = lib.Signature("mldsa44")
+    public_key, secret_key = sig.keypair()
+    messages = [b"one", b"two", b"three"]
+    signatures, lengths = lib.sig_sign_batch("mldsa44", messages, secret_key)
+
+    stride = sig.length_signature
+    items = [
+        (message, bytes(signatures[i * stride : i * stride + lengths[i]]), public_key)
+        for i, message in enumerate(messages)
+    ]
+    items.append((b"tampered", items[0][1], public_key))
+    assert list(lib.sig_verify_batch("mldsa44", items)) == [1, 1, 1, 0]
@@ -0,0 +1,52 @@
+"""Tests for the handshake load generator."""
+
+import asyncio
+import csv
+import io
+
+from conftest import requires_liboqs
+
+from pqc_lab import bench, handshake, loadtest
+
+
+def test_format_load_csv_matches_bench_columns() -> None:
+    """Test CSV output carries the bench latency columns plus run totals."""
+    result = loadtest.LoadTestResult(
+        algorithm="ML-KEM-768",
+        concurrency=4,
+        duration_s=1.0,
+        elapsed_s=1.0,
+        timestamp="2024-01-01T00:00:00+00:00",
+        completed=3,
+        failed=1,
+        errors={"ConnectionRefusedError": 1},
+        handshakes_per_sec=3.0,
+        operations=[bench.summarize(op, [1000, 2000, 3000]) for op in ("handshake",)],
+    )
+    rows = list(csv.DictReader(io.StringIO(loadtest.format_load([result], "csv"))))
+
+    assert set(bench.CSV_FIELDS) <= set(rows[0])
+    assert rows[0]["concurrency"] == "4"
+    assert rows[0]["median_ns"] == "2000.0"
+    assert "ConnectionRefusedError=1" in loadtest.format_load([result], "text")
+
+
+@requires_liboqs
+def test_run_load_against_server() -> None:
+    """Test a short paced load test completes handshakes without errors."""
+
+    async def run() -> loadtest.LoadTestResult:
+        server = handshake.HandshakeServer("mlkem512", "127.0.0.1", 0)
+        await server.start()
+        try:
+            return await loadtest.run_load(
+                "mlkem512", "127.0.0.1", server.port, 4, duration=0.5, rate=40
+            )
+        finally:
+            await server.close()
+
+    result = asyncio.run(run())
+    assert result.failed == 0
+    assert 10 <= result.completed <= 20
+    assert [op.operation for op in result.operations] == list(loadtest.LOAD_OPERATIONS)
+    assert result.bytes_sent > 0 and result.bytes_received > 0
@@ -0,0 +1,38 @@
+"""Tests for signed directory manifests."""
+
+from pathlib import Path
+
+from pqc_lab import manifest
+
+
+def _make_tree(root: Path) -> None:
+    (root / "sub").mkdir(parents=True)
+    for i in range(100):
+        (root / "sub" / f"{i}.txt").write_text(f"file {i}")
+    (root / "top.bin").write_bytes(b"\x00" * 5000)
+
+
+def test_manifest_roundtrip(tmp_path: Path) -> None:
+    """Test a built manifest lists every file and survives serialization."""
+    _make_tree(tmp_path)
+    built = manifest.build_manifest(tmp_path, workers=2)
+
+    assert len(built.entries) == 101
+    assert built.entries[-1].path == "top.bin"
+    assert manifest.Manifest.loads(built.dumps()) == built
+
+
+def test_check_manifest_reports_changes(tmp_path: Path) -> None:
+    """Test mismatched, missing and extra files are all reported."""
+    _make_tree(tmp_path)
+    built = manifest.build_manifest(tmp_path, workers=1)
+    assert manifest.check_manifest(tmp_path, built).ok
+
+    (tmp_path / "sub" / "1.txt").write_text("file X")
+    (tmp_path / "sub" / "2.txt").unlink()
+    (tmp_path / "new.txt").write_text("new")
+    diff = manifest.check_manifest(tmp_path, built, workers=2)
+
+    assert diff.mismatched == ["sub/1.txt"]
+    assert diff.missing == ["sub/2.txt"]
+    assert diff.extra == ["new.txt"]
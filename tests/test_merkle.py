@@ -0,0 +1,54 @@
+"""Tests for incremental Merkle-tree signing."""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from pqc_lab import config, merkle
+
+
+def _leaves(count: int) -> list[bytes]:
+    return [hashlib.sha3_256(bytes([i])).digest() for i in range(count)]
+
+
+@pytest.mark.parametrize("count", [1, 2, 5, 8, 13])
+def test_proofs_fold_to_root(count: int) -> None:
+    """Test every leaf's inclusion proof folds back to the root."""
+    tree = merkle.MerkleTree.build(_leaves(count))
+    for index, leaf in enumerate(tree.levels[0]):
+        siblings = tree.proof(index)
+        assert merkle.root_from_proof(leaf, index, count, siblings) == tree.root
+
+
+def test_update_matches_rebuild() -> None:
+    """Test updating single leaves gives the same root as a full rebuild."""
+    leaves = _leaves(11)
+    tree = merkle.MerkleTree.build(leaves)
+    for index in (0, 5, 10):
+        leaves[index] = hashlib.sha3_256(b"changed %d" % index).digest()
+        tree.update(index, leaves[index])
+
+    assert tree.root == merkle.MerkleTree.build(leaves).root
+
+
+def test_update_state_rehashes_only_changes(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test re-signing rehashes only files whose size or mtime changed."""
+    monkeypatch.setattr(config.config.file, "artifacts_dir", tmp_path / "artifacts")
+    tree_dir = tmp_path / "tree"
+    tree_dir.mkdir()
+    for i in range(20):
+        (tree_dir / f"{i}.txt").write_text(f"file {i}")
+
+    first, rehashed = merkle.update_state(tree_dir, workers=1)
+    assert rehashed == 20
+    _, rehashed = merkle.update_state(tree_dir, workers=1)
+    assert rehashed == 0
+
+    (tree_dir / "3.txt").write_text("file 3 changed")
+    state, rehashed = merkle.update_state(tree_dir, workers=1)
+    assert rehashed == 1
+    assert state.tree().root != first.tree().root
+    assert state.tree().root == merkle.compute_root(tree_dir, workers=1)[0]
@@ -0,0 +1,135 @@
+"""Tests for native call instrumentation."""
+
+import asyncio
+import json
+import urllib.request
+from collections.abc import Iterator
+
+import pytest
+from conftest import requires_liboqs
+
+from pqc_lab import config, handshake, lib, metrics
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics() -> Iterator[None]:
+    """Start every test with no recorded metrics and restore the switch."""
+    was_enabled = metrics.enabled
+    metrics.reset()
+    yield
+    metrics.enable(was_enabled)
+    metrics.reset()
+
+
+def test_record_batches_and_quantiles() -> None:
+    """Test batches count every call in the bucket of their mean latency."""
+    metrics.record("ML-KEM-768", "encaps", 30_000, nbytes=100)
+    metrics.record("ML-KEM-768", "encaps", 8 * 3_000, nbytes=800, errors=1, calls=8)
+
+    (op,) = metrics.snapshot()["operations"]
+    assert (op["calls"], op["errors"], op["bytes"]) == (9, 1, 900)
+    assert op["total_ns"] == 54_000
+    assert metrics.quantile_ns(op["buckets"], 0.5) == 5_000
+    assert metrics.quantile_ns(op["buckets"], 0.99) == 50_000
+
+
+def test_prometheus_exposition() -> None:
+    """Test the text format has cumulative buckets, sums and counters."""
+    metrics.record("ML-DSA-65", "sign", 2_000_000, nbytes=10)
+    text = metrics.format_prometheus(metrics.snapshot({"handshake_completed": 3}))
+
+    labels = 'algorithm="ML-DSA-65",operation="sign"'
+    assert f"pqc_lab_native_calls_total{{{labels}}} 1" in text
+    assert f'pqc_lab_native_duration_seconds_bucket{{{labels},le="0.001"}} 0' in text
+    assert f'pqc_lab_native_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in text
+    assert f"pqc_lab_native_duration_seconds_sum{{{labels}}} 0.002" in text
+    assert "pqc_lab_handshake_completed 3" in text
+
+
+@requires_liboqs
+def test_lib_calls_recorded_only_when_enabled() -> None:
+    """Test native calls are counted per algorithm once instrumentation is on."""
+    kem = lib.KEM("mlkem512")
+    metrics.enable(False)
+    kem.keypair()
+    assert metrics.snapshot()["operations"] == []
+
+    metrics.enable()
+    public_key, secret_key = kem.keypair()
+    ciphertext, _ = kem.encaps(public_key)
+    kem.decaps(ciphertext, secret_key)
+    lib.kem_keypair_batch("mlkem512", 4)
+
+    ops = {op["operation"]: op for op in metrics.snapshot()["operations"]}
+    assert {op["algorithm"] for op in ops.values()} == {"ML-KEM-512"}
+    assert ops["keypair"]["calls"] == 5
+    assert ops["encaps"]["calls"] == ops["decaps"]["calls"] == 1
+    assert ops["keypair"]["bytes"] == 5 * (
+        kem.length_public_key + kem.length_secret_key
+    )
+
+
+@requires_liboqs
+def test_server_exports_metrics() -> None:
+    """Test the handshake server serves native metrics and its counters."""
+
+    def fetch(url: str) -> bytes:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return bytes(response.read())
+
+    async def run() -> None:
+        network = config.NetworkConfig(metrics_port=0)
+        server = handshake.HandshakeServer("mlkem768", "127.0.0.1", 0, network)
+        await server.start()
+        try:
+            await handshake.run_client("mlkem768", "127.0.0.1", server.port)
+            base = f"http://127.0.0.1:{server.metrics_port}"
+            loop = asyncio.get_running_loop()
+            data = json.loads(
+                await loop.run_in_executor(None, fetch, base + "/metrics.json")
+            )
+            text = await loop.run_in_executor(None, fetch, base + "/metrics")
+        finally:
+            await server.close()
+
+        assert data["counters"]["handshake_completed"] == 1
+        decaps = [op for op in data["operations"] if op["operation"] == "decaps"]
+        assert decaps and decaps[0]["calls"] == 1
+        assert b"pqc_lab_native_duration_seconds_bucket" in text
+
+    asyncio.run(run())
+
+
+def test_http_server_drops_oversized_requests() -> None:
+    """Test a header block past the stream limit closes only that connection."""
+
+    async def request(port: int, data: bytes) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            writer.write(data)
+            await writer.drain()
+            return await reader.read()
+        except ConnectionResetError:
+            # The server may close with part of the request still unread
+            return b""
+        finally:
+            writer.close()
+
+    async def run() -> None:
+        errors: list[dict] = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+        server = await metrics.start_http_server("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            assert await request(port, b"GET /" + b"x" * 100_000) == b""
+            ok = await request(port, b"GET /metrics.json HTTP/1.0\r\n\r\n")
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert ok.startswith(b"HTTP/1.0 200 OK")
+        assert not errors
+
+    asyncio.run(run())
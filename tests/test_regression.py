@@ -0,0 +1,88 @@
+"""Tests for benchmark baselines and regression comparison."""
+
+import random
+
+import pytest
+from click.testing import CliRunner
+
+from pqc_lab import bench, cli, regression
+
+
+def _samples(median: int, n: int = 200, seed: int = 1) -> list[int]:
+    """Skewed latency-like samples around ``median`` nanoseconds."""
+    rng = random.Random(seed)
+    return [int(median * rng.lognormvariate(0, 0.1)) for _ in range(n)]
+
+
+def _run(median: int, seed: int) -> bench.SampleRun:
+    return bench.SampleRun(
+        algorithm="ML-KEM-768",
+        iterations=200,
+        warmup_iterations=0,
+        timestamp="2024-01-01T00:00:00+00:00",
+        samples_ns={"encaps": _samples(median, seed=seed)},
+    )
+
+
+def test_mann_whitney_u() -> None:
+    """Test the p-value separates shifted from identical distributions."""
+    same = regression.mann_whitney_u(_samples(1000, seed=1), _samples(1000, seed=2))
+    shifted = regression.mann_whitney_u(_samples(1000, seed=1), _samples(1100, seed=2))
+
+    assert same > 0.05
+    assert shifted < 1e-6
+    assert regression.mann_whitney_u([5] * 30, [5] * 30) == 1.0
+
+
+def test_compare_flags_only_significant_slowdowns() -> None:
+    """Test a 20% slowdown regresses while noise and speedups do not."""
+    base = _samples(1000, seed=1)
+    slower = regression.compare_samples(
+        "ML-KEM-768", "encaps", base, _samples(1200, seed=2), 5.0, 0.95, 200
+    )
+    assert slower.regression
+    assert slower.ci_low < slower.change < slower.ci_high
+    assert 0.1 < slower.ci_low and slower.ci_high < 0.3
+
+    noise = regression.compare_samples(
+        "ML-KEM-768", "encaps", base, _samples(1000, seed=2), 5.0, 0.95, 200
+    )
+    faster = regression.compare_samples(
+        "ML-KEM-768", "encaps", base, _samples(800, seed=2), 5.0, 0.95, 200
+    )
+    assert not noise.regression and not faster.regression
+    assert faster.significant
+
+
+def test_baseline_roundtrip() -> None:
+    """Test runs accumulate per algorithm and names stay inside the directory."""
+    regression.save_run("v0.10", _run(1000, seed=1))
+    dsa = _run(2000, seed=2).model_copy(update={"algorithm": "ML-DSA-65"})
+    regression.save_run("v0.10", dsa)
+
+    baseline = regression.load_baseline("v0.10")
+    assert sorted(baseline.runs) == ["ML-DSA-65", "ML-KEM-768"]
+    assert baseline.runs["ML-KEM-768"].samples_ns["encaps"] == _samples(1000, seed=1)
+    assert regression.list_baselines() == ["v0.10"]
+
+    with pytest.raises(regression.BaselineError):
+        regression.baseline_path("../escape")
+    with pytest.raises(regression.BaselineError):
+        regression.load_baseline("missing")
+
+
+def test_compare_command_exit_status() -> None:
+    """Test ``bench compare`` exits non-zero only past the threshold."""
+    regression.save_run("old", _run(1000, seed=1))
+    regression.save_run("new", _run(1200, seed=2))
+    runner = CliRunner()
+
+    result = runner.invoke(cli.main, ["bench", "compare", "old", "--against", "new"])
+    assert result.exit_code == 1
+    assert "REGRESSION" in result.output
+
+    result = runner.invoke(
+        cli.main,
+        ["bench", "compare", "old", "--against", "new", "--threshold", "50"],
+    )
+    assert result.exit_code == 0, result.output
@@ -0,0 +1,68 @@
+"""Tests for key files and streaming file signatures."""
+
+import hashlib
+from pathlib import Path
+
+import pytest
+from conftest import requires_liboqs
+
+from pqc_lab import keys, lib, signing
+
+
+def test_key_file_roundtrip(tmp_path: Path) -> None:
+    """Test key files round-trip and reject the wrong algorithm."""
+    path = tmp_path / "dsa.pub"
+    keys.write_key(path, "mldsa65", keys.PUBLIC, b"\x01" * 100)
+
+    assert path.read_text().startswith("-----BEGIN ML-DSA-65 PUBLIC KEY-----")
+    assert keys.read_key(path, "mldsa65", keys.PUBLIC) == b"\x01" * 100
+    with pytest.raises(keys.KeyFileError):
+        keys.read_key(path, "mldsa87", keys.PUBLIC)
+
+
+def test_hash_file_streams_in_chunks(tmp_path: Path) -> None:
+    """Test chunked hashing matches hashing the whole input at once."""
+    data = bytes(range(256)) * 1000
+    path = tmp_path / "input.bin"
+    path.write_bytes(data)
+
+    digest, size = signing.hash_file(path, "sha3-256", chunk_size=4096)
+    assert size == len(data)
+    assert digest == hashlib.sha3_256(data).digest()
+
+    digest, _ = signing.hash_file(path, "shake256", chunk_size=1000)
+    assert digest == hashlib.shake_256(data).digest(64)
+
+
+def test_signature_file_header() -> None:
+    """Test the pre-hash and chunk size survive a signature file round-trip."""
+    original = signing.SignatureFile(
+        algorithm="ML-DSA-65",
+        prehash="sha3-512",
+        chunk_size=65536,
+        size=123,
+        signature=b"\x02" * 50,
+    )
+    text = original.dumps()
+
+    assert "Prehash: sha3-512" in text
+    assert "Chunk-Size: 65536" in text
+    assert signing.SignatureFile.loads(text) == original
+    with pytest.raises(keys.KeyFileError):
+        signing.SignatureFile.loads(text.replace("sha3-512", "md5"))
+
+
+@requires_liboqs
+def test_sign_and_verify_file(tmp_path: Path) -> None:
+    """Test a streamed signature verifies and detects modification."""
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(b"release image" * 10000)
+    public_key, secret_key = lib.Signature("mldsa65").keypair()
+
+    detached = signing.sign_file(
+        "mldsa65", secret_key, path, chunk_size=8192, public_key=public_key
+    )
+    assert signing.verify_file(public_key, path, detached)
+
+    path.write_bytes(b"tampered image" * 10000)
+    assert not signing.verify_file(public_key, path, detached)
@@ -0,0 +1,86 @@
+"""Tests for the verification result cache."""
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+from conftest import requires_liboqs
+
+from pqc_lab import config, lib, signing, verify_cache
+
+
+def test_lru_eviction() -> None:
+    """Test the least recently used entry is evicted past the size cap."""
+    cache = verify_cache.VerifyCache(max_entries=2)
+    cache.mark_verified("a")
+    cache.mark_verified("b")
+    assert cache.is_verified("a")  # "b" is now least recently used
+    cache.mark_verified("c")
+
+    assert cache.is_verified("a")
+    assert not cache.is_verified("b")
+    assert cache.is_verified("c")
+
+
+def test_persist_and_reload(tmp_path: Path) -> None:
+    """Test digests and verifications survive a save/load round-trip."""
+    path = tmp_path / "cache.json"
+    cache = verify_cache.VerifyCache(path)
+    cache.put_digest("file", b"\x01\x02")
+    cache.mark_verified("key")
+    cache.save()
+
+    reloaded = verify_cache.VerifyCache.load(path)
+    assert reloaded.get_digest("file") == b"\x01\x02"
+    assert reloaded.is_verified("key")
+
+
+def test_corrupt_cache_starts_empty(tmp_path: Path) -> None:
+    """Test an unreadable cache file is ignored rather than fatal."""
+    path = tmp_path / "cache.json"
+    path.write_text("{not json")
+    assert len(verify_cache.VerifyCache.load(path)) == 0
+
+
+@requires_liboqs
+def test_verify_file_uses_cache(tmp_path: Path) -> None:
+    """Test repeated verification hits the cache and changes miss it."""
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(b"artifact" * 1000)
+    public_key, secret_key = lib.Signature("mldsa44").keypair()
+    detached = signing.sign_file("mldsa44", secret_key, path)
+    cache = verify_cache.VerifyCache(tmp_path / "cache.json")
+
+    assert signing.verify_file(public_key, path, detached, cache)
+    assert len(cache) == 2
+    assert signing.verify_file(public_key, path, detached, cache)
+    assert len(cache) == 2
+
+    path.write_bytes(b"tampered" * 1000)
+    assert not signing.verify_file(public_key, path, detached, cache)
+
+
+@requires_liboqs
+def test_trusted_digest_catches_restored_mtime(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test a same-size edit with its mtime put back is still rehashed."""
+    monkeypatch.setattr(config.config.cache, "trust_mtime", True)
+    path = tmp_path / "artifact.bin"
+    path.write_bytes(b"artifact" * 1000)
+    public_key, secret_key = lib.Signature("mldsa44").keypair()
+    detached = signing.sign_file("mldsa44", secret_key, path)
+    cache = verify_cache.VerifyCache(tmp_path / "cache.json")
+    assert signing.verify_file(public_key, path, detached, cache)
+
+    before = path.stat()
+    path.write_bytes(b"tampered" * 1000)
+    os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    # Coarse filesystem clocks can leave ctime unchanged within one tick
+    while path.stat().st_ctime_ns == before.st_ctime_ns:
+        time.sleep(0.01)
+        os.utime(path, ns=(before.st_atime_ns, before.st_mtime_ns))
+    after = path.stat()
+    assert (after.st_size, after.st_mtime_ns) == (before.st_size, before.st_mtime_ns)
+    assert not signing.verify_file(public_key, path, detached, cache)